@@ -0,0 +1,155 @@
+from __future__ import annotations
+
+from typing import Any, NamedTuple
+
+import os
+import sys
+import json
+import zlib
+import random
+import struct
+from datetime import date, timedelta
+
+CONTENTHUB_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if CONTENTHUB_ROOT not in sys.path:
+    sys.path.insert(0, CONTENTHUB_ROOT)
+
+from shared.systems import version_journal
+
+
+WORDS = ('oak', 'pine', 'rock', 'cliff', 'barrel', 'crate', 'sword', 'shield', 'chair', 'table', 'lamp', 'door',
+         'wall', 'floor', 'pipe', 'tank', 'truck', 'house', 'tower', 'bridge', 'fence', 'bush', 'flower', 'stone',
+         'metal', 'wood', 'glass', 'rope', 'hero', 'guard', 'robot', 'drone', 'ruin', 'statue', 'cart', 'boat')
+AUTHORS = ('alice', 'bob', 'carol', 'dave', 'erin', 'frank', 'grace', 'heidi')
+CATEGORIES = ('Props', 'Environment', 'Characters', 'Vehicles', 'FX', 'Architecture', 'Nature', 'Weapons')
+
+
+class LibrarySpec(NamedTuple):
+    depth: int = 2
+    fanout: int = 4
+    assets: int = 1000
+    versions: int = 3
+    thumbnail_size: int = 512
+    file_size: int = 16 * 1024
+    seed: int = 0
+    legacy_metadata: bool = False
+
+    def to_dict(self) -> dict[str, Any]:
+        return self._asdict()
+
+
+def generate_library(root_path: str, spec: LibrarySpec = LibrarySpec()) -> dict[str, Any]:
+    """
+    Writes a synthetic project: spec.depth levels of spec.fanout folders, with
+    spec.assets assets spread over the leaf folders. Every version gets an fbx
+    stand-in and a thumbnail. The same spec and seed always give the same tree.
+    """
+    rng = random.Random(spec.seed)
+    leaves = _folders(root_path, spec.depth, spec.fanout)
+    for folder in leaves:
+        os.makedirs(folder, exist_ok=True)
+
+    start = date(2024, 1, 1)
+    for index in range(spec.assets):
+        folder = leaves[index % len(leaves)]
+        name = ''.join(word.capitalize() for word in rng.sample(WORDS, 2)) + f"_{index:05d}"
+        asset_path = os.path.join(folder, name).replace("\\", "/")
+        tags = rng.sample(WORDS, 2)
+        for number in range(1, spec.versions + 1):
+            entry = _write_version(asset_path, number, spec, rng)
+            entry['author'] = rng.choice(AUTHORS)
+            entry['date'] = (start + timedelta(days=index % 365 + number)).isoformat()
+            entry['tags'] = tags
+            if spec.legacy_metadata:
+                _append_legacy(asset_path, name, entry)
+            else:
+                version_journal.append_version(asset_path, name, entry)
+
+    manifest = {'root': root_path.replace("\\", "/"), 'spec': spec.to_dict(), 'folders': len(leaves),
+                'assets': spec.assets}
+    with open(os.path.join(root_path, 'library.json'), 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=4)
+    return manifest
+
+
+def _folders(root_path: str, depth: int, fanout: int) -> list[str]:
+    folders = [root_path.replace("\\", "/")]
+    for level in range(depth):
+        folders = [f"{parent}/{CATEGORIES[i % len(CATEGORIES)]}_{level}{i:02d}"
+                   for parent in folders for i in range(fanout)]
+    return folders
+
+
+def _write_version(asset_path: str, number: int, spec: LibrarySpec, rng: random.Random) -> dict[str, Any]:
+    folder = version_journal.version_folder(number)
+    os.makedirs(os.path.join(asset_path, folder), exist_ok=True)
+    name = os.path.basename(asset_path)
+
+    fbx = f"{folder}/{name}.fbx"
+    with open(os.path.join(asset_path, fbx), 'wb') as f:
+        f.write(rng.randbytes(spec.file_size))
+
+    entry = {'version': f"v{number:03d}", 'files': {'fbx': fbx}}
+    if spec.thumbnail_size:
+        thumbnail = f"{folder}/thumbnail.png"
+        write_png(os.path.join(asset_path, thumbnail), spec.thumbnail_size, rng)
+        entry['thumbnail'] = thumbnail
+    return entry
+
+
+def _append_legacy(asset_path: str, name: str, entry: dict[str, Any]):
+    # The pre-journal layout, one metadata.json holding every version
+    metadata_path = os.path.join(asset_path, 'metadata.json')
+    metadata = {'name': name, 'versions': []}
+    if os.path.exists(metadata_path):
+        with open(metadata_path, 'r', encoding='utf-8') as f:
+            metadata = json.load(f)
+    metadata['versions'].append(entry)
+    metadata['latest'] = entry['version']
+    with open(metadata_path, 'w', encoding='utf-8') as f:
+        json.dump(metadata, f, indent=4)
+
+
+def write_png(path: str, size: int, rng: random.Random):
+    """
+    Writes a size x size RGB png of coarse random blocks.
+    A cheap stand-in that still has to go through a real decode, does not need Qt.
+    """
+    block = max(size // 16, 1)
+    rows = []
+    for y in range(0, size, block):
+        colors = [rng.randbytes(3) for _ in range(0, size, block)]
+        row = b'\0' + b''.join(color * block for color in colors)[:size * 3]
+        rows.extend([row] * min(block, size - y))
+
+    def chunk(kind: bytes, data: bytes) -> bytes:
+        return struct.pack('>I', len(data)) + kind + data + struct.pack('>I', zlib.crc32(kind + data))
+
+    with open(path, 'wb') as f:
+        f.write(b'\x89PNG\r\n\x1a\n')
+        f.write(chunk(b'IHDR', struct.pack('>IIBBBBB', size, size, 8, 2, 0, 0, 0)))
+        f.write(chunk(b'IDAT', zlib.compress(b''.join(rows), 6)))
+        f.write(chunk(b'IEND', b''))
+
+
+if __name__ == '__main__':
+    import argparse
+
+    defaults = LibrarySpec()
+    parser = argparse.ArgumentParser(description="Generate a synthetic asset library for benchmarks")
+    parser.add_argument('root')
+    parser.add_argument('--depth', type=int, default=defaults.depth)
+    parser.add_argument('--fanout', type=int, default=defaults.fanout)
+    parser.add_argument('--assets', type=int, default=defaults.assets)
+    parser.add_argument('--versions', type=int, default=defaults.versions)
+    parser.add_argument('--thumbnail-size', type=int, default=defaults.thumbnail_size,
+                        help="Pixels per side, 0 for no thumbnails")
+    parser.add_argument('--file-size', type=int, default=defaults.file_size)
+    parser.add_argument('--seed', type=int, default=defaults.seed)
+    parser.add_argument('--legacy-metadata', action='store_true', help="Write the pre-journal metadata.json layout")
+    args = parser.parse_args()
+
+    library_spec = LibrarySpec(args.depth, args.fanout, args.assets, args.versions, args.thumbnail_size,
+                               args.file_size, args.seed, args.legacy_metadata)
+    result = generate_library(args.root, library_spec)
+    print(f"Wrote {result['assets']} assets in {result['folders']} folders to {result['root']}")
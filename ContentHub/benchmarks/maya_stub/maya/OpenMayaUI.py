@@ -0,0 +1,24 @@
+class MQtUtil:
+    """
+    Outside Maya there is no main window or workspace control to find.
+    A benchmark emulating the GUI sets main_window and controls to widget pointers.
+    """
+
+    main_window = None
+    controls: dict = {}
+
+    @staticmethod
+    def mainWindow():
+        return MQtUtil.main_window
+
+    @staticmethod
+    def findControl(name: str):
+        return MQtUtil.controls.get(name)
+
+    @staticmethod
+    def findLayout(name: str):
+        return None
+
+    @staticmethod
+    def findMenuItem(name: str):
+        return None
@@ -0,0 +1 @@
+# Stand-in for Maya's python package, used by the benchmarks to import the tool outside Maya
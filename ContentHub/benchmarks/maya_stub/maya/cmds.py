@@ -0,0 +1,29 @@
+from __future__ import annotations
+
+from typing import Any, Callable
+
+
+# Every call made through the stub, as (command name, args, kwargs)
+calls: list[tuple[str, tuple, dict]] = []
+
+_RESULTS: dict[str, Any] = {
+    'ls': [],
+    'about': '2024',
+    'currentTime': 1.0,
+    'workspaceControl': False,
+    'getPanel': [],
+}
+# Command name -> function run instead of returning a canned result
+handlers: dict[str, Callable[..., Any]] = {}
+
+
+def __getattr__(name: str) -> Callable[..., Any]:
+    def command(*args, **kwargs):
+        calls.append((name, args, kwargs))
+        if name in handlers:
+            return handlers[name](*args, **kwargs)
+        result = _RESULTS.get(name)
+        return list(result) if isinstance(result, list) else result
+
+    command.__name__ = name
+    return command
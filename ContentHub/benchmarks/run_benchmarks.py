@@ -0,0 +1,837 @@
+from __future__ import annotations
+
+from typing import Any, Callable
+
+import os
+import sys
+import json
+import time
+import shutil
+import socket
+import platform
+import tempfile
+import statistics
+import subprocess
+import tracemalloc
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+CONTENTHUB_ROOT = os.path.dirname(BENCHMARK_DIR)
+RESULT_PREFIX = '@@benchmark@@ '
+
+# Scenario name -> setup function. A setup function prepares everything that
+# should not be measured and returns the callable that is timed.
+SCENARIOS: dict[str, Callable[[BenchmarkContext], Callable[[], None]]] = {}
+# Scenarios that run without a QApplication
+_QT_FREE: set[str] = set()
+# Scenario name -> most its cold run may take, in seconds. Exceeding one fails the run
+# like a regression does. CONTENTHUB_STARTUP_BUDGET_MS overrides the startup budget.
+BUDGETS: dict[str, float] = {
+    'startup': float(os.environ.get('CONTENTHUB_STARTUP_BUDGET_MS', 750)) / 1000,
+}
+# A relaunch of the session's hub should feel instant
+RELAUNCH_BUDGET = float(os.environ.get('CONTENTHUB_RELAUNCH_BUDGET_MS', 50)) / 1000
+BUDGETS['relaunch'] = BUDGETS['relaunch_docked'] = RELAUNCH_BUDGET
+# Editor frames driven by the unreal_tick scenario, each may take the pump's budget and 2 ms more
+TICK_FRAMES = 120
+BUDGETS['unreal_tick'] = TICK_FRAMES * (float(os.environ.get('CONTENTHUB_TICK_BUDGET_MS', 4)) + 2) / 1000
+
+# Audit events counted per run, mapped to the name they are reported under
+_AUDIT_EVENTS = {
+    'open': 'open',
+    'os.scandir': 'scandir',
+    'os.listdir': 'listdir',
+    'os.mkdir': 'mkdir',
+    'os.remove': 'remove',
+    'os.rename': 'rename',
+    'os.utime': 'utime',
+    'os.link': 'link',
+    'sqlite3.connect': 'sqlite_connect',
+}
+
+
+def scenario(name: str, qt: bool = True):
+    def register(setup: Callable[[BenchmarkContext], Callable[[], None]]):
+        SCENARIOS[name] = setup
+        if not qt:
+            _QT_FREE.add(name)
+        return setup
+    return register
+
+
+class BenchmarkContext:
+    """
+    What a scenario gets to work with: the library, a scratch folder and the Qt application
+    """
+
+    def __init__(self, library_root: str, scratch_dir: str, qt: bool = True):
+        self.library_root = library_root.replace("\\", "/")
+        self.scratch_dir = scratch_dir.replace("\\", "/")
+        self.app = None
+        if qt:
+            from PySide2 import QtWidgets
+            self.app = QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+
+    def metadata_paths(self, limit: int | None = None) -> list[str]:
+        paths = []
+        for folder, dir_names, file_names in os.walk(self.library_root):
+            dir_names[:] = sorted(d for d in dir_names if not d.startswith('.'))
+            if 'metadata.json' in file_names:
+                paths.append(os.path.join(folder, 'metadata.json').replace("\\", "/"))
+                dir_names[:] = []
+                if limit and len(paths) >= limit:
+                    break
+        return paths
+
+    def until_painted(self, action: Callable[[], Any], timeout: float = 30.0) -> Any:
+        """
+        Runs the action, then the event loop until a widget has painted.
+        Returns what the action returned.
+        """
+        from PySide2 import QtCore
+        painted = []
+
+        class PaintFilter(QtCore.QObject):
+            def eventFilter(self, watched, event):
+                if event.type() == QtCore.QEvent.Paint:
+                    painted.append(watched)
+                return False
+
+        paint_filter = PaintFilter()
+        self.app.installEventFilter(paint_filter)
+        try:
+            result = action()
+            self.wait_until(lambda: painted, timeout=timeout)
+        finally:
+            self.app.removeEventFilter(paint_filter)
+        return result
+
+    def wait_until(self, condition: Callable[[], bool], timeout: float = 120.0):
+        """
+        Runs the event loop until the condition holds
+        """
+        from PySide2 import QtCore
+        deadline = time.perf_counter() + timeout
+        while not condition():
+            if time.perf_counter() > deadline:
+                raise TimeoutError("Scenario did not finish in time")
+            self.app.processEvents(QtCore.QEventLoop.AllEvents, 10)
+            time.sleep(0.001)
+
+
+class SyscallCounter:
+    """
+    Counts filesystem calls made while active.
+    Python-level calls come from audit hooks and a wrapped os.stat, so calls made by
+    Qt's C++ code are missing there. The kernel's read/write syscall counters from
+    /proc/self/io cover those, where available.
+    """
+
+    _installed = False
+    _active: SyscallCounter | None = None
+
+    def __init__(self):
+        self.counts: dict[str, int] = {}
+        self._io_start: dict[str, int] = {}
+
+    def __enter__(self) -> SyscallCounter:
+        self._install()
+        self.counts = {}
+        self._io_start = _proc_io()
+        SyscallCounter._active = self
+        return self
+
+    def __exit__(self, *args):
+        SyscallCounter._active = None
+        io_end = _proc_io()
+        for key, name in (('syscr', 'read'), ('syscw', 'write')):
+            if key in io_end:
+                self.counts[name] = io_end[key] - self._io_start.get(key, 0)
+
+    def count(self, name: str):
+        self.counts[name] = self.counts.get(name, 0) + 1
+
+    @classmethod
+    def _install(cls):
+        if cls._installed:
+            return
+        cls._installed = True
+
+        def audit_hook(event: str, args: tuple):
+            active = cls._active
+            if active is not None and event in _AUDIT_EVENTS:
+                active.count(_AUDIT_EVENTS[event])
+
+        sys.addaudithook(audit_hook)
+
+        # os.stat raises no audit event, wrap it along with the helpers built on it
+        for name in ('stat', 'lstat'):
+            original = getattr(os, name)
+
+            def counted(*args, _original=original, _name=name, **kwargs):
+                active = cls._active
+                if active is not None:
+                    active.count(_name)
+                return _original(*args, **kwargs)
+
+            setattr(os, name, counted)
+
+
+def _proc_io() -> dict[str, int]:
+    try:
+        with open('/proc/self/io', 'r') as f:
+            return {key: int(value) for key, value in (line.split(':') for line in f)}
+    except OSError:
+        return {}
+
+
+def _max_rss_kb() -> int | None:
+    try:
+        import resource
+    except ImportError:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return rss // 1024 if sys.platform == 'darwin' else rss
+
+
+def measure(run: Callable[[], None], repeat: int) -> dict[str, Any]:
+    """
+    Times a scenario. The first run is the cold one and is also used for the
+    syscall counts, a last extra run is traced for the Python memory peak.
+    """
+    times = []
+    with SyscallCounter() as counter:
+        start = time.perf_counter()
+        run()
+        times.append(time.perf_counter() - start)
+    for _ in range(repeat - 1):
+        start = time.perf_counter()
+        run()
+        times.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    run()
+    _, python_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        'cold_s': times[0],
+        'min_s': min(times),
+        'median_s': statistics.median(times),
+        'runs': len(times),
+        'syscalls': counter.counts,
+        'python_peak_kb': python_peak // 1024,
+        'max_rss_kb': _max_rss_kb(),
+    }
+
+
+def run_child(scenario_name: str, library_root: str, repeat: int) -> dict[str, Any]:
+    """
+    Runs one scenario in this process, which the runner started for it alone
+    """
+    scratch_dir = tempfile.mkdtemp(prefix='contenthub_bench_')
+    # Keep indexes and thumbnail caches of the run away from the user's
+    os.environ['CONTENTHUB_CACHE_DIR'] = os.path.join(scratch_dir, 'cache')
+    try:
+        context = BenchmarkContext(library_root, scratch_dir, qt=scenario_name not in _QT_FREE)
+        run = SCENARIOS[scenario_name](context)
+        result = measure(run, repeat)
+        # Scenarios that process a known number of items also report throughput
+        items = getattr(run, 'items', None)
+        if items and result['median_s']:
+            result['items_per_s'] = items / result['median_s']
+        # And scenarios measuring something besides time report it from run.extra
+        extra = getattr(run, 'extra', None)
+        if extra:
+            result.update(extra())
+        return result
+    finally:
+        shutil.rmtree(scratch_dir, ignore_errors=True)
+
+
+def run_suite(library_root: str, names: list[str], repeat: int) -> dict[str, Any]:
+    """
+    Runs every scenario in a fresh interpreter, so caches start cold and the
+    peak RSS belongs to that scenario alone
+    """
+    env = dict(os.environ)
+    env.setdefault('QT_QPA_PLATFORM', 'offscreen')
+    results = {}
+    for name in names:
+        command = [sys.executable, os.path.abspath(__file__), library_root, '--child', name, '--repeat', str(repeat)]
+        process = subprocess.run(command, capture_output=True, text=True, env=env)
+        lines = [line for line in process.stdout.splitlines() if line.startswith(RESULT_PREFIX)]
+        if process.returncode != 0 or not lines:
+            print(f"{name}: FAILED\n{process.stderr.strip()}")
+            results[name] = {'error': (process.stderr.strip().splitlines() or ['no result'])[-1]}
+            continue
+        results[name] = json.loads(lines[-1][len(RESULT_PREFIX):])
+        throughput = f", {results[name]['items_per_s']:.0f}/s" if 'items_per_s' in results[name] else ''
+        print(f"{name}: median {results[name]['median_s'] * 1000:.1f} ms, "
+              f"cold {results[name]['cold_s'] * 1000:.1f} ms{throughput}")
+        if 'stats' in results[name]:
+            print('    ' + ', '.join(f"{key} {value:.2f}" if isinstance(value, float) else f"{key} {value}"
+                                    for key, value in results[name]['stats'].items()))
+    return results
+
+
+def save_results(results: dict[str, Any], library_root: str, results_dir: str) -> str:
+    library = {}
+    manifest_path = os.path.join(library_root, 'library.json')
+    if os.path.exists(manifest_path):
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            library = json.load(f)
+
+    report = {
+        'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'host': socket.gethostname(),
+        'platform': platform.platform(),
+        'python': platform.python_version(),
+        'commit': _git_commit(),
+        'library': library,
+        'scenarios': results,
+    }
+    os.makedirs(results_dir, exist_ok=True)
+    path = os.path.join(results_dir, f"{time.strftime('%Y%m%d-%H%M%S')}.json")
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=4)
+    return path
+
+
+def latest_results(results_dir: str) -> str | None:
+    if not os.path.isdir(results_dir):
+        return None
+    reports = sorted(name for name in os.listdir(results_dir) if name.endswith('.json'))
+    return os.path.join(results_dir, reports[-1]) if reports else None
+
+
+def compare(results: dict[str, Any], baseline_path: str, threshold: float = 0.1) -> bool:
+    """
+    Prints the change against an earlier report, returns False if any scenario
+    got slower than the threshold allows
+    """
+    with open(baseline_path, 'r', encoding='utf-8') as f:
+        baseline = json.load(f)['scenarios']
+
+    ok = True
+    print(f"\nCompared to {os.path.basename(baseline_path)}:")
+    for name, current in results.items():
+        previous = baseline.get(name)
+        if not previous or 'error' in previous or 'error' in current:
+            print(f"  {name}: no comparison")
+            continue
+        change = current['median_s'] / previous['median_s'] - 1 if previous['median_s'] else 0.0
+        calls = sum(current['syscalls'].values()) - sum(previous['syscalls'].values())
+        regressed = change > threshold
+        ok = ok and not regressed
+        print(f"  {name}: median {change:+.1%}, syscalls {calls:+d}{'  REGRESSION' if regressed else ''}")
+    return ok
+
+
+def check_budgets(results: dict[str, Any]) -> bool:
+    """
+    Prints every scenario over its budget, returns False if there was one
+    """
+    ok = True
+    for name, budget in BUDGETS.items():
+        result = results.get(name)
+        if not result or 'error' in result:
+            continue
+        if result['cold_s'] > budget:
+            ok = False
+            print(f"{name}: cold {result['cold_s'] * 1000:.1f} ms is over the {budget * 1000:.0f} ms budget")
+    return ok
+
+
+def _git_commit() -> str:
+    try:
+        return subprocess.run(['git', 'rev-parse', 'HEAD'], cwd=CONTENTHUB_ROOT, capture_output=True,
+                              text=True).stdout.strip()
+    except OSError:
+        return ''
+
+
+def _setup_paths():
+    for path in (CONTENTHUB_ROOT, os.path.join(CONTENTHUB_ROOT, 'maya')):
+        if path not in sys.path:
+            sys.path.insert(0, path)
+    try:
+        import maya.cmds  # noqa: F401
+    except ImportError:
+        # The failed import left the tool's maya folder cached as a namespace package
+        sys.modules.pop('maya', None)
+        sys.path.insert(0, os.path.join(BENCHMARK_DIR, 'maya_stub'))
+    try:
+        import unreal  # noqa: F401
+    except ImportError:
+        sys.path.insert(0, os.path.join(BENCHMARK_DIR, 'unreal_stub'))
+
+
+# Scenarios ------------------------------------------------------------------
+
+@scenario('startup')
+def startup(context: BenchmarkContext) -> Callable[[], None]:
+    """
+    Time to first paint of the hub. The cold run includes importing the tool,
+    the child process has only imported Qt by then.
+    """
+    os.environ['CONTENTHUB_ROOT'] = context.library_root
+    hubs = []
+
+    def run():
+        from asset_hub_maya import main
+        for hub in hubs:
+            hub.close()
+            hub.deleteLater()
+        hubs.clear()
+        # Every run builds a hub, not the relaunch of the session's one
+        main._hub = None
+        main._view_state.clear()
+        hubs.append(context.until_painted(main.launch))
+    return run
+
+
+class FakeWorkspace:
+    """
+    workspaceControl and MQtUtil of the maya stub backed by plain widgets, like an
+    interactive Maya. Controls are deleted on close, as with retain=False.
+    """
+
+    def __init__(self):
+        import shiboken2
+        from PySide2 import QtWidgets
+        from maya import cmds, OpenMayaUI
+
+        self.main_window = QtWidgets.QMainWindow()
+        self.controls: dict[str, tuple[Any, Callable | None]] = {}
+        OpenMayaUI.MQtUtil.main_window = int(shiboken2.getCppPointer(self.main_window)[0])
+        cmds.handlers['workspaceControl'] = self.workspace_control
+
+    def workspace_control(self, name: str, q: bool = False, e: bool = False, exists: bool = False,
+                          restore: bool = False, closeCommand: Callable | None = None, **kwargs) -> Any:
+        import shiboken2
+        from PySide2 import QtWidgets
+        from maya import OpenMayaUI
+
+        if q:
+            return name in self.controls if exists else None
+        if e:
+            if closeCommand is not None and name in self.controls:
+                self.controls[name] = (self.controls[name][0], closeCommand)
+            if restore and name in self.controls:
+                self.controls[name][0].show()
+            return None
+        container = QtWidgets.QWidget()
+        container.resize(1000, 600)
+        self.controls[name] = (container, closeCommand)
+        OpenMayaUI.MQtUtil.controls[name] = int(shiboken2.getCppPointer(container)[0])
+        return name
+
+    def close(self, name: str):
+        from PySide2 import QtCore
+        from maya import OpenMayaUI
+
+        container, close_command = self.controls.pop(name)
+        OpenMayaUI.MQtUtil.controls.pop(name, None)
+        if close_command:
+            close_command()
+        container.hide()
+        container.deleteLater()
+        QtCore.QCoreApplication.sendPostedEvents(None, QtCore.QEvent.DeferredDelete)
+
+
+def _relaunch(context: BenchmarkContext, docked: bool) -> Callable[[], None]:
+    os.environ['CONTENTHUB_ROOT'] = context.library_root
+    workspace = FakeWorkspace() if docked else None
+    from asset_hub_maya import main
+
+    def close(hub):
+        if workspace:
+            workspace.close(main.AssetHub.CONTROL_NAME)
+        else:
+            hub.close()
+
+    # A hub that has been used: a folder listed in the grid, some folders expanded, scrolled
+    hub = main.launch()
+    tree = hub.asset_explorer.tree_view
+    context.wait_until(lambda: tree.topLevelItemCount())
+    root = tree.topLevelItem(0)
+    for i in range(min(root.childCount(), 5)):
+        root.child(i).setExpanded(True)
+    scanned = []
+    hub.asset_display_view.scanner.finished.connect(scanned.append)
+    tree.setCurrentItem(root.child(0))
+    context.wait_until(lambda: scanned)
+    tree.verticalScrollBar().setValue(tree.verticalScrollBar().maximum())
+    # and its thumbnails seen, the cold run is the relaunch and not the first look at the folder
+    from asset_hub_maya.systems import thumbnail_loader
+    context.until_painted(hub.asset_display_view.viewport().update)
+    context.wait_until(thumbnail_loader.get_loader().is_idle)
+    close(hub)
+
+    def run():
+        relaunched = context.until_painted(main.launch)
+        if relaunched is not hub:
+            raise RuntimeError("The hub was rebuilt instead of relaunched")
+        close(relaunched)
+    return run
+
+
+@scenario('relaunch')
+def relaunch(context: BenchmarkContext) -> Callable[[], None]:
+    """
+    Showing the session's hub again after its window was closed, up to the first paint
+    """
+    return _relaunch(context, docked=False)
+
+
+@scenario('relaunch_docked')
+def relaunch_docked(context: BenchmarkContext) -> Callable[[], None]:
+    """
+    Reattaching the session's hub to a new workspaceControl after its dock was closed
+    """
+    return _relaunch(context, docked=True)
+
+
+@scenario('folder_clicks')
+def folder_clicks(context: BenchmarkContext) -> Callable[[], None]:
+    """
+    Clicking through neighbouring folders with a pause between clicks, like someone
+    browsing. The stats tell how many clicks found their folder warm and how long
+    the cold run's clicks took until the grid was filled. CONTENTHUB_PREFETCH=0 is the baseline,
+    CONTENTHUB_BENCH_THINK_MS the pause.
+    """
+    os.environ['CONTENTHUB_ROOT'] = context.library_root
+    think = float(os.environ.get('CONTENTHUB_BENCH_THINK_MS', 500)) / 1000
+    from asset_hub_maya import main
+
+    hub = context.until_painted(main.launch)
+    tree = hub.asset_explorer.tree_view
+    context.wait_until(lambda: tree.topLevelItemCount())
+    root = tree.topLevelItem(0)
+    # Each category, followed by the first folders inside it, in tree order
+    items = []
+    for i in range(min(root.childCount(), 3)):
+        category = root.child(i)
+        category.setExpanded(True)
+        items.append(category)
+        items.extend(category.child(j) for j in range(min(category.childCount(), 4)))
+
+    scanned = []
+    hub.asset_display_view.scanner.finished.connect(scanned.append)
+    loader = hub.asset_display_view.asset_model.loader
+    stats = {}
+
+    def run():
+        hub.prefetcher.invalidate()
+        for key in hub.prefetcher.counters:
+            hub.prefetcher.counters[key] = 0
+        click_times = []
+        for item in items:
+            scanned.clear()
+            start = time.perf_counter()
+            tree.setCurrentItem(item)
+            context.wait_until(lambda: scanned and loader.is_idle())
+            click_times.append(time.perf_counter() - start)
+            # Idle, the time the prefetcher gets
+            deadline = time.perf_counter() + think
+            context.wait_until(lambda: time.perf_counter() > deadline)
+        if not stats:
+            stats.update(hub.prefetcher.stats())
+            stats['click_median_ms'] = statistics.median(click_times) * 1000
+            stats['click_max_ms'] = max(click_times) * 1000
+    run.extra = lambda: {'stats': stats}
+    return run
+
+
+@scenario('rebuild_tree')
+def rebuild_tree(context: BenchmarkContext) -> Callable[[], None]:
+    from asset_hub_maya.widgets.tree_browser import tree_view
+    widget = tree_view.AssetTreeWidget(root_path='')
+    return lambda: widget.rebuild_tree(context.library_root)
+
+
+@scenario('expand_tree')
+def expand_tree(context: BenchmarkContext) -> Callable[[], None]:
+    from asset_hub_maya.widgets.tree_browser import tree_view
+    widget = tree_view.AssetTreeWidget(root_path='')
+
+    def run():
+        widget.rebuild_tree(context.library_root)
+        pending = [widget.topLevelItem(i) for i in range(widget.topLevelItemCount())]
+        while pending:
+            item = pending.pop()
+            item.setExpanded(True)
+            pending.extend(item.child(i) for i in range(item.childCount()))
+    return run
+
+
+@scenario('populate_assets')
+def populate_assets(context: BenchmarkContext) -> Callable[[], None]:
+    from asset_hub_maya.widgets.content_browser import asset_display_view
+    view = asset_display_view.AssetDisplayView()
+    finished = []
+    view.scanner.finished.connect(finished.append)
+
+    def run():
+        finished.clear()
+        view.populate_assets(context.library_root)
+        context.wait_until(lambda: finished)
+    return run
+
+
+@scenario('grid_thumbnails')
+def grid_thumbnails(context: BenchmarkContext) -> Callable[[], None]:
+    from asset_hub_maya.widgets.content_browser import asset_display_view
+    view = asset_display_view.AssetDisplayView()
+    view.resize(1280, 800)
+    finished = []
+    view.scanner.finished.connect(finished.append)
+    view.populate_assets(context.library_root)
+    context.wait_until(lambda: finished)
+    loader = view.asset_model.loader
+
+    def run():
+        loader.invalidate()
+        loader.cache.clear()
+        # Painting requests the thumbnails of every visible cell
+        view.viewport().grab()
+        context.wait_until(loader.is_idle)
+    return run
+
+
+@scenario('populate_details')
+def populate_details(context: BenchmarkContext) -> Callable[[], None]:
+    from asset_hub_maya.widgets.asset_detail import asset_details
+    dialog = asset_details.AssetDetailsDialog()
+    paths = context.metadata_paths(limit=200)
+
+    def run():
+        for path in paths:
+            dialog.populate_details(path)
+    return run
+
+
+@scenario('publish_metadata')
+def publish_metadata(context: BenchmarkContext) -> Callable[[], None]:
+    from asset_hub_maya.systems import asset_controller
+    runs = []
+
+    def run():
+        # New asset folders every run, a version can only be published once
+        folder = os.path.join(context.scratch_dir, f"publish_{len(runs)}")
+        runs.append(folder)
+        for i in range(50):
+            asset_path = os.path.join(folder, f"Asset_{i:03d}").replace("\\", "/")
+            for version in (1, 2):
+                metadata = asset_controller.generate_metadata(
+                    f"Asset_{i:03d}", f"v{version:03d}", {'fbx': f"v_{version:03d}/Asset_{i:03d}.fbx"},
+                    'bench', asset_path, thumbnail=f"v_{version:03d}/thumbnail.png")
+                asset_controller.write_metadata(metadata, os.path.join(asset_path, 'metadata.json'))
+    return run
+
+
+def _stylesheet_polish(context: BenchmarkContext, pruned: bool) -> Callable[[], None]:
+    from PySide2 import QtCore, QtGui, QtWidgets
+    from hb_unreal.lib import unreal_stylesheet
+
+    # A window full of the views the hub shows, all visible so every one is polished
+    window = QtWidgets.QWidget()
+    layout = QtWidgets.QGridLayout(window)
+    for i in range(12):
+        tree = QtWidgets.QTreeWidget()
+        tree.setHeaderLabels(['Asset Hierarchy'])
+        for j in range(50):
+            item = QtWidgets.QTreeWidgetItem([f"Folder_{j:02d}"])
+            item.addChildren([QtWidgets.QTreeWidgetItem([f"Child_{k}"]) for k in range(4)])
+            tree.addTopLevelItem(item)
+        model = QtGui.QStandardItemModel(tree)
+        for j in range(200):
+            model.appendRow(QtGui.QStandardItem(f"Asset_{j:03d}"))
+        grid = QtWidgets.QListView()
+        grid.setViewMode(QtWidgets.QListView.IconMode)
+        grid.setModel(model)
+        layout.addWidget(tree, i // 4, (i % 4) * 2)
+        layout.addWidget(grid, i // 4, (i % 4) * 2 + 1)
+        layout.addWidget(QtWidgets.QPushButton("Export"), 3, i)
+        layout.addWidget(QtWidgets.QLineEdit(), 4, i)
+    window.resize(1600, 1000)
+    window.show()
+    unreal_stylesheet.setup(context.app, pruned=pruned)
+    qss = context.app.styleSheet()
+    context.app.processEvents(QtCore.QEventLoop.AllEvents)
+
+    def run():
+        # Clearing repolishes too, but with no rules to match that part is cheap
+        context.app.setStyleSheet('')
+        context.app.setStyleSheet(qss)
+        window.grab()
+    return run
+
+
+@scenario('stylesheet_polish_full')
+def stylesheet_polish_full(context: BenchmarkContext) -> Callable[[], None]:
+    return _stylesheet_polish(context, pruned=False)
+
+
+@scenario('stylesheet_polish')
+def stylesheet_polish(context: BenchmarkContext) -> Callable[[], None]:
+    return _stylesheet_polish(context, pruned=True)
+
+
+@scenario('index_refresh_latency', qt=False)
+def index_refresh_latency(context: BenchmarkContext) -> Callable[[], None]:
+    """
+    Cold index refresh with every stat and listing delayed like on a network share.
+    CONTENTHUB_BENCH_RTT_MS sets the delay, CONTENTHUB_WALK_WORKERS the concurrency.
+    """
+    from shared.systems import asset_index
+    rtt = float(os.environ.get('CONTENTHUB_BENCH_RTT_MS', 20)) / 1000
+
+    def delayed(function):
+        def call(*args, **kwargs):
+            time.sleep(rtt)
+            return function(*args, **kwargs)
+        return call
+
+    os.scandir = delayed(os.scandir)
+    os.stat = delayed(os.stat)
+
+    def run():
+        index = asset_index.AssetIndex(':memory:')
+        index.refresh(context.library_root)
+        index.close()
+    return run
+
+
+@scenario('search_keystrokes', qt=False)
+def search_keystrokes(context: BenchmarkContext) -> Callable[[], None]:
+    from shared.systems import asset_index, search_index
+    index = search_index.SearchIndex(context.library_root)
+    index.add(asset_index.get_index().assets_under(context.library_root))
+    query = 'barrel tower alice'
+
+    def run():
+        for end in range(1, len(query) + 1):
+            index.search(query[:end])
+    return run
+
+
+@scenario('unreal_tick')
+def unreal_tick(context: BenchmarkContext) -> Callable[[], None]:
+    """
+    Editor frames with three hub windows open, Qt pumped from the stand-in tick.
+    Each frame has the windows repaint, the time is what the hub adds to the editor's frames.
+    """
+    import unreal
+    from PySide2 import QtCore
+    from hb_unreal.asset_hub_unreal.systems import qt_pump
+    from shared.widgets import tree_view
+
+    pump = qt_pump.get_pump()
+    windows = []
+    for _ in range(3):
+        window = tree_view.AssetTreeWidget(context.library_root)
+        window.setAttribute(QtCore.Qt.WA_DeleteOnClose)
+        window.resize(400, 600)
+        window.show()
+        pump.add_window(window)
+        windows.append(window)
+    # First show and polish are the startup scenario's concern
+    for _ in range(30):
+        unreal.tick()
+
+    def run():
+        for frame in range(TICK_FRAMES):
+            for window in windows:
+                window.viewport().update()
+            unreal.tick()
+    run.items = TICK_FRAMES
+    return run
+
+
+def _import_queue(context: BenchmarkContext, unchanged: bool) -> Callable[[], None]:
+    import unreal
+    from contenthub import core
+    from hb_unreal.asset_hub_unreal.systems import import_queue
+
+    asset_paths = list(core.iter_asset_paths(context.library_root))
+    state_path = os.path.join(context.scratch_dir, 'imported.json')
+    if unchanged:
+        queue = import_queue.ImportQueue(context.library_root, state_path=state_path)
+        queue.add_assets(asset_paths)
+        queue.run()
+
+    def run():
+        if not unchanged and os.path.exists(state_path):
+            os.remove(state_path)
+        unreal.imported_tasks.clear()
+        queue = import_queue.ImportQueue(context.library_root, state_path=state_path)
+        queue.add_assets(asset_paths)
+        queue.run()
+    run.items = len(asset_paths)
+    return run
+
+
+@scenario('unreal_import', qt=False)
+def unreal_import(context: BenchmarkContext) -> Callable[[], None]:
+    """
+    Queueing and importing every asset of the library against the stand-in unreal module.
+    CONTENTHUB_STUB_IMPORT_MS models the editor's cost per imported file.
+    """
+    return _import_queue(context, unchanged=False)
+
+
+@scenario('unreal_import_unchanged', qt=False)
+def unreal_import_unchanged(context: BenchmarkContext) -> Callable[[], None]:
+    """
+    The same import again with nothing republished, every asset is skipped
+    """
+    return _import_queue(context, unchanged=True)
+
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Run the Content Hub benchmarks headless")
+    parser.add_argument('library', nargs='?', help="Library root, a synthetic one is generated if omitted")
+    parser.add_argument('--scenario', action='append', choices=sorted(SCENARIOS),
+                        help="Scenario to run, may be repeated. Runs all by default")
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--assets', type=int, default=1000, help="Size of the generated library")
+    parser.add_argument('--results-dir', default=os.environ.get('CONTENTHUB_BENCHMARK_RESULTS',
+                                                                os.path.join(BENCHMARK_DIR, 'results')))
+    parser.add_argument('--compare', nargs='?', const='latest', default=None,
+                        help="Report to compare against, the latest stored one by default")
+    parser.add_argument('--threshold', type=float, default=0.1, help="Allowed slowdown before failing, 0.1 is 10%%")
+    parser.add_argument('--no-save', action='store_true')
+    parser.add_argument('--child', default=None, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    _setup_paths()
+    if args.child:
+        print(RESULT_PREFIX + json.dumps(run_child(args.child, args.library, args.repeat)))
+        sys.exit(0)
+
+    generated = None
+    library_root = args.library
+    if not library_root:
+        from benchmarks import generate_library
+        generated = tempfile.mkdtemp(prefix='contenthub_library_')
+        library_root = os.path.join(generated, 'Library')
+        print(f"Generating {args.assets} assets in {library_root}")
+        generate_library.generate_library(library_root, generate_library.LibrarySpec(assets=args.assets))
+
+    try:
+        baseline = latest_results(args.results_dir) if args.compare == 'latest' else args.compare
+        suite_results = run_suite(library_root, args.scenario or list(SCENARIOS), args.repeat)
+        if not args.no_save:
+            print(f"Saved {save_results(suite_results, library_root, args.results_dir)}")
+        passed = all('error' not in r for r in suite_results.values())
+        passed = check_budgets(suite_results) and passed
+        if baseline:
+            passed = compare(suite_results, baseline, args.threshold) and passed
+    finally:
+        if generated:
+            shutil.rmtree(generated, ignore_errors=True)
+    sys.exit(0 if passed else 1)
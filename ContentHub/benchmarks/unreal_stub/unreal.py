@@ -0,0 +1,159 @@
+"""
+Stand-in for the editor's unreal module, enough of it to run the hub's Unreal
+systems headless. Imports are recorded instead of performed.
+"""
+from __future__ import annotations
+
+from typing import Any, Callable
+
+import os
+import time
+import tempfile
+
+
+# Seconds every imported file takes, to model the editor's import cost
+IMPORT_SECONDS = float(os.environ.get('CONTENTHUB_STUB_IMPORT_MS', 0)) / 1000
+
+# Every task passed to import_asset_tasks, in order
+imported_tasks: list[AssetImportTask] = []
+# Files whose import should fail, as the editor does for a broken fbx
+failing_files: set[str] = set()
+logs: list[tuple[str, str]] = []
+
+_tick_callbacks: dict[int, Callable[[float], None]] = {}
+_shutdown_callbacks: dict[int, Callable[[], None]] = {}
+_next_handle = 0
+
+
+class _Object:
+    def __init__(self):
+        self._properties: dict[str, Any] = {}
+
+    def set_editor_property(self, name: str, value: Any):
+        self._properties[name] = value
+
+    def get_editor_property(self, name: str) -> Any:
+        return self._properties.get(name)
+
+    def set_editor_properties(self, properties: dict[str, Any]):
+        self._properties.update(properties)
+
+
+class AssetImportTask(_Object):
+    def __init__(self):
+        super().__init__()
+        self._properties['imported_object_paths'] = []
+
+
+class FbxImportUI(_Object):
+    pass
+
+
+class AssetTools:
+    def import_asset_tasks(self, tasks: list[AssetImportTask]):
+        for task in tasks:
+            if IMPORT_SECONDS:
+                time.sleep(IMPORT_SECONDS)
+            imported_tasks.append(task)
+            filename = task.get_editor_property('filename')
+            if filename in failing_files or not os.path.isfile(filename):
+                task.set_editor_property('imported_object_paths', [])
+                continue
+            name = task.get_editor_property('destination_name') or os.path.splitext(os.path.basename(filename))[0]
+            path = f"{task.get_editor_property('destination_path')}/{name}"
+            task.set_editor_property('imported_object_paths', [f"{path}.{name}"])
+
+
+class AssetToolsHelpers:
+    _tools = AssetTools()
+
+    @staticmethod
+    def get_asset_tools() -> AssetTools:
+        return AssetToolsHelpers._tools
+
+
+class Paths:
+    @staticmethod
+    def project_saved_dir() -> str:
+        return os.environ.get('CONTENTHUB_STUB_SAVED_DIR') or os.path.join(tempfile.gettempdir(), 'unreal_stub_saved')
+
+
+class ScopedSlowTask:
+    def __init__(self, work: float, desc: str = ''):
+        self.work = work
+        self.desc = desc
+        self.completed = 0.0
+
+    def __enter__(self) -> ScopedSlowTask:
+        return self
+
+    def __exit__(self, *args):
+        return False
+
+    def make_dialog(self, can_cancel: bool = False, allow_in_pie: bool = False):
+        pass
+
+    def enter_progress_frame(self, work: float = 1.0, desc: str = ''):
+        self.completed += work
+
+    def should_cancel(self) -> bool:
+        return False
+
+
+def parent_external_window_to_slate(window_id: int):
+    pass
+
+
+def register_slate_post_tick_callback(callback: Callable[[float], None]) -> int:
+    return _register(_tick_callbacks, callback)
+
+
+def unregister_slate_post_tick_callback(handle: int):
+    _tick_callbacks.pop(handle, None)
+
+
+def register_python_shutdown_callback(callback: Callable[[], None]) -> int:
+    return _register(_shutdown_callbacks, callback)
+
+
+def unregister_python_shutdown_callback(handle: int):
+    _shutdown_callbacks.pop(handle, None)
+
+
+def tick(delta_seconds: float = 1 / 60) -> float:
+    """
+    Drives one editor frame: runs every post-tick callback like Slate does.
+    Returns the seconds the callbacks took, the cost they add to the frame.
+    """
+    start = time.perf_counter()
+    for callback in list(_tick_callbacks.values()):
+        callback(delta_seconds)
+    return time.perf_counter() - start
+
+
+def shutdown():
+    """
+    Runs the shutdown callbacks like the editor does on exit
+    """
+    for callback in list(_shutdown_callbacks.values()):
+        callback()
+    _shutdown_callbacks.clear()
+
+
+def _register(callbacks: dict[int, Callable], callback: Callable) -> int:
+    global _next_handle
+    _next_handle += 1
+    callbacks[_next_handle] = callback
+    return _next_handle
+
+
+def log(message: str):
+    logs.append(('log', str(message)))
+
+
+def log_warning(message: str):
+    logs.append(('warning', str(message)))
+
+
+def log_error(message: str):
+    logs.append(('error', str(message)))
@@ -0,0 +1,136 @@
+from __future__ import annotations
+
+from typing import Any, Callable, Iterable, Iterator
+
+import os
+import sys
+import json
+import time
+import multiprocessing
+
+CONTENTHUB_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if CONTENTHUB_ROOT not in sys.path:
+    sys.path.insert(0, CONTENTHUB_ROOT)
+
+from contenthub import core
+
+
+# Assets handed to a worker at a time, enough to keep the per-task overhead small
+CHUNK_SIZE = 64
+
+
+def _validate(args: tuple[str, bool]) -> tuple[str, list[str]]:
+    asset_path, check_hashes = args
+    try:
+        return asset_path, core.validate_asset(asset_path, check_hashes)
+    except Exception as e:
+        return asset_path, [f"could not be validated: {e}"]
+
+
+def _stats(asset_path: str) -> dict[str, Any]:
+    try:
+        return core.asset_stats(asset_path)
+    except Exception:
+        return {'assets': 1, 'unreadable': 1}
+
+
+def pool_map(function: Callable, items: Iterable[Any], workers: int) -> Iterator[Any]:
+    """
+    Runs the function over the items on a process pool, results in completion order.
+    Items are consumed as they are produced, so workers start while the walk is still running.
+    """
+    if workers <= 1:
+        yield from map(function, items)
+        return
+    with multiprocessing.Pool(workers) as pool:
+        yield from pool.imap_unordered(function, items, chunksize=CHUNK_SIZE)
+
+
+def command_scan(args) -> int:
+    records = core.scan(args.root)
+    for record in records:
+        if args.json:
+            print(json.dumps(record._asdict()))
+        else:
+            print(f"{record.path}  {record.latest}  {record.author}  {record.date}")
+    print(f"{len(records)} assets", file=sys.stderr)
+    return 0
+
+
+def command_validate(args) -> int:
+    checked = failed = 0
+    items = ((asset_path, args.hashes) for asset_path in core.iter_asset_paths(args.root))
+    for asset_path, problems in pool_map(_validate, items, args.workers):
+        checked += 1
+        if problems:
+            failed += 1
+            if args.json:
+                print(json.dumps({'path': asset_path, 'problems': problems}))
+            else:
+                print(asset_path)
+                for problem in problems:
+                    print(f"    {problem}")
+    print(f"{checked} assets checked, {failed} with problems", file=sys.stderr)
+    return 1 if failed else 0
+
+
+def command_stats(args) -> int:
+    total: dict[str, Any] = {}
+    for stats in pool_map(_stats, core.iter_asset_paths(args.root), args.workers):
+        core.merge_stats(total, stats)
+    if args.json:
+        print(json.dumps(total, indent=4))
+        return 0
+    for key in ('assets', 'versions', 'files', 'thumbnails', 'unreadable'):
+        if key in total:
+            print(f"{key:>12}: {total[key]}")
+    print(f"{'size':>12}: {total.get('bytes', 0) / 1024 ** 3:.2f} GB")
+    for author, count in sorted(total.get('authors', {}).items(), key=lambda item: -item[1]):
+        print(f"{author:>12}: {count} versions")
+    return 0
+
+
+def command_reindex(args) -> int:
+    count = core.reindex(args.root, manifest=args.manifest)
+    print(f"{count} assets indexed")
+    return 0
+
+
+def main(argv: list[str] | None = None) -> int:
+    import argparse
+
+    parser = argparse.ArgumentParser(prog='contenthub', description="Headless Content Hub library tools")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    scan = commands.add_parser('scan', help="List every asset, from the local index")
+    scan.add_argument('root')
+    scan.add_argument('--json', action='store_true', help="One JSON record per line")
+    scan.set_defaults(run=command_scan)
+
+    validate = commands.add_parser('validate', help="Check the metadata and files of every version")
+    validate.add_argument('root')
+    validate.add_argument('--hashes', action='store_true', help="Also verify the content hash of published files")
+    validate.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    validate.add_argument('--json', action='store_true', help="One JSON line per asset with problems")
+    validate.set_defaults(run=command_validate)
+
+    stats = commands.add_parser('stats', help="Count assets, versions, files and bytes")
+    stats.add_argument('root')
+    stats.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    stats.add_argument('--json', action='store_true')
+    stats.set_defaults(run=command_stats)
+
+    reindex = commands.add_parser('reindex', help="Rebuild the local index, and the project manifest if there is one")
+    reindex.add_argument('root')
+    reindex.add_argument('--manifest', action='store_true', help="Create a project manifest at the root if missing")
+    reindex.set_defaults(run=command_reindex)
+
+    args = parser.parse_args(argv)
+    start = time.perf_counter()
+    result = args.run(args)
+    print(f"{args.command} took {time.perf_counter() - start:.1f} s", file=sys.stderr)
+    return result
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,168 @@
+"""
+Qt-free operations on an asset library, shared by the DCC widgets and the contenthub CLI
+"""
+from __future__ import annotations
+
+from typing import Any, Iterable, Iterator
+
+import os
+from collections import Counter
+
+from shared.systems import asset_index, blob_store, dir_walker, metadata_store, project_manifest, version_journal
+
+
+METADATA_FILE = asset_index.METADATA_FILE
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.bmp', '.gif')
+
+
+def iter_asset_paths(root_path: str, workers: int | None = None) -> Iterator[str]:
+    """
+    Yields every asset folder below the root as it is found, listing many folders at a time.
+    Asset folders are not descended into.
+    """
+    for listing in dir_walker.walk(root_path, descend=lambda listing: listing.file(METADATA_FILE) is None,
+                                   workers=workers):
+        if listing.file(METADATA_FILE) is not None:
+            yield asset_index.normalize_path(listing.path)
+
+
+def find_files(root_path: str, extensions: Iterable[str] = IMAGE_EXTENSIONS) -> list[str]:
+    """
+    Returns every file below the root with one of the extensions, sorted
+    """
+    extensions = tuple(extension.lower() for extension in extensions)
+    paths = []
+    for listing in dir_walker.walk(root_path):
+        paths.extend(entry.path for entry in listing.files if entry.name.lower().endswith(extensions))
+    return sorted(paths)
+
+
+def scan(root_path: str, index: asset_index.AssetIndex | None = None) -> list[asset_index.AssetRecord]:
+    """
+    Returns the records of every asset below the root, from the local index brought up to date
+    """
+    return (index or asset_index.get_index()).assets_under(root_path)
+
+
+def read_metadata(asset_path: str) -> metadata_store.AssetMetadata | None:
+    return metadata_store.get_store().get(os.path.join(asset_path, METADATA_FILE))
+
+
+def latest_version(asset_path: str) -> metadata_store.VersionRecord | None:
+    """
+    Returns the latest published version, read from the small head only
+    """
+    metadata = read_metadata(asset_path)
+    return metadata.latest_version() if metadata else None
+
+
+def validate_asset(asset_path: str, check_hashes: bool = False) -> list[str]:
+    """
+    Checks the metadata and every version's files of one asset, returns the problems found.
+    With check_hashes the content of files published with a hash is verified too.
+    """
+    try:
+        head = version_journal.read_head(asset_path)
+    except ValueError:
+        return [f"{METADATA_FILE} is not valid JSON"]
+    if head is None:
+        return [f"{METADATA_FILE} is missing"]
+
+    problems = []
+    if not head.get('name'):
+        problems.append("has no name")
+    try:
+        versions = version_journal.read_versions(asset_path)
+    except ValueError:
+        return problems + ["version history is not valid JSON"]
+    if not versions:
+        return problems + ["has no published versions"]
+
+    numbers = Counter(metadata_store.version_number(entry.get('version', '')) for entry in versions)
+    problems.extend(f"v{number:03d} is in the history {count} times" for number, count in numbers.items() if count > 1)
+    if metadata_store.version_number(head.get('latest', '')) not in numbers:
+        problems.append(f"latest {head.get('latest')!r} is not a published version")
+    if 'journal' in head and head.get('next_version', 0) <= max(numbers):
+        problems.append(f"next_version {head.get('next_version')} is not above v{max(numbers):03d}")
+
+    for entry in versions:
+        record = metadata_store.VersionRecord.from_dict(entry)
+        label = record.version or '?'
+        if 'journal' in head and version_journal.read_version(asset_path, record.version) is None:
+            problems.append(f"{label}: {version_journal.version_folder(record.version)}/"
+                            f"{version_journal.VERSION_FILE} is missing")
+        for key, value in record.files.items():
+            relative = record.file_path(key)
+            if not relative:
+                problems.append(f"{label}: file '{key}' has no path")
+                continue
+            problems.extend(f"{label}: {problem}"
+                            for problem in _check_file(os.path.join(asset_path, relative), value, check_hashes))
+        if record.thumbnail and not os.path.isfile(os.path.join(asset_path, record.thumbnail)):
+            problems.append(f"{label}: thumbnail {record.thumbnail} is missing")
+    return problems
+
+
+def _check_file(path: str, value: str | dict[str, Any], check_hashes: bool) -> list[str]:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return [f"{os.path.basename(path)} is missing"]
+    if isinstance(value, str):
+        return []
+    if 'size' in value and st.st_size != value['size']:
+        return [f"{os.path.basename(path)} is {st.st_size} bytes, published as {value['size']}"]
+    if check_hashes and value.get('hash') and blob_store.hash_file(path) != value['hash']:
+        return [f"{os.path.basename(path)} does not match its published hash"]
+    return []
+
+
+def asset_stats(asset_path: str) -> dict[str, Any]:
+    """
+    Returns version, file and size counts of one asset
+    """
+    stats = {'assets': 1, 'versions': 0, 'files': 0, 'bytes': 0, 'thumbnails': 0, 'authors': Counter()}
+    try:
+        versions = version_journal.read_versions(asset_path)
+    except ValueError:
+        return stats
+    for entry in versions:
+        record = metadata_store.VersionRecord.from_dict(entry)
+        stats['versions'] += 1
+        stats['thumbnails'] += bool(record.thumbnail)
+        stats['authors'][record.author or 'unknown'] += 1
+        for key, value in record.files.items():
+            stats['files'] += 1
+            if isinstance(value, dict) and 'size' in value:
+                stats['bytes'] += value['size']
+            else:
+                try:
+                    stats['bytes'] += os.path.getsize(os.path.join(asset_path, record.file_path(key)))
+                except OSError:
+                    pass
+    return stats
+
+
+def merge_stats(total: dict[str, Any], stats: dict[str, Any]) -> dict[str, Any]:
+    for key, value in stats.items():
+        if key in total:
+            total[key] += value
+        else:
+            total[key] = Counter(value) if isinstance(value, Counter) else value
+    return total
+
+
+def reindex(root_path: str, manifest: bool = False) -> int:
+    """
+    Rebuilds the local index of the root from scratch. The project manifest is
+    rebuilt too if the project has one, or created if manifest is set.
+    Returns the number of assets indexed.
+    """
+    index = asset_index.get_index()
+    index.forget(root_path)
+    records = index.assets_under(root_path)
+
+    project_root = project_manifest.find_project_root(root_path)
+    if project_root or manifest:
+        project_manifest.build_manifest(project_root or root_path)
+    return len(records)
@@ -1,55 +1,88 @@
 import unreal
-import sys
 
 from hb_unreal.lib import unreal_stylesheet
-from PySide6 import QtWidgets
+from PySide6 import QtCore, QtWidgets
 
-from shared import tree_view
+from shared.systems import project_manifest
+from shared.widgets import tree_view
+from hb_unreal.asset_hub_unreal.systems import import_queue, qt_pump
 
 from importlib import reload
 reload(unreal_stylesheet)
 
 
 class TestWindow(QtWidgets.QWidget):
+    # How often the project manifest is checked for new publishes
+    MANIFEST_POLL_MS = 5000
+
     def __init__(self, parent=None):
         super().__init__(parent)
         self.setWindowTitle("TestWindow")
         self.resize(400, 200)
 
-        self.asset_tree = tree_view.AssetTreeWidget("D:/Xicheng/Projects/HarshBlue/Maya-Unreal-Tool-Dev-Course/Projects/Ellie")
+        root_path = "D:/Xicheng/Projects/HarshBlue/Maya-Unreal-Tool-Dev-Course/Projects/Ellie"
+        self.import_queue = import_queue.ImportQueue(root_path)
+        self.asset_tree = tree_view.AssetTreeWidget("")
+        self.asset_tree.root_path = root_path
+        # Projects with a manifest are shown from it, others are listed from disk
+        self.asset_tree.set_manifest(project_manifest.get_reader(root_path))
+        self.manifest_timer = QtCore.QTimer(self)
+        self.manifest_timer.setInterval(self.MANIFEST_POLL_MS)
+        self.manifest_timer.timeout.connect(self.asset_tree.refresh_manifest)
+        if self.asset_tree.manifest is not None:
+            self.manifest_timer.start()
 
         # widgets
         self.label = QtWidgets.QLabel("Hello Unreal Style!", self)
         self.button = QtWidgets.QPushButton("Click Me", self)
+        self.import_button = QtWidgets.QPushButton("Import Selected", self)
 
         # layout
         layout = QtWidgets.QVBoxLayout(self)
         layout.addWidget(self.asset_tree)
         layout.addWidget(self.label)
         layout.addWidget(self.button)
+        layout.addWidget(self.import_button)
 
         # connect
         self.button.clicked.connect(self.on_button_clicked)
+        self.import_button.clicked.connect(self.on_import_clicked)
 
     def on_button_clicked(self):
         self.label.setText("Button clicked!")
 
+    def on_import_clicked(self):
+        # A folder imports every asset below it, an asset only itself
+        path = self.asset_tree.selected_path()
+        if not path:
+            self.label.setText("Select an asset or folder to import")
+            return
+        if not self.import_queue.add_folder(path):
+            self.label.setText("Nothing published to import")
+            return
+        report = self.import_queue.run()
+        self.label.setText(report.summary())
+
 
 def launch():
-    app = QtWidgets.QApplication.instance()
-    if not app:
-        app = QtWidgets.QApplication(sys.argv)
+    """
+    Opens a hub window parented to the editor. Qt runs from the editor's tick,
+    so this returns right away and can be called again for more windows.
+    """
+    pump = qt_pump.get_pump()
 
     # style your QApp, requires a QApplication instance
-    unreal_stylesheet.setup()  # <== Just 1 line of code to make the magic happen
+    unreal_stylesheet.setup(pump.app)  # <== Just 1 line of code to make the magic happen
 
     w = TestWindow()
+    # Closing deletes the window, the pump stops with the last one
+    w.setAttribute(QtCore.Qt.WA_DeleteOnClose)
     w.show()
 
     unreal.parent_external_window_to_slate(w.winId())
+    pump.add_window(w)
+    return w
 
-    print(int(w.winId()))
-    sys.exit(app.exec())
 
 if __name__ == '__main__':
-    launch()
\ No newline at end of file
+    launch()
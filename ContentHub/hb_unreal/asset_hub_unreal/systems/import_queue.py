@@ -0,0 +1,194 @@
+from __future__ import annotations
+
+from typing import Any, Callable, Iterable, NamedTuple
+
+import os
+import re
+import json
+import time
+
+import unreal
+
+from contenthub import core
+from shared.systems import asset_index, version_journal
+
+
+DEFAULT_DESTINATION = '/Game/ContentHub'
+DEFAULT_BATCH_SIZE = 32
+STATE_FILE = 'ContentHub/imported.json'
+
+_INVALID_PACKAGE_CHARS = re.compile(r'[^A-Za-z0-9_/]')
+
+
+class ImportItem(NamedTuple):
+    asset_path: str
+    version: str
+    fbx_path: str
+    # What identifies the published content, its hash when published through the blob store
+    fingerprint: str
+    destination_path: str
+    destination_name: str
+
+
+class ImportReport(NamedTuple):
+    imported: list[ImportItem]
+    skipped: list[ImportItem]
+    failed: list[ImportItem]
+    seconds: float
+
+    @property
+    def assets_per_second(self) -> float:
+        done = len(self.imported) + len(self.skipped)
+        return done / self.seconds if self.seconds else 0.0
+
+    def summary(self) -> str:
+        return (f"Imported {len(self.imported)}, skipped {len(self.skipped)} unchanged, "
+                f"{len(self.failed)} failed in {self.seconds:.1f} s ({self.assets_per_second:.1f} assets/s)")
+
+
+class ImportQueue:
+    """
+    Imports the latest published fbx of many assets into the editor.
+    Tasks go to AssetTools in batches, and assets whose published content matches
+    what was last imported are skipped. What was imported is remembered in the
+    project's Saved folder, so skipping works across editor sessions.
+    """
+
+    def __init__(self, library_root: str, destination_root: str = DEFAULT_DESTINATION,
+                 batch_size: int = DEFAULT_BATCH_SIZE, state_path: str | None = None):
+        self.library_root = asset_index.normalize_path(library_root)
+        self.destination_root = destination_root.rstrip('/')
+        self.batch_size = batch_size
+        self.state_path = state_path or os.path.join(unreal.Paths.project_saved_dir(), STATE_FILE)
+        self.items: dict[str, ImportItem] = {}
+        self._state: dict[str, dict[str, str]] | None = None
+
+    def add_assets(self, asset_paths: Iterable[str]) -> int:
+        """
+        Queues the latest version of each asset, returns how many could be queued
+        """
+        added = 0
+        for asset_path in asset_paths:
+            item = self._item(asset_index.normalize_path(asset_path))
+            if item is not None:
+                self.items[item.asset_path] = item
+                added += 1
+        return added
+
+    def add_folder(self, folder: str) -> int:
+        """
+        Queues every asset at or below the folder
+        """
+        return self.add_assets(core.iter_asset_paths(folder))
+
+    def clear(self):
+        self.items.clear()
+
+    def is_unchanged(self, item: ImportItem) -> bool:
+        imported = self._load_state().get(item.asset_path)
+        return imported is not None and imported.get('fingerprint') == item.fingerprint
+
+    def run(self, force: bool = False, progress: Callable[[int, int], None] | None = None) -> ImportReport:
+        """
+        Imports everything queued. Unchanged assets are skipped unless force is set.
+        Progress is reported as (done, total) after every batch.
+        """
+        start = time.perf_counter()
+        items = sorted(self.items.values())
+        skipped = [] if force else [item for item in items if self.is_unchanged(item)]
+        skipped_paths = {item.asset_path for item in skipped}
+        pending = [item for item in items if item.asset_path not in skipped_paths]
+        imported, failed = [], []
+
+        asset_tools = unreal.AssetToolsHelpers.get_asset_tools()
+        with unreal.ScopedSlowTask(len(pending), "Importing Content Hub assets") as slow_task:
+            slow_task.make_dialog(True)
+            for first in range(0, len(pending), self.batch_size):
+                if slow_task.should_cancel():
+                    break
+                batch = pending[first:first + self.batch_size]
+                tasks = [self._task(item) for item in batch]
+                asset_tools.import_asset_tasks(tasks)
+
+                for item, task in zip(batch, tasks):
+                    if task.get_editor_property('imported_object_paths'):
+                        imported.append(item)
+                        self._load_state()[item.asset_path] = {'version': item.version,
+                                                               'fingerprint': item.fingerprint}
+                    else:
+                        failed.append(item)
+                        unreal.log_warning(f"Content Hub: failed to import {item.fbx_path}")
+                # Saved per batch, a crash or cancel keeps what was already imported
+                self._save_state()
+                slow_task.enter_progress_frame(len(batch))
+                if progress:
+                    progress(len(imported) + len(failed), len(pending))
+
+        # Failed and cancelled items stay queued for the next run
+        for item in imported + skipped:
+            self.items.pop(item.asset_path, None)
+        report = ImportReport(imported, skipped, failed, time.perf_counter() - start)
+        unreal.log(f"Content Hub: {report.summary()}")
+        return report
+
+    def _item(self, asset_path: str) -> ImportItem | None:
+        latest = core.latest_version(asset_path)
+        relative = latest.file_path('fbx') if latest else ''
+        if not relative:
+            return None
+        fbx_path = os.path.join(asset_path, relative).replace("\\", "/")
+        fingerprint = latest.file_hash('fbx')
+        if not fingerprint:
+            # Published before content hashes, the file's identity has to do
+            try:
+                st = os.stat(fbx_path)
+            except OSError:
+                return None
+            fingerprint = f"{version_journal.version_folder(latest.version)}:{st.st_size}:{st.st_mtime}"
+
+        folder = os.path.dirname(asset_path)
+        if folder == self.library_root or folder.startswith(self.library_root + '/'):
+            folder = folder[len(self.library_root):]
+        else:
+            folder = ''
+        destination = _package_path(f"{self.destination_root}{folder}")
+        name = _package_path(os.path.basename(asset_path))
+        return ImportItem(asset_path, str(latest.version), fbx_path, fingerprint, destination, name)
+
+    def _task(self, item: ImportItem) -> Any:
+        options = unreal.FbxImportUI()
+        options.set_editor_property('import_mesh', True)
+        options.set_editor_property('import_materials', False)
+        options.set_editor_property('import_textures', False)
+        options.set_editor_property('import_as_skeletal', False)
+
+        task = unreal.AssetImportTask()
+        task.set_editor_property('filename', item.fbx_path)
+        task.set_editor_property('destination_path', item.destination_path)
+        task.set_editor_property('destination_name', item.destination_name)
+        task.set_editor_property('automated', True)
+        task.set_editor_property('replace_existing', True)
+        task.set_editor_property('save', False)
+        task.set_editor_property('options', options)
+        return task
+
+    def _load_state(self) -> dict[str, dict[str, str]]:
+        if self._state is None:
+            try:
+                with open(self.state_path, 'r', encoding='utf-8') as f:
+                    self._state = json.load(f)
+            except (FileNotFoundError, ValueError):
+                self._state = {}
+        return self._state
+
+    def _save_state(self):
+        os.makedirs(os.path.dirname(self.state_path), exist_ok=True)
+        tmp_path = f"{self.state_path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self._load_state(), f, indent=1)
+        os.replace(tmp_path, self.state_path)
+
+
+def _package_path(path: str) -> str:
+    # Content paths only take letters, digits and underscores
+    return _INVALID_PACKAGE_CHARS.sub('_', path)
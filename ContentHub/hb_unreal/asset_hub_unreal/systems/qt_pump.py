@@ -0,0 +1,121 @@
+"""
+Runs Qt inside the editor without blocking it. Instead of app.exec(), Qt's
+events are processed from Slate's post-tick callback, for at most a budget of
+every editor frame, while any hub window is open.
+"""
+from __future__ import annotations
+
+from typing import Any
+
+import os
+import time
+
+import unreal
+
+from hb_unreal.lib import unreal_stylesheet
+
+
+# Most of an editor frame spent processing Qt events, in milliseconds
+DEFAULT_BUDGET_MS = int(os.environ.get('CONTENTHUB_TICK_BUDGET_MS', 4))
+
+
+class QtTickPump:
+    """
+    Processes Qt events once per editor tick while it has windows.
+    Windows are forgotten when destroyed, the pump unregisters itself with the last one.
+    """
+
+    def __init__(self, app: Any, budget_ms: int = DEFAULT_BUDGET_MS):
+        self.app = app
+        self.budget_ms = budget_ms
+        self.windows: list[Any] = []
+        self.ticks = 0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+        self._tick_handle = None
+        self._shutdown_handle = None
+        _, self._qt_core = unreal_stylesheet.import_qt_bindings()
+
+    @property
+    def running(self) -> bool:
+        return self._tick_handle is not None
+
+    def add_window(self, window: Any):
+        """
+        Keeps the window alive and its events processed until it is destroyed
+        """
+        if window in self.windows:
+            return
+        self.windows.append(window)
+        window.destroyed.connect(lambda *args, window=window: self.remove_window(window))
+        self.start()
+
+    def remove_window(self, window: Any):
+        if window in self.windows:
+            self.windows.remove(window)
+
+    def start(self):
+        if self._tick_handle is None:
+            self._tick_handle = unreal.register_slate_post_tick_callback(self._tick)
+        if self._shutdown_handle is None:
+            self._shutdown_handle = unreal.register_python_shutdown_callback(self.shutdown)
+
+    def stop(self):
+        if self._tick_handle is not None:
+            unreal.unregister_slate_post_tick_callback(self._tick_handle)
+            self._tick_handle = None
+        if self._shutdown_handle is not None:
+            unreal.unregister_python_shutdown_callback(self._shutdown_handle)
+            self._shutdown_handle = None
+
+    def shutdown(self):
+        """
+        Closes every window and lets Qt delete them before the pump stops
+        """
+        for window in list(self.windows):
+            window.close()
+            window.deleteLater()
+        self._process(0)
+        self.windows.clear()
+        self.stop()
+
+    def stats(self) -> dict[str, float]:
+        return {
+            'ticks': self.ticks,
+            'mean_ms': self.total_seconds / self.ticks * 1000 if self.ticks else 0.0,
+            'max_ms': self.max_seconds * 1000,
+        }
+
+    def _tick(self, delta_seconds: float):
+        start = time.perf_counter()
+        self._process(self.budget_ms)
+        elapsed = time.perf_counter() - start
+        self.ticks += 1
+        self.total_seconds += elapsed
+        self.max_seconds = max(self.max_seconds, elapsed)
+        if not self.windows:
+            self.stop()
+
+    def _process(self, budget_ms: int):
+        QtCore = self._qt_core
+        # Stops between events once the budget is used, the rest waits for the next tick
+        self.app.processEvents(QtCore.QEventLoop.AllEvents, budget_ms)
+        # deleteLater() is only honoured by a running event loop, there is none here
+        self.app.sendPostedEvents(None, QtCore.QEvent.DeferredDelete)
+
+
+_pump: QtTickPump | None = None
+
+
+def get_pump(budget_ms: int | None = None) -> QtTickPump:
+    """
+    Returns the editor session's pump, creating the QApplication if there is none
+    """
+    global _pump
+    QtWidgets, _ = unreal_stylesheet.import_qt_bindings()
+    app = QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+    if _pump is None or _pump.app is not app:
+        _pump = QtTickPump(app)
+    if budget_ms is not None:
+        _pump.budget_ms = budget_ms
+    return _pump
@@ -0,0 +1,185 @@
+"""
+Compiles ue.scss into a minified QSS holding only the rules our widgets can match.
+
+Handles the subset of SCSS the stylesheet uses: $variables, nested rules and
+the & parent selector. Run as a script to rebuild ue.min.qss after editing ue.scss:
+
+    python -m hb_unreal.lib.unreal_stylesheet.compiler
+"""
+from __future__ import annotations
+
+from typing import Iterable
+
+import os
+import re
+import hashlib
+
+
+MODULE_PATH = os.path.dirname(os.path.abspath(__file__))
+SCSS_PATH = os.path.join(MODULE_PATH, 'ue.scss')
+COMPILED_PATH = os.path.join(MODULE_PATH, 'ue.min.qss')
+
+# Bumped whenever the compiler output changes for the same source
+COMPILER_VERSION = 1
+
+# Qt classes the Content Hub widgets are or derive from. Qt style sheets match a
+# type selector against every base class, so QTreeView rules also style QTreeWidget.
+USED_TYPES = (
+    'QWidget', 'QFrame', 'QDialog', 'QMainWindow', 'QLabel', 'QPushButton', 'QCheckBox', 'QLineEdit',
+    'QComboBox', 'QTreeView', 'QListView', 'QHeaderView', 'QScrollBar', 'QMenu', 'QSplitter',
+)
+
+_COMMENT = re.compile(r'/\*.*?\*/|//[^\n]*', re.S)
+_VARIABLE = re.compile(r'^\s*\$([\w-]+)\s*:\s*([^;]+);', re.M)
+_COMPOUND_TYPE = re.compile(r'^[*#]?[\w-]*')
+_HASH_HEADER = re.compile(r'^/\* source-sha1: (\w+) \*/')
+
+
+def compile_scss(source: str) -> list[tuple[list[str], list[tuple[str, str]]]]:
+    """
+    Returns the rules as (selectors, [(property, value)]), in source order
+    """
+    source = _COMMENT.sub('', source)
+    variables = {name: value.strip() for name, value in _VARIABLE.findall(source)}
+    source = _VARIABLE.sub('', source)
+    # Longest first so $black-dark is not replaced as $black
+    for name in sorted(variables, key=len, reverse=True):
+        source = source.replace(f"${name}", variables[name])
+
+    rules = []
+    # (selectors, declarations) of every open block
+    stack: list[tuple[list[str], list[tuple[str, str]]]] = []
+    text = ''
+    for char in source:
+        if char == '{':
+            parents = stack[-1][0] if stack else ['']
+            stack.append((_nest(parents, text), []))
+            rules.append(stack[-1])
+            text = ''
+        elif char == ';' or char == '}':
+            if ':' in text and text.strip() and stack:
+                name, value = text.split(':', 1)
+                stack[-1][1].append((name.strip(), ' '.join(value.split())))
+            text = ''
+            if char == '}':
+                stack.pop()
+        else:
+            text += char
+    return [(selectors, declarations) for selectors, declarations in rules if declarations]
+
+
+def _nest(parents: list[str], text: str) -> list[str]:
+    selectors = []
+    for parent in parents:
+        for child in text.split(','):
+            child = ' '.join(child.split())
+            if '&' in child:
+                selectors.append(child.replace('&', parent))
+            else:
+                selectors.append(f"{parent} {child}".strip())
+    return selectors
+
+
+def selector_types(selector: str) -> list[str]:
+    """
+    Returns the type or #id each compound of a selector starts with,
+    e.g. ['QTableWidget', 'QTableCornerButton'] for 'QTableWidget QTableCornerButton::section'
+    """
+    compounds = selector.replace('>', ' ').split()
+    return [_COMPOUND_TYPE.match(compound).group(0) for compound in compounds]
+
+
+def prune(rules: list[tuple[list[str], list[tuple[str, str]]]], keep: Iterable[str]
+          ) -> list[tuple[list[str], list[tuple[str, str]]]]:
+    """
+    Drops every selector naming a type or #id that is not in keep,
+    and the rules left without selectors
+    """
+    keep = set(keep) | {'', '*'}
+    pruned = []
+    for selectors, declarations in rules:
+        selectors = [selector for selector in selectors if all(t in keep for t in selector_types(selector))]
+        if selectors:
+            pruned.append((selectors, declarations))
+    return pruned
+
+
+def minify(rules: list[tuple[list[str], list[tuple[str, str]]]]) -> str:
+    return '\n'.join(','.join(selectors) + '{' + ';'.join(f"{name}:{value}" for name, value in declarations) + '}'
+                     for selectors, declarations in rules)
+
+
+def source_hash(source: str, keep: Iterable[str] = USED_TYPES) -> str:
+    key = f"{COMPILER_VERSION}\n{','.join(sorted(keep))}\n{source}"
+    return hashlib.sha1(key.encode('utf-8')).hexdigest()
+
+
+def compile_stylesheet(source: str, keep: Iterable[str] = USED_TYPES) -> str:
+    """
+    Returns the pruned, minified QSS, headed by the hash of what it was built from
+    """
+    keep = tuple(keep)
+    return f"/* source-sha1: {source_hash(source, keep)} */\n" + minify(prune(compile_scss(source), keep))
+
+
+def load_compiled(scss_path: str = SCSS_PATH, compiled_path: str = COMPILED_PATH,
+                  keep: Iterable[str] = USED_TYPES) -> str:
+    """
+    Returns the compiled stylesheet, rebuilding and rewriting it only when the
+    source hash no longer matches the one it was built from
+    """
+    keep = tuple(keep)
+    with open(scss_path, 'r', encoding='utf-8') as f:
+        source = f.read()
+    expected = source_hash(source, keep)
+
+    try:
+        with open(compiled_path, 'r', encoding='utf-8') as f:
+            compiled = f.read()
+        match = _HASH_HEADER.match(compiled)
+        if match and match.group(1) == expected:
+            return compiled
+    except OSError:
+        pass
+
+    compiled = compile_stylesheet(source, keep)
+    try:
+        with open(compiled_path, 'w', encoding='utf-8') as f:
+            f.write(compiled)
+    except OSError:
+        # Read-only installs still get the stylesheet, just compiled on every launch
+        pass
+    return compiled
+
+
+def used_types(widget) -> set[str]:
+    """
+    Collects the Qt class names, base classes included, of a live widget and its children.
+    Useful for checking USED_TYPES against a real window.
+    """
+    names = set()
+    pending = [widget]
+    while pending:
+        child = pending.pop()
+        pending.extend(child.children())
+        meta = child.metaObject()
+        while meta is not None:
+            names.add(meta.className())
+            meta = meta.superClass()
+    return names
+
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Compile ue.scss into a pruned, minified QSS")
+    parser.add_argument('--scss', default=SCSS_PATH)
+    parser.add_argument('-o', '--output', default=COMPILED_PATH)
+    args = parser.parse_args()
+
+    with open(args.scss, 'r', encoding='utf-8') as f:
+        scss_source = f.read()
+    result = compile_stylesheet(scss_source)
+    with open(args.output, 'w', encoding='utf-8') as f:
+        f.write(result)
+    print(f"Wrote {len(result)} bytes to {args.output}")
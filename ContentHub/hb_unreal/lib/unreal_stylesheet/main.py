@@ -1,56 +1,68 @@
 import os
+import sys
 from contextlib import suppress
 
+from hb_unreal.lib.unreal_stylesheet import compiler
+
 
 MODULE_PATH = os.path.dirname(os.path.abspath(__file__))
 QSS_PATH = os.path.join(MODULE_PATH, 'ue.qss')
 ICONS_RCC = os.path.join(MODULE_PATH, 'icons.rcc')
 
+# Checked in this order, the first one with a running QApplication wins
+QT_BINDINGS = ('PySide6', 'PyQt6', 'PySide2', 'PyQt5', 'PySide', 'PyQt4')
+
+_bindings = None
+_resources_registered = False
+
 
 def import_qt_bindings():
     """
     Import the active Qt Bindings based on the active QApplication.
     This prevents importing the wrong Qt bindings, 
-    if the user has multiple Qt bindings installed
+    if the user has multiple Qt bindings installed.
+    The result is remembered once a QApplication has been found.
     """
-    active_qapp = None
-    QtWidgets = None
-    QtCore = None
-    if not active_qapp:
-        with suppress(ImportError):
-            from PySide6 import QtWidgets, QtCore
-            active_qapp = QtWidgets.QApplication.instance()
-    if not active_qapp:
-        with suppress(ImportError):
-            from PyQt6 import QtWidgets, QtCore
-            active_qapp = QtWidgets.QApplication.instance()
-    if not active_qapp:
-        with suppress(ImportError):
-            from PySide2 import QtWidgets, QtCore
-            active_qapp = QtWidgets.QApplication.instance()
-            print (active_qapp)
-    if not active_qapp:
-        with suppress(ImportError):
-            from PyQt5 import QtWidgets, QtCore
-            active_qapp = QtWidgets.QApplication.instance()
-    if not active_qapp:
-        with suppress(ImportError):
-            from PySide import QtWidgets, QtCore
-            active_qapp = QtWidgets.QApplication.instance()
-    if not active_qapp:
-        with suppress(ImportError):
-            from PyQt4 import QtWidgets, QtCore
-            active_qapp = QtWidgets.QApplication.instance()
-        
+    global _bindings
+    QtWidgets, QtCore = _bindings or _find_bindings()
+    if QtWidgets is not None and QtWidgets.QApplication.instance():
+        _bindings = QtWidgets, QtCore
+
     # add them to global
     globals()['QtWidgets'] = QtWidgets
     globals()['QtCore'] = QtCore
+    return QtWidgets, QtCore
+
+
+def _find_bindings():
+    # The running application's binding is already imported, check those before importing anything
+    imported = [name for name in QT_BINDINGS if name in sys.modules]
+    first = None
+    for name in imported + [name for name in QT_BINDINGS if name not in imported]:
+        bindings = _import_bindings(name)
+        if bindings is None:
+            continue
+        if bindings[0].QApplication.instance():
+            return bindings
+        first = first or bindings
+    # No application yet, nothing is remembered so the next call looks again
+    return first or (None, None)
+
+
+def _import_bindings(name):
+    with suppress(ImportError, AttributeError):
+        module = __import__(name, fromlist=['QtWidgets', 'QtCore'])
+        return module.QtWidgets, module.QtCore
+    return None
 
 
-def setup(app=None):
+def setup(app=None, pruned=True):
     """
-    Apply the Unreal dark stylesheet to the current QApplication
+    Apply the Unreal dark stylesheet to the current QApplication.
+    By default only the rules our widgets can match are applied, from the
+    compiled ue.min.qss, pass pruned=False for the full ue.qss.
     """
+    global _resources_registered
     import_qt_bindings()
 
     try:
@@ -61,8 +73,12 @@ def setup(app=None):
         pass   # enabled by default in PyQt6 & PySide6
 
     app = app or QtWidgets.QApplication.instance()
-    QtCore.QResource.registerResource(ICONS_RCC)
-    with open(QSS_PATH, 'r') as f:
-        qss = f.read()
-        app.setStyle("Fusion")  # dark title bar in Qt6
-        app.setStyleSheet(qss)
+    if not _resources_registered:
+        _resources_registered = QtCore.QResource.registerResource(ICONS_RCC)
+    if pruned:
+        qss = compiler.load_compiled()
+    else:
+        with open(QSS_PATH, 'r') as f:
+            qss = f.read()
+    app.setStyle("Fusion")  # dark title bar in Qt6
+    app.setStyleSheet(qss)
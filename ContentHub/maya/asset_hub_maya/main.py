@@ -1,41 +1,77 @@
-from PySide2 import QtWidgets
-import maya.cmds as cmds
-import shiboken2
+from PySide2 import QtCore, QtGui, QtWidgets
 import os
+import shiboken2
 
 from utils import dock_window
-from asset_hub_maya.widgets.tree_browser.view import tree_view
-from asset_hub_maya.widgets.content_browser.view import asset_display_view
-from asset_hub_maya.widgets.asset_detail import asset_details
+from asset_hub_maya.widgets.tree_browser import tree_view
+from shared.systems import tracing
+
+
+ASSET_ROOT = os.environ.get(
+    'CONTENTHUB_ROOT', r"D:\Xicheng\Projects\HarshBlue\Maya-Unreal-Tool-Dev-Course\Projects\Ellie"
+).replace("\\", "/")
+
+# Set CONTENTHUB_DEV to pick up code changes by reloading the tool's modules whenever main is reloaded
+DEV_MODE = bool(os.environ.get('CONTENTHUB_DEV'))
+
+
+def in_maya_gui() -> bool:
+    """
+    True inside an interactive Maya session, False under mayapy or a plain Python
+    """
+    try:
+        import maya.OpenMayaUI as omui
+    except ImportError:
+        return False
+    return omui.MQtUtil.mainWindow() is not None
+
+
+def reload_modules():
+    """
+    Reloads the already imported tool modules, systems before the widgets that use them
+    """
+    import sys
+    from importlib import reload
 
+    prefixes = ('shared.systems.', 'asset_hub_maya.systems.', 'utils.', 'shared.widgets.', 'asset_hub_maya.widgets.')
+    for prefix in prefixes:
+        for name in sorted(name for name in sys.modules if name.startswith(prefix)):
+            if sys.modules[name] is not None:
+                reload(sys.modules[name])
 
-IN_MAYA = False
-try:
-    import maya.cmds as cmds
-    import maya.OpenMayaUI as omui
-    import shiboken2
-    from PySide2 import QtCore, QtWidgets
-    IN_MAYA = True
-except Exception:
-    from PySide2 import QtCore, QtWidgets
-    IN_MAYA = False
 
-from importlib import reload
-reload(dock_window)
-reload(tree_view)
-reload(asset_display_view)
-reload(asset_details)
+if DEV_MODE:
+    reload_modules()
+
+
+# The session's hub, kept across launches and reloads so its listings and thumbnails survive closing the dock
+_hub = globals().get('_hub')
+# What the last hub showed, restored by a hub built again after the old one was deleted
+_view_state = globals().get('_view_state', {})
+
+
+def is_alive(widget) -> bool:
+    """
+    False once Qt has deleted the widget, Maya deletes a dock's children with it
+    """
+    return widget is not None and shiboken2.isValid(widget)
 
 
 class AssetHub(dock_window.DockWindow):
+    """
+    Only the tree is built up front. The grid, details panel and trace panel are
+    created the first time they are needed, and the tree is listed after the first paint.
+    One hub lives for the whole session, closing the dock only detaches it.
+    """
     CONTROL_NAME = "ContentHub"
     TITLE = "Content Hub"
+    KEEP_ALIVE = True
 
     def __init__(self, parent=None):
         super().__init__(parent)
 
     def setParentWindow(self):
-        if not IN_MAYA:
+        if not in_maya_gui():
             self.setWindowFlags(QtCore.Qt.Window)
             self.resize(400, 300)
             self.setWindowTitle(self.TITLE)
@@ -44,33 +80,160 @@ class AssetHub(dock_window.DockWindow):
         return super().setParentWindow()
 
     def createWidgets(self):
-        asset_root = r"D:\Xicheng\Projects\HarshBlue\Maya-Unreal-Tool-Dev-Course\Projects\Ellie"
-        asset_root = asset_root.replace("\\", "/")
-        self.asset_explorer = tree_view.AssetExplorerWidget(root_path=asset_root)
-        self.asset_display_view = asset_display_view.AssetDisplayView()
-        self.asset_details_view = asset_details.AssetDetailsDialog(parent=self)
-        self.asset_details_view.setVisible(False)
+        self.asset_root = ASSET_ROOT
+        self.asset_explorer = tree_view.AssetExplorerWidget(root_path="")
+        self.asset_explorer.root_path = self.asset_root
+        self.asset_explorer.tree_view.root_path = self.asset_root
+        self.search_box = QtWidgets.QLineEdit()
+        self.search_box.setPlaceholderText("Search name, folder, author or tag")
+        self.search_box.setClearButtonEnabled(True)
+        self.folder_only_box = QtWidgets.QCheckBox("This folder only")
+        self.folder_only_box.setToolTip("Only search the folder selected in the tree")
+        self.browser = QtWidgets.QWidget()
         self.splitter = QtWidgets.QSplitter(QtCore.Qt.Horizontal)
+        self.trace_shortcut = QtWidgets.QShortcut(QtGui.QKeySequence("Ctrl+Shift+T"), self)
+        self._asset_display_view = None
+        self._asset_details_view = None
+        self._trace_panel = None
+        self._prefetcher = None
 
     def layoutWidgets(self):
-        layout = QtWidgets.QVBoxLayout()
-        layout.setContentsMargins(0, 0, 0, 0)
-        layout.addWidget(self.splitter)
+        self.main_layout = QtWidgets.QVBoxLayout()
+        self.main_layout.setContentsMargins(0, 0, 0, 0)
+        self.main_layout.addWidget(self.splitter)
         self.splitter.addWidget(self.asset_explorer)
-        self.splitter.addWidget(self.asset_display_view)
-        self.splitter.addWidget(self.asset_details_view)
-        self.splitter.setSizes([300, 700, 0])
-        self.setLayout(layout)
-    
+        self.browser_layout = QtWidgets.QVBoxLayout(self.browser)
+        self.browser_layout.setContentsMargins(0, 0, 0, 0)
+        self.search_layout = QtWidgets.QHBoxLayout()
+        self.search_layout.addWidget(self.search_box)
+        self.search_layout.addWidget(self.folder_only_box)
+        self.browser_layout.addLayout(self.search_layout)
+        self.browser_layout.addStretch()
+        self.splitter.addWidget(self.browser)
+        self.splitter.setSizes([300, 700])
+        self.setLayout(self.main_layout)
+
     def connectWidgets(self):
         self.asset_explorer.tree_view.item_selected.connect(self.on_tree_item_selected)
-        self.asset_display_view.itemSelectionChanged.connect(
-            lambda: self.on_asset_display_selected(self.asset_display_view.selected_asset_path())
-        )
+        self.search_box.textChanged.connect(self.on_search_text_changed)
+        self.folder_only_box.toggled.connect(self.on_folder_only_toggled)
+        self.trace_shortcut.activated.connect(self.toggle_trace_panel)
+        # List the tree once the dock has painted rather than before it appears
+        QtCore.QTimer.singleShot(0, self.load_tree)
+        if tracing.is_enabled():
+            self.trace_panel.setVisible(True)
+
+    def load_tree(self):
+        self.asset_explorer.tree_view.rebuild_tree(self.asset_root)
+        if _view_state.get('root') == self.asset_root:
+            self.restore_view_state(_view_state)
+
+    def reattach(self):
+        """
+        Shows the hub again as it was left. Nothing is listed or loaded again.
+        """
+        if in_maya_gui():
+            self.setParentWindow()
+        else:
+            self.show()
+            self.raise_()
+        # Scroll ranges are only known again once the views are laid out
+        QtCore.QTimer.singleShot(0, lambda: self.restore_scroll(_view_state))
+
+    def save_view_state(self) -> dict:
+        tree = self.asset_explorer.tree_view
+        _view_state.clear()
+        _view_state.update({
+            'root': self.asset_root,
+            'expanded': tree.expanded_paths(),
+            'selected': tree.selected_path(),
+            'tree_scroll': tree.verticalScrollBar().value(),
+            'grid_scroll': self._asset_display_view.verticalScrollBar().value() if self._asset_display_view else 0,
+        })
+        return _view_state
+
+    def restore_view_state(self, state: dict):
+        # Restoring the selection shows its folder in the grid again
+        self.asset_explorer.tree_view.restore_state(state.get('expanded', []), state.get('selected'))
+        QtCore.QTimer.singleShot(0, lambda: self.restore_scroll(state))
+
+    def restore_scroll(self, state: dict):
+        if not is_alive(self):
+            return
+        self.asset_explorer.tree_view.verticalScrollBar().setValue(state.get('tree_scroll', 0))
+        if self._asset_display_view is not None:
+            self._asset_display_view.verticalScrollBar().setValue(state.get('grid_scroll', 0))
+
+    def hideEvent(self, event: QtGui.QHideEvent):
+        # Closing the dock or window, or Maya deleting the control, all hide the hub first
+        if self.asset_explorer.tree_view.topLevelItemCount():
+            self.save_view_state()
+        super().hideEvent(event)
+
+    @property
+    def asset_display_view(self):
+        if self._asset_display_view is None:
+            from asset_hub_maya.widgets.content_browser import asset_display_view
+
+            view = asset_display_view.AssetDisplayView()
+            view.set_watcher(self.asset_explorer.tree_view.watcher)
+            view.set_library(self.asset_root)
+            view.set_folder_only(self.folder_only_box.isChecked())
+            view.set_search_text(self.search_box.text())
+            view.itemSelectionChanged.connect(lambda: self.on_asset_display_selected(view.selected_asset_path()))
+            # Replaces the stretch that held its place
+            self.browser_layout.takeAt(1)
+            self.browser_layout.addWidget(view)
+            self._asset_display_view = view
+        return self._asset_display_view
+
+    @property
+    def asset_details_view(self):
+        if self._asset_details_view is None:
+            from asset_hub_maya.widgets.asset_detail import asset_details
+
+            self._asset_details_view = asset_details.AssetDetailsDialog(parent=self)
+            self._asset_details_view.setVisible(False)
+            self.splitter.addWidget(self._asset_details_view)
+        return self._asset_details_view
+
+    @property
+    def prefetcher(self):
+        if self._prefetcher is None:
+            from asset_hub_maya.systems import folder_prefetcher
+
+            self._prefetcher = folder_prefetcher.FolderPrefetcher(self.asset_root, parent=self)
+            # Changed folders are no longer warm
+            self.asset_explorer.tree_view.watcher.directory_changed.connect(self._prefetcher.invalidate)
+        return self._prefetcher
+
+    @property
+    def trace_panel(self):
+        if self._trace_panel is None:
+            from shared.widgets import trace_panel
+
+            self._trace_panel = trace_panel.TracePanel()
+            self._trace_panel.setVisible(False)
+            self.main_layout.addWidget(self._trace_panel)
+        return self._trace_panel
+
+    def toggle_trace_panel(self):
+        self.trace_panel.setVisible(not self.trace_panel.isVisible())
 
     def on_tree_item_selected(self, path: str):
+        # Counted before the scan starts, which would make any folder warm
+        self.prefetcher.folder_selected(path)
         self.asset_display_view.populate_assets(path)
 
+    def on_search_text_changed(self, text: str):
+        # Search covers the whole library, so it may be what builds the grid
+        if self._asset_display_view is not None or text.strip():
+            self.asset_display_view.set_search_text(text)
+
+    def on_folder_only_toggled(self, folder_only: bool):
+        if self._asset_display_view is not None:
+            self._asset_display_view.set_folder_only(folder_only)
+
     def on_asset_display_selected(self, asset_path: str):
         if not asset_path:
             return
@@ -85,8 +248,21 @@ class AssetHub(dock_window.DockWindow):
 
 
 def launch():
-    content_hub = AssetHub()
-    content_hub.show()
+    """
+    Shows the session's hub. It is only built on the first launch, later ones
+    reattach it with everything it had loaded. In dev mode it is always rebuilt
+    so code changes show up, with the view state carried over.
+    """
+    global _hub
+    if is_alive(_hub):
+        if not DEV_MODE:
+            _hub.reattach()
+            return _hub
+        _hub.close()
+        _hub.deleteLater()
+    _hub = AssetHub()
+    _hub.show()
+    return _hub
 
 
 if __name__ == "__main__":
@@ -3,39 +3,93 @@ from __future__ import annotations
 from typing import Any
 
 import os
-import json
+import shutil
+import getpass
+import tempfile
 from datetime import date
 
+from shared.systems import blob_store, metadata_store, project_manifest, tracing, version_journal
 
-def export_selected_assets(asset_folder: str, version: int = 1):
+
+def export_selected_assets(asset_folder: str, version: int | None = None, author: str | None = None) -> dict[str, Any]:
     """
     Exports the currently selected assets in Maya to FBX files.
     """
-    metadata = os.path.join(asset_folder, 'metadata.json')
-    export_folder = os.path.join(asset_folder, f'v_{version:03d}')
+    import maya.cmds as cmds
+    selection = cmds.ls(selection=True)
+    if not selection:
+        raise RuntimeError("Nothing is selected to export.")
 
-    generate_metadata(a)
+    return export_asset_version(asset_folder, selection, version=version, author=author)
 
-    # mkdir and write metadata
+
+def export_asset_version(asset_folder: str, nodes: list[str], version: int | None = None, author: str | None = None,
+                         asset_name: str | None = None, thumbnail: bool = True,
+                         tags: list[str] | None = None) -> dict[str, Any]:
+    """
+    Exports nodes into a new v_### folder of the asset and records it in metadata.json
+    """
+    import maya.cmds as cmds
+    tracing.begin_operation('export')
+    asset_folder = asset_folder.replace("\\", "/")
+    asset_name = asset_name or os.path.basename(os.path.normpath(asset_folder))
+    author = author or getpass.getuser()
+    if version is None:
+        with tracing.span('export.allocate_version'):
+            version = next_version(asset_folder)
+    elif version_journal.read_version(asset_folder, version) is not None:
+        # Checked before anything is written, publishing would replace the version's files
+        raise ValueError(f"Version {version} already exists for asset '{asset_name}'.")
+
+    version_folder = f'v_{version:03d}'
+    export_folder = os.path.join(asset_folder, version_folder)
     os.makedirs(export_folder, exist_ok=True)
-    with open(metadata, 'w') as f:
-        f.write(f'{{"version": {version}}}')
+
+    # Export locally first so content already on the share is never uploaded again
+    staging = tempfile.mkdtemp(prefix='contenthub_')
+    try:
+        staged_fbx = os.path.join(staging, f'{asset_name}.fbx').replace("\\", "/")
+        with tracing.span('export.fbx'):
+            cmds.loadPlugin('fbxmaya', quiet=True)
+            cmds.select(nodes, replace=True)
+            cmds.file(staged_fbx, force=True, options="v=0;", type="FBX export",
+                      preserveReferences=True, exportSelected=True)
+        with tracing.span('export.publish_files'):
+            files = blob_store.publish_files({'fbx': staged_fbx}, asset_folder, version_folder,
+                                             blob_store.find_store(asset_folder))
+    finally:
+        shutil.rmtree(staging, ignore_errors=True)
+
+    thumbnail_file = ''
+    if thumbnail:
+        thumbnail_file = f'{version_folder}/thumbnail.png'
+        with tracing.span('export.thumbnail'):
+            make_thumbnail_playblast(os.path.join(asset_folder, thumbnail_file))
+
+    with tracing.span('export.write_metadata'):
+        metadata = generate_metadata(asset_name, f'v{version:03d}', files, author, asset_folder,
+                                     thumbnail=thumbnail_file, tags=tags)
+        write_metadata(metadata, os.path.join(asset_folder, 'metadata.json'))
+    return metadata
 
 
-def generate_metadata(asset_name: str, version: int, files: dict[str, str], author: str, asset_path: str) -> dict[str, Any]:
+def next_version(asset_folder: str) -> int:
     """
-    Creates or updates asset metadata
+    Reserves and returns the number of the next version to publish for the asset
     """
-    metadata_path = os.path.join(asset_path, 'metadata.json').replace("\\", "/")
-    if os.path.exists(metadata_path):
-        with open(metadata_path, 'r') as f:
-            metadata = json.load(f)
-    else:
-        metadata = {'name': asset_name, 'versions': []}
+    return version_journal.allocate_version(asset_folder)
 
-    for v in metadata['versions']:
-        if v['version'] == version:
-            raise ValueError(f"Version {version} already exists for asset '{asset_name}'.")
+
+def generate_metadata(asset_name: str, version: int | str, files: dict[str, Any], author: str, asset_path: str,
+                      thumbnail: str = '', tags: list[str] | None = None) -> dict[str, Any]:
+    """
+    Creates the metadata head for a new version.
+    Only the small head is read, never the version history.
+    """
+    if version_journal.read_version(asset_path, version) is not None:
+        raise ValueError(f"Version {version} already exists for asset '{asset_name}'.")
+
+    head = version_journal.read_head(asset_path) or {}
 
     entry = {
         'version': version,
@@ -43,22 +97,30 @@ def generate_metadata(asset_name: str, version: int, files: dict[str, str], auth
         'author': author,
         'date': date.today().isoformat()
     }
+    if thumbnail:
+        entry['thumbnail'] = thumbnail
+    if tags:
+        entry['tags'] = list(tags)
 
-    metadata['versions'].append(entry)
-    metadata['versions'].sort(key=lambda v: int(v['version'][1:]))
-    metadata['latest'] = version
-
-    return metadata
+    return {'name': head.get('name') or asset_name, 'latest': version, 'versions': [entry]}
 
 
-def write_metadata(metadata: dict[str, Any], output_path: str) -> None:
+def write_metadata(metadata: dict[str, Any], output_path: str) -> dict[str, Any]:
     """
-    Writes asset metadata to a JSON file
+    Publishes the newest version entry of the metadata.
+    The entry is appended to the asset's version journal and metadata.json is
+    swapped in atomically, under the asset's publish lock. The project manifest,
+    if the project has one, is updated after.
     """
-    os.makedirs(os.path.dirname(output_path), exist_ok=True)
-
-    with open(output_path, 'w', encoding='utf-8') as f:
-        json.dump(metadata, f, indent=4, ensure_ascii=False)
+    asset_path = os.path.dirname(output_path)
+    head = version_journal.append_version(asset_path, metadata['name'], metadata['versions'][-1])
+    metadata_store.get_store().invalidate(output_path)
+    project_manifest.update_asset(asset_path, head)
+    # Only folders that opted into a thumbnail atlas need Qt to refresh it
+    if os.path.exists(os.path.join(os.path.dirname(asset_path), '.thumbnails.atlas')):
+        from asset_hub_maya.systems import thumbnail_atlas
+        thumbnail_atlas.update_asset(asset_path)
+    return head
 
 
 def make_thumbnail_playblast(output_path, width=512, height=512):
@@ -0,0 +1,161 @@
+from __future__ import annotations
+
+from PySide2 import QtCore
+
+from shared.systems import asset_index, project_manifest, tracing
+
+
+class _ScanSignals(QtCore.QObject):
+    batch_ready = QtCore.Signal(int, object)
+    finished = QtCore.Signal(int)
+    rescanned = QtCore.Signal(int, str, object)
+
+
+class _ScanTask(QtCore.QRunnable):
+    """
+    Refreshes the index for one folder and streams its assets in batches
+    """
+
+    def __init__(self, scanner: AssetScanner, generation: int, root_path: str):
+        super().__init__()
+        self.scanner = scanner
+        self.generation = generation
+        self.root_path = root_path
+        self._batch: list[asset_index.AssetRecord] = []
+
+    def cancelled(self) -> bool:
+        return self.generation != self.scanner.generation
+
+    @tracing.traced('scan.run')
+    def run(self):
+        index = self.scanner.index
+        try:
+            # A project manifest lists every published asset without walking the share
+            manifest = project_manifest.get_reader(self.root_path)
+            if manifest is not None:
+                for record in manifest.records_under(self.root_path):
+                    if self.cancelled():
+                        return
+                    self._add(record)
+            elif index.is_stale(self.root_path):
+                index.refresh(self.root_path, on_asset=self._add, should_cancel=self.cancelled)
+            else:
+                for record in index.assets_under(self.root_path, refresh=False):
+                    if self.cancelled():
+                        return
+                    self._add(record)
+        except asset_index.ScanCancelled:
+            return
+        except Exception as e:
+            print(f"Failed to scan {self.root_path}: {e}")
+
+        if not self.cancelled():
+            self._flush()
+            self.scanner._signals.finished.emit(self.generation)
+
+    def _add(self, record: asset_index.AssetRecord):
+        self._batch.append(record)
+        if len(self._batch) >= self.scanner.batch_size:
+            self._flush()
+
+    def _flush(self):
+        if self._batch:
+            self.scanner._signals.batch_ready.emit(self.generation, self._batch)
+            self._batch = []
+
+
+class _RescanTask(QtCore.QRunnable):
+    """
+    Re-checks one changed folder and reports every asset below it at once
+    """
+
+    def __init__(self, scanner: AssetScanner, generation: int, path: str):
+        super().__init__()
+        self.scanner = scanner
+        self.generation = generation
+        self.path = path
+
+    def cancelled(self) -> bool:
+        return self.generation != self.scanner.generation
+
+    def run(self):
+        index = self.scanner.index
+        try:
+            index.invalidate(self.path)
+            index.refresh(self.path, should_cancel=self.cancelled)
+            records = index.assets_under(self.path, refresh=False)
+        except asset_index.ScanCancelled:
+            return
+        except Exception as e:
+            print(f"Failed to rescan {self.path}: {e}")
+            return
+        self.scanner._signals.rescanned.emit(self.generation, self.path, records)
+
+
+class AssetScanner(QtCore.QObject):
+    """
+    Runs folder scans on a worker thread.
+    Requests are coalesced, and a new scan cancels the one in flight.
+    """
+
+    started = QtCore.Signal(str)
+    batch_ready = QtCore.Signal(object)
+    finished = QtCore.Signal(str)
+    rescanned = QtCore.Signal(str, object)
+
+    def __init__(self, index: asset_index.AssetIndex | None = None,
+                 batch_size: int = 128, delay_ms: int = 50, parent=None):
+        super().__init__(parent)
+        self.index = index or asset_index.get_index()
+        self.batch_size = batch_size
+        self.generation = 0
+        self.root_path = ""
+        self._pool = QtCore.QThreadPool(self)
+        self._pool.setMaxThreadCount(1)
+        self._signals = _ScanSignals()
+        self._signals.batch_ready.connect(self._on_batch_ready)
+        self._signals.finished.connect(self._on_finished)
+        self._signals.rescanned.connect(self._on_rescanned)
+        self._timer = QtCore.QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(delay_ms)
+        self._timer.timeout.connect(self._start)
+
+    def scan(self, root_path: str):
+        """
+        Schedules a scan, replacing any scan that is queued or running
+        """
+        self.cancel()
+        self.root_path = root_path
+        self._timer.start()
+
+    def rescan(self, path: str):
+        """
+        Re-checks a changed folder below the current root.
+        Queued behind the running scan, so it also catches changes that scan missed.
+        """
+        if self._timer.isActive():
+            # The full scan has not started yet and will pick the change up
+            return
+        self._pool.start(_RescanTask(self, self.generation, asset_index.normalize_path(path)))
+
+    def cancel(self):
+        self._timer.stop()
+        self.generation += 1
+        self._pool.clear()
+
+    def _start(self):
+        self.started.emit(self.root_path)
+        self._pool.start(_ScanTask(self, self.generation, self.root_path))
+
+    def _on_batch_ready(self, generation: int, records: list[asset_index.AssetRecord]):
+        if generation == self.generation:
+            self.batch_ready.emit(records)
+
+    def _on_finished(self, generation: int):
+        if generation == self.generation:
+            self.finished.emit(self.root_path)
+
+    def _on_rescanned(self, generation: int, path: str, records: list[asset_index.AssetRecord]):
+        if generation == self.generation:
+            self.rescanned.emit(path, records)
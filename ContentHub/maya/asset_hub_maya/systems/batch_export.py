@@ -0,0 +1,287 @@
+from __future__ import annotations
+
+from typing import Any, Callable, NamedTuple
+
+import os
+import sys
+import json
+import time
+import queue
+import threading
+import importlib
+import subprocess
+
+
+RESULT_PREFIX = '@@contenthub@@ '
+
+CONTENTHUB_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+
+class ExportJob(NamedTuple):
+    scene_path: str
+    asset_folder: str
+    asset_name: str = ''
+    author: str = ''
+    nodes: tuple[str, ...] = ()
+
+    def to_dict(self) -> dict[str, Any]:
+        return {**self._asdict(), 'nodes': list(self.nodes)}
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> ExportJob:
+        return cls(
+            scene_path=data['scene_path'],
+            asset_folder=data['asset_folder'],
+            asset_name=data.get('asset_name', ''),
+            author=data.get('author', ''),
+            nodes=tuple(data.get('nodes', ())),
+        )
+
+
+class ExportResult(NamedTuple):
+    job: ExportJob
+    ok: bool
+    version: str
+    files: dict[str, str | dict[str, Any]]
+    attempts: int
+    seconds: float
+    error: str
+
+    def to_dict(self) -> dict[str, Any]:
+        return {**self._asdict(), 'job': self.job.to_dict()}
+
+
+def default_worker_command() -> list[str]:
+    """
+    Returns the command that starts one headless mayapy worker
+    """
+    mayapy = os.environ.get('CONTENTHUB_MAYAPY')
+    if not mayapy:
+        name = 'mayapy.exe' if sys.platform == 'win32' else 'mayapy'
+        mayapy = os.path.join(os.path.dirname(sys.executable), name)
+    return [mayapy, os.path.abspath(__file__), '--worker']
+
+
+class ProcessWorker:
+    """
+    One long lived worker process that takes jobs as JSON lines on stdin
+    """
+
+    def __init__(self, command: list[str], timeout: float | None = None):
+        self.command = command
+        self.timeout = timeout
+        self._process: subprocess.Popen | None = None
+
+    def start(self):
+        env = dict(os.environ)
+        paths = [CONTENTHUB_ROOT, os.path.join(CONTENTHUB_ROOT, 'maya'), env.get('PYTHONPATH', '')]
+        env['PYTHONPATH'] = os.pathsep.join(p for p in paths if p)
+        self._process = subprocess.Popen(self.command, stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                                         env=env, text=True, bufsize=1)
+
+    def stop(self):
+        if self._process is None:
+            return
+        try:
+            self._process.stdin.close()
+            self._process.wait(timeout=10)
+        except Exception:
+            self._process.kill()
+        self._process = None
+
+    def run(self, job: ExportJob) -> dict[str, Any]:
+        """
+        Sends one job and waits for its result, restarting the process if it died
+        """
+        if self._process is None or self._process.poll() is not None:
+            self.start()
+
+        timer = None
+        if self.timeout:
+            timer = threading.Timer(self.timeout, self._process.kill)
+            timer.start()
+        try:
+            self._process.stdin.write(json.dumps(job.to_dict()) + '\n')
+            self._process.stdin.flush()
+            # Maya prints its own output, results are the prefixed lines
+            for line in self._process.stdout:
+                if line.startswith(RESULT_PREFIX):
+                    return json.loads(line[len(RESULT_PREFIX):])
+        except (OSError, ValueError) as e:
+            self._process.kill()
+            raise RuntimeError(f"Worker failed: {e}")
+        finally:
+            if timer:
+                timer.cancel()
+
+        self._process = None
+        raise RuntimeError("Worker exited before returning a result.")
+
+
+class BatchExporter:
+    """
+    Spreads export jobs across a pool of headless worker processes.
+    Jobs for the same asset folder run one after another so versions never collide.
+    """
+
+    def __init__(self, worker_command: list[str] | None = None, workers: int = 4, retries: int = 2,
+                 timeout: float | None = None,
+                 on_progress: Callable[[int, int, ExportResult], None] | None = None):
+        self.worker_command = worker_command or default_worker_command()
+        self.workers = workers
+        self.retries = retries
+        self.timeout = timeout
+        self.on_progress = on_progress
+
+    def run(self, jobs: list[ExportJob]) -> list[ExportResult]:
+        """
+        Runs every job and returns one result per job, in the order given.
+        on_progress is called from worker threads.
+        """
+        groups: dict[str, list[int]] = {}
+        for i, job in enumerate(jobs):
+            groups.setdefault(os.path.normpath(job.asset_folder), []).append(i)
+
+        work = queue.Queue()
+        for indices in groups.values():
+            work.put(indices)
+
+        results: list[ExportResult | None] = [None] * len(jobs)
+        lock = threading.Lock()
+        done = [0]
+
+        def drain():
+            worker = ProcessWorker(self.worker_command, self.timeout)
+            try:
+                while True:
+                    try:
+                        indices = work.get_nowait()
+                    except queue.Empty:
+                        return
+                    for i in indices:
+                        result = self._run_job(worker, jobs[i])
+                        with lock:
+                            results[i] = result
+                            done[0] += 1
+                            count = done[0]
+                        if self.on_progress:
+                            self.on_progress(count, len(jobs), result)
+            finally:
+                worker.stop()
+
+        threads = [threading.Thread(target=drain, daemon=True) for _ in range(min(self.workers, len(groups)))]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return results
+
+    def _run_job(self, worker: ProcessWorker, job: ExportJob) -> ExportResult:
+        start = time.perf_counter()
+        error = ''
+        for attempt in range(1, self.retries + 2):
+            try:
+                reply = worker.run(job)
+            except Exception as e:
+                error = str(e)
+                continue
+            if reply.get('ok'):
+                return ExportResult(job, True, reply.get('version', ''), reply.get('files', {}),
+                                    attempt, time.perf_counter() - start, '')
+            error = reply.get('error', 'Unknown error')
+        return ExportResult(job, False, '', {}, self.retries + 1, time.perf_counter() - start, error)
+
+
+def write_report(results: list[ExportResult], report_path: str):
+    """
+    Writes a per asset result report as JSON
+    """
+    report = {
+        'succeeded': sum(1 for r in results if r.ok),
+        'failed': sum(1 for r in results if not r.ok),
+        'results': [r.to_dict() for r in results],
+    }
+    os.makedirs(os.path.dirname(os.path.abspath(report_path)), exist_ok=True)
+    with open(report_path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=4, ensure_ascii=False)
+
+
+def maya_export(job: ExportJob) -> dict[str, Any]:
+    """
+    Opens the job's scene in mayapy and publishes it as a new version
+    """
+    global _maya_initialized
+    if not _maya_initialized:
+        import maya.standalone
+        maya.standalone.initialize(name='python')
+        _maya_initialized = True
+
+    import maya.cmds as cmds
+    from asset_hub_maya.systems import asset_controller
+
+    cmds.file(job.scene_path, open=True, force=True)
+    nodes = list(job.nodes) or [n for n in cmds.ls(assemblies=True)
+                                if not cmds.camera(n, q=True, startupCamera=True)]
+    metadata = asset_controller.export_asset_version(job.asset_folder, nodes, author=job.author or None,
+                                                     asset_name=job.asset_name or None, thumbnail=False)
+    latest = metadata['versions'][-1]
+    return {'version': latest['version'], 'files': latest['files']}
+
+
+_maya_initialized = False
+
+
+def worker_main(exporter: Callable[[ExportJob], dict[str, Any]]):
+    """
+    Worker loop: reads one job per stdin line and prints one prefixed result line
+    """
+    for line in sys.stdin:
+        if not line.strip():
+            continue
+        try:
+            reply = {'ok': True, **exporter(ExportJob.from_dict(json.loads(line)))}
+        except Exception as e:
+            reply = {'ok': False, 'error': f"{type(e).__name__}: {e}"}
+        sys.stdout.write(RESULT_PREFIX + json.dumps(reply) + '\n')
+        sys.stdout.flush()
+
+
+def _load_exporter(spec: str) -> Callable[[ExportJob], dict[str, Any]]:
+    module_name, _, function_name = spec.partition(':')
+    return getattr(importlib.import_module(module_name), function_name)
+
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Batch export assets with headless mayapy workers")
+    parser.add_argument('jobs', nargs='?', help="JSON file with a list of export jobs")
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--retries', type=int, default=2)
+    parser.add_argument('--timeout', type=float, default=None, help="Seconds before a job's worker is killed")
+    parser.add_argument('--report', default='export_report.json')
+    parser.add_argument('--worker', action='store_true', help="Run as a worker process")
+    parser.add_argument('--exporter', default=None,
+                        help="module:function used by workers instead of mayapy, e.g. for tests")
+    args = parser.parse_args()
+
+    if args.worker:
+        worker_main(_load_exporter(args.exporter) if args.exporter else maya_export)
+        sys.exit(0)
+
+    with open(args.jobs, 'r', encoding='utf-8') as f:
+        export_jobs = [ExportJob.from_dict(j) for j in json.load(f)]
+
+    command = None
+    if args.exporter:
+        command = [sys.executable, os.path.abspath(__file__), '--worker', '--exporter', args.exporter]
+
+    def print_progress(count: int, total: int, result: ExportResult):
+        status = result.version if result.ok else f"FAILED ({result.error})"
+        print(f"[{count}/{total}] {result.job.asset_folder}: {status}")
+
+    exporter = BatchExporter(command, workers=args.workers, retries=args.retries, timeout=args.timeout,
+                             on_progress=print_progress)
+    export_results = exporter.run(export_jobs)
+    write_report(export_results, args.report)
+    sys.exit(0 if all(r.ok for r in export_results) else 1)
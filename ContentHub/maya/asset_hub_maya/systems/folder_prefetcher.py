@@ -0,0 +1,239 @@
+from __future__ import annotations
+
+import os
+
+from PySide2 import QtCore
+
+from asset_hub_maya.systems import thumbnail_loader, thumbnail_store
+from shared.systems import asset_index, dir_walker, project_manifest, tracing
+
+
+# Input that means the user is busy with the UI, prefetching waits until it stops
+_INTERACTION_EVENTS = {QtCore.QEvent.MouseButtonPress, QtCore.QEvent.MouseButtonDblClick, QtCore.QEvent.KeyPress,
+                       QtCore.QEvent.Wheel}
+
+
+class _PrefetchSignals(QtCore.QObject):
+    planned = QtCore.Signal(int, object)
+    warmed = QtCore.Signal(int, str, object)
+    failed = QtCore.Signal(int, str)
+
+
+class _PlanTask(QtCore.QRunnable):
+    """
+    Lists the folders likely to be opened after the selected one: its children, then its nearest siblings
+    """
+
+    def __init__(self, prefetcher: FolderPrefetcher, selection: int, path: str):
+        super().__init__()
+        self.prefetcher = prefetcher
+        self.selection = selection
+        self.path = path
+
+    def run(self):
+        prefetcher = self.prefetcher
+        children = [entry.path for entry in sorted(dir_walker.list_dir(self.path).dirs, key=lambda e: e.name)]
+        siblings = []
+        parent = os.path.dirname(self.path)
+        if parent != self.path and self.path != prefetcher.root_path:
+            names = sorted(entry.name for entry in dir_walker.list_dir(parent).dirs)
+            position = names.index(os.path.basename(self.path)) if os.path.basename(self.path) in names else 0
+            # Closest first, alternating after and before the selection
+            for distance in range(1, prefetcher.siblings + 1):
+                for i in (position + distance, position - distance):
+                    if 0 <= i < len(names):
+                        siblings.append(f"{parent}/{names[i]}")
+        folders = children[:prefetcher.children] + siblings
+        prefetcher._signals.planned.emit(self.selection, [asset_index.normalize_path(f) for f in folders])
+
+
+class _WarmTask(QtCore.QRunnable):
+    """
+    Brings the index up to date for one folder and reads its records, so the
+    metadata is parsed and cached before the folder is opened
+    """
+
+    def __init__(self, prefetcher: FolderPrefetcher, generation: int, path: str):
+        super().__init__()
+        self.prefetcher = prefetcher
+        self.generation = generation
+        self.path = path
+
+    def cancelled(self) -> bool:
+        return self.generation != self.prefetcher.generation
+
+    def run(self):
+        QtCore.QThread.currentThread().setPriority(QtCore.QThread.LowestPriority)
+        index = self.prefetcher.index
+        try:
+            with tracing.span('prefetch.folder', path=self.path):
+                manifest = project_manifest.get_reader(self.path)
+                if manifest is not None:
+                    records = manifest.records_under(self.path)
+                else:
+                    index.refresh(self.path, should_cancel=self.cancelled)
+                    records = index.assets_under(self.path, refresh=False)
+        except asset_index.ScanCancelled:
+            return
+        except Exception as e:
+            print(f"Failed to prefetch {self.path}: {e}")
+            self.prefetcher._signals.failed.emit(self.generation, self.path)
+            return
+        if not self.cancelled():
+            self.prefetcher._signals.warmed.emit(self.generation, self.path, records)
+
+
+class FolderPrefetcher(QtCore.QObject):
+    """
+    Warms the folders the user is likely to open next while the UI is idle.
+    After every selection the selected folder's children and nearest siblings
+    have their index entries refreshed and their first grid thumbnails loaded,
+    one folder at a time and only while nothing else is loading.
+    Any mouse or key input pauses it, and stats() tells how often a selected
+    folder was already warm.
+    """
+
+    def __init__(self, root_path: str = "", index: asset_index.AssetIndex | None = None,
+                 loader: thumbnail_loader.ThumbnailLoader | None = None, icon_size: int = thumbnail_store.GRID_SIZE,
+                 children: int = 4, siblings: int = 2, max_folders: int = 6, thumbnails_per_folder: int = 128,
+                 idle_ms: int = 300, parent=None):
+        super().__init__(parent)
+        self.root_path = asset_index.normalize_path(root_path) if root_path else ""
+        self.index = index or asset_index.get_index()
+        self.loader = loader or thumbnail_loader.get_loader()
+        self.icon_size = icon_size
+        self.children = children
+        self.siblings = siblings
+        # Budget of one selection: folders warmed, and thumbnails loaded per folder
+        self.max_folders = max_folders
+        self.thumbnails_per_folder = thumbnails_per_folder
+        self.enabled = os.environ.get('CONTENTHUB_PREFETCH', '1') != '0'
+        # Plans of earlier selections are dropped, and a pause cancels the folder being warmed
+        self.selection = 0
+        self.generation = 0
+        self.counters = {'selections': 0, 'hits': 0, 'prefetch_hits': 0, 'warmed': 0, 'thumbnails': 0,
+                         'cancelled': 0, 'failed': 0}
+        # Folders whose data is warm, True for the ones the prefetcher warmed
+        self._warm: dict[str, bool] = {}
+        # Folders that failed to warm, not tried again until they change
+        self._failed: set[str] = set()
+        self._queue: list[str] = []
+        self._thumbnails: list[str] = []
+        self._running: str | None = None
+        self._pool = QtCore.QThreadPool(self)
+        self._pool.setMaxThreadCount(1)
+        self._signals = _PrefetchSignals()
+        self._signals.planned.connect(self._on_planned)
+        self._signals.warmed.connect(self._on_warmed)
+        self._signals.failed.connect(self._on_failed)
+        self._idle_timer = QtCore.QTimer(self)
+        self._idle_timer.setSingleShot(True)
+        self._idle_timer.setInterval(idle_ms)
+        self._idle_timer.timeout.connect(self._step)
+        app = QtCore.QCoreApplication.instance()
+        if app is not None:
+            app.installEventFilter(self)
+
+    def folder_selected(self, path: str) -> bool:
+        """
+        Counts whether the folder was already warm and plans the prefetch around it.
+        Returns whether it was a hit.
+        """
+        path = asset_index.normalize_path(path)
+        self.pause()
+        self.selection += 1
+        self._queue.clear()
+        self._thumbnails.clear()
+        warm = self._warm.get(path)
+        self.counters['selections'] += 1
+        self.counters['hits'] += warm is not None
+        self.counters['prefetch_hits'] += bool(warm)
+        # Shown now, so warm from here on
+        self._warm[path] = False
+        if self.enabled and path:
+            self._pool.start(_PlanTask(self, self.selection, path))
+        return warm is not None
+
+    def invalidate(self, path: str | None = None):
+        """
+        Forgets warm folders at or below the path, all of them without one
+        """
+        if path is None:
+            self._warm.clear()
+            self._failed.clear()
+            return
+        path = asset_index.normalize_path(path)
+        prefix = path.rstrip('/') + '/'
+        for folder in [f for f in self._warm if f == path or f.startswith(prefix)]:
+            del self._warm[folder]
+        self._failed = {f for f in self._failed if f != path and not f.startswith(prefix)}
+
+    def pause(self):
+        """
+        Stops the folder being warmed and waits for the UI to be idle again, it is warmed again then
+        """
+        if self._running:
+            self.counters['cancelled'] += 1
+            self._queue.insert(0, self._running)
+            self._running = None
+        self.generation += 1
+        self._idle_timer.start()
+
+    def stats(self) -> dict[str, float]:
+        selections = self.counters['selections']
+        return dict(self.counters, hit_rate=self.counters['hits'] / selections if selections else 0.0,
+                    prefetch_hit_rate=self.counters['prefetch_hits'] / selections if selections else 0.0)
+
+    def eventFilter(self, watched: QtCore.QObject, event: QtCore.QEvent) -> bool:
+        if event.type() in _INTERACTION_EVENTS:
+            self.pause()
+        return False
+
+    def _on_planned(self, selection: int, folders: list[str]):
+        if selection != self.selection:
+            return
+        self._queue = [folder for folder in folders
+                       if folder not in self._warm and folder not in self._failed][:self.max_folders]
+        self._idle_timer.start()
+
+    def _step(self):
+        if self._running:
+            return
+        # Whatever the grid is loading goes first
+        if not self.loader.is_idle():
+            self._idle_timer.start()
+            return
+        if self._thumbnails:
+            batch, self._thumbnails = self._thumbnails, []
+            for path in batch:
+                self.loader.request(path, self.icon_size)
+            self.counters['thumbnails'] += len(batch)
+            self._idle_timer.start()
+            return
+        if self._queue:
+            self._running = self._queue.pop(0)
+            self._pool.start(_WarmTask(self, self.generation, self._running))
+
+    def _on_warmed(self, generation: int, path: str, records: list[asset_index.AssetRecord]):
+        if generation != self.generation:
+            return
+        self._running = None
+        self._warm.setdefault(path, True)
+        self.counters['warmed'] += 1
+        # The atlases come first, the thumbnails they cover are then already cached
+        records = [record for record in records if record.thumbnail][:self.thumbnails_per_folder]
+        for folder in {os.path.dirname(record.path) for record in records}:
+            self.loader.load_atlas(folder, self.icon_size)
+        self._thumbnails = [record.thumbnail for record in records]
+        self._idle_timer.start()
+
+    def _on_failed(self, generation: int, path: str):
+        self.counters['failed'] += 1
+        self._failed.add(path)
+        # A pause since it started put it back in the queue
+        if path in self._queue:
+            self._queue.remove(path)
+        if generation != self.generation:
+            return
+        self._running = None
+        self._idle_timer.start()
@@ -0,0 +1,247 @@
+from __future__ import annotations
+
+from typing import Any, Iterator
+
+import os
+import mmap
+import json
+import time
+import struct
+from contextlib import suppress
+
+from PySide2 import QtCore, QtGui
+
+from shared.systems import asset_index, metadata_store, version_journal
+from asset_hub_maya.systems import thumbnail_store
+
+
+ATLAS_FILE = '.thumbnails.atlas'
+MAGIC = b'CHTA'
+FORMAT_VERSION = 1
+PIXEL_FORMAT = QtGui.QImage.Format_ARGB32_Premultiplied
+
+# File layout:
+#   header   magic, format version, slot size, entry count, table length
+#   table    utf-8 JSON {asset name: [thumbnail path, thumbnail mtime, slot, width, height]}
+#   slots    fixed size blocks of raw pixels, size * size * 4 bytes each, 16 byte aligned
+# Raw pixels let readers wrap a slice of the mapped file in a QImage without decoding.
+# Published thumbnails live in immutable version folders, so an entry stays valid
+# until its asset publishes again, which points it at a new thumbnail path.
+_HEADER = struct.Struct('<4sHHII')
+
+
+class ThumbnailAtlas:
+    """
+    Read-only view of a folder's atlas, memory-mapped.
+    Images returned by image() point into the mapping and are only valid until close().
+    """
+
+    def __init__(self, folder: str):
+        self.folder = folder.replace("\\", "/")
+        self.size = 0
+        self.entries: dict[str, list[Any]] = {}
+        self._file = None
+        self._map = None
+        self._views: list[memoryview] = []
+        self._data_offset = 0
+
+    @classmethod
+    def open(cls, folder: str) -> ThumbnailAtlas | None:
+        """
+        Maps the atlas of a folder, returns None if it has none or it is unreadable
+        """
+        atlas = cls(folder)
+        try:
+            atlas._file = open(atlas_path(folder), 'rb')
+            atlas._map = mmap.mmap(atlas._file.fileno(), 0, access=mmap.ACCESS_READ)
+            magic, version, size, count, table_length = _HEADER.unpack_from(atlas._map, 0)
+            if magic != MAGIC or version != FORMAT_VERSION:
+                raise ValueError(f"Unsupported atlas format in {folder}")
+            table_end = _HEADER.size + table_length
+            atlas.entries = json.loads(atlas._map[_HEADER.size:table_end].decode('utf-8'))
+            atlas.size = size
+            atlas._data_offset = _align(table_end)
+            if len(atlas._map) < atlas._data_offset + count * atlas.slot_bytes:
+                raise ValueError(f"Truncated atlas in {folder}")
+        except (OSError, ValueError, struct.error) as e:
+            if not isinstance(e, FileNotFoundError):
+                print(f"Ignoring thumbnail atlas of {folder}: {e}")
+            atlas.close()
+            return None
+        return atlas
+
+    def __enter__(self) -> ThumbnailAtlas:
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    @property
+    def slot_bytes(self) -> int:
+        return self.size * self.size * 4
+
+    def thumbnail_path(self, name: str) -> str:
+        return os.path.join(self.folder, name, self.entries[name][0]).replace("\\", "/")
+
+    def image(self, name: str) -> QtGui.QImage:
+        """
+        Wraps the pixels of one entry without copying them
+        """
+        _, _, slot, width, height = self.entries[name]
+        offset = self._data_offset + slot * self.slot_bytes
+        # QImage does not keep its buffer alive, the atlas does
+        view = memoryview(self._map)[offset:offset + width * height * 4]
+        self._views.append(view)
+        return QtGui.QImage(view, width, height, width * 4, PIXEL_FORMAT)
+
+    def images(self) -> Iterator[tuple[str, float, QtGui.QImage]]:
+        """
+        Yields (absolute thumbnail path, thumbnail mtime, image) for every entry
+        """
+        for name, entry in self.entries.items():
+            yield self.thumbnail_path(name), entry[1], self.image(name)
+
+    def slot(self, name: str) -> bytes:
+        _, _, slot, _, _ = self.entries[name]
+        offset = self._data_offset + slot * self.slot_bytes
+        return self._map[offset:offset + self.slot_bytes]
+
+    def close(self):
+        for view in self._views:
+            view.release()
+        self._views.clear()
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+def atlas_path(folder: str) -> str:
+    return os.path.join(folder, ATLAS_FILE).replace("\\", "/")
+
+
+def build_atlas(folder: str, size: int = thumbnail_store.GRID_SIZE) -> int:
+    """
+    Writes the atlas of every asset directly inside a folder.
+    Entries whose thumbnail did not change are copied over from the previous atlas,
+    only new or republished thumbnails are decoded. Returns how many were decoded.
+    """
+    folder = asset_index.normalize_path(folder)
+    previous = ThumbnailAtlas.open(folder)
+    if previous is not None and previous.size != size:
+        previous.close()
+        previous = None
+
+    entries = {}
+    slots = []
+    decoded = 0
+    try:
+        for name, thumbnail, mtime in _folder_thumbnails(folder):
+            old = previous.entries.get(name) if previous else None
+            if old and old[0] == thumbnail and old[1] == mtime:
+                pixels = previous.slot(name)
+                width, height = old[3], old[4]
+            else:
+                image = thumbnail_store.decode_scaled(os.path.join(folder, name, thumbnail), size)
+                if image.isNull():
+                    continue
+                image = image.convertToFormat(PIXEL_FORMAT)
+                width, height = image.width(), image.height()
+                pixels = _pixels(image).ljust(size * size * 4, b'\0')
+                decoded += 1
+            entries[name] = [thumbnail, mtime, len(slots), width, height]
+            slots.append(pixels)
+    finally:
+        if previous is not None:
+            previous.close()
+
+    table = json.dumps(entries, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    header = _HEADER.pack(MAGIC, FORMAT_VERSION, size, len(slots), len(table))
+    target = atlas_path(folder)
+    tmp_path = f"{target}.{os.getpid()}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(header)
+        f.write(table)
+        f.write(b'\0' * (_align(len(header) + len(table)) - len(header) - len(table)))
+        for pixels in slots:
+            f.write(pixels)
+    _replace(tmp_path, target)
+    return decoded
+
+
+def update_asset(asset_path: str) -> bool:
+    """
+    Refreshes the atlas of the folder holding an asset after it republished.
+    Folders without an atlas are left alone, the atlas is opt-in per folder.
+    """
+    folder = os.path.dirname(asset_index.normalize_path(asset_path))
+    if not os.path.exists(atlas_path(folder)):
+        return False
+    try:
+        # Two publishes in the folder would otherwise each write the atlas without the other's thumbnail
+        with version_journal.publish_lock(folder):
+            build_atlas(folder)
+    except OSError as e:
+        print(f"Failed to update thumbnail atlas of {folder}: {e}")
+        return False
+    return True
+
+
+def _folder_thumbnails(folder: str) -> Iterator[tuple[str, str, float]]:
+    """
+    Yields (asset name, thumbnail path relative to the asset, thumbnail mtime)
+    """
+    store = metadata_store.get_store()
+    with os.scandir(folder) as entries:
+        for entry in sorted(entries, key=lambda e: e.name):
+            if entry.name.startswith('.') or not entry.is_dir():
+                continue
+            metadata = store.get(os.path.join(entry.path, asset_index.METADATA_FILE))
+            latest = metadata.latest_version() if metadata else None
+            if latest is None or not latest.thumbnail:
+                continue
+            try:
+                mtime = os.stat(os.path.join(entry.path, latest.thumbnail)).st_mtime
+            except OSError:
+                continue
+            yield entry.name, latest.thumbnail, mtime
+
+
+def _pixels(image: QtGui.QImage) -> bytes:
+    data = bytes(image.constBits())
+    row_bytes = image.width() * 4
+    if image.bytesPerLine() == row_bytes:
+        return data[:row_bytes * image.height()]
+    return b''.join(data[y * image.bytesPerLine():y * image.bytesPerLine() + row_bytes]
+                    for y in range(image.height()))
+
+
+def _align(offset: int) -> int:
+    return (offset + 15) & ~15
+
+
+def _replace(tmp_path: str, target: str, attempts: int = 20):
+    # On Windows a reader holding the old atlas mapped blocks the rename for a moment
+    for attempt in range(attempts):
+        try:
+            os.replace(tmp_path, target)
+            return
+        except PermissionError:
+            if attempt == attempts - 1:
+                with suppress(OSError):
+                    os.remove(tmp_path)
+                raise
+            time.sleep(0.05)
+
+
+if __name__ == "__main__":
+    # Batch job: python thumbnail_atlas.py <project_root>
+    import sys
+
+    app = QtCore.QCoreApplication.instance() or QtCore.QCoreApplication(sys.argv)
+    root = sys.argv[1]
+    folders = sorted({os.path.dirname(record.path) for record in asset_index.get_index().assets_under(root)})
+    for atlas_folder in folders:
+        print(f"{atlas_folder}: decoded {build_atlas(atlas_folder)} thumbnails")
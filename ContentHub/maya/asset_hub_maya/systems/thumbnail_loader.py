@@ -0,0 +1,308 @@
+from __future__ import annotations
+
+import os
+import time
+from collections import OrderedDict
+
+from PySide2 import QtCore, QtGui
+
+from asset_hub_maya.systems import thumbnail_atlas, thumbnail_store
+from shared.systems import tracing
+
+
+# Cached thumbnails are re-stat'ed in the background once this old, catching files republished in place
+REVALIDATE_SECONDS = 10.0
+# A thumbnail that failed to load is tried again after this long
+RETRY_SECONDS = 10.0
+
+
+class ThumbnailCache:
+    """
+    LRU cache of decoded pixmaps keyed by (path, mtime, size), bounded by memory
+    """
+
+    def __init__(self, budget_bytes: int = 128 * 1024 * 1024):
+        self.budget_bytes = budget_bytes
+        self.used_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[tuple[str, float, int], QtGui.QPixmap] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: tuple[str, float, int]) -> QtGui.QPixmap | None:
+        pixmap = self._entries.get(key)
+        if pixmap is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._entries.move_to_end(key)
+        return pixmap
+
+    def put(self, key: tuple[str, float, int], pixmap: QtGui.QPixmap):
+        if key in self._entries:
+            self.used_bytes -= _pixmap_bytes(self._entries.pop(key))
+        self._entries[key] = pixmap
+        self.used_bytes += _pixmap_bytes(pixmap)
+        while self.used_bytes > self.budget_bytes and len(self._entries) > 1:
+            _, evicted = self._entries.popitem(last=False)
+            self.used_bytes -= _pixmap_bytes(evicted)
+
+    def clear(self):
+        self._entries.clear()
+        self.used_bytes = 0
+
+
+class _LoadSignals(QtCore.QObject):
+    finished = QtCore.Signal(str, float, int, object)
+    checked = QtCore.Signal(str, float)
+
+
+class _LoadTask(QtCore.QRunnable):
+    """
+    Stats and loads one thumbnail off the GUI thread, via the on-disk store
+    """
+
+    def __init__(self, path: str, size: int, store: thumbnail_store.ThumbnailStore, signals: _LoadSignals):
+        super().__init__()
+        self.path = path
+        self.size = size
+        self.store = store
+        self.signals = signals
+
+    def run(self):
+        try:
+            mtime = os.stat(self.path).st_mtime
+        except OSError:
+            self.signals.finished.emit(self.path, -1.0, self.size, QtGui.QImage())
+            return
+
+        image = self.store.load(self.path, self.size, mtime)
+        self.signals.finished.emit(self.path, mtime, self.size, image)
+
+
+class _StatTask(QtCore.QRunnable):
+    """
+    Re-checks the mtime of a cached thumbnail without loading it
+    """
+
+    def __init__(self, path: str, signals: _LoadSignals):
+        super().__init__()
+        self.path = path
+        self.signals = signals
+
+    def run(self):
+        try:
+            mtime = os.stat(self.path).st_mtime
+        except OSError:
+            mtime = -1.0
+        self.signals.checked.emit(self.path, mtime)
+
+
+class _AtlasSignals(QtCore.QObject):
+    finished = QtCore.Signal(str, int, object)
+
+
+class _AtlasTask(QtCore.QRunnable):
+    """
+    Maps a folder's atlas off the GUI thread, one read instead of one per thumbnail
+    """
+
+    def __init__(self, folder: str, size: int, signals: _AtlasSignals):
+        super().__init__()
+        self.folder = folder
+        self.size = size
+        self.signals = signals
+
+    def run(self):
+        atlas = thumbnail_atlas.ThumbnailAtlas.open(self.folder)
+        if atlas is not None and atlas.size != self.size:
+            atlas.close()
+            atlas = None
+        self.signals.finished.emit(self.folder, self.size, atlas)
+
+
+class ThumbnailLoader(QtCore.QObject):
+    """
+    Loads thumbnails on a thread pool and serves them from a shared cache
+    """
+
+    thumbnail_ready = QtCore.Signal(str, int)
+    # A cached thumbnail changed on disk, views showing it should request it again
+    thumbnail_changed = QtCore.Signal(str)
+    atlas_loaded = QtCore.Signal(str)
+
+    def __init__(self, store: thumbnail_store.ThumbnailStore, budget_bytes: int = 128 * 1024 * 1024,
+                 max_threads: int = 4, parent=None):
+        super().__init__(parent)
+        self.store = store
+        self.cache = ThumbnailCache(budget_bytes)
+        self._pool = QtCore.QThreadPool(self)
+        self._pool.setMaxThreadCount(max_threads)
+        self._signals = _LoadSignals()
+        self._signals.finished.connect(self._on_finished)
+        self._signals.checked.connect(self._on_checked)
+        # Known mtime per path, -1.0 after a failed load, and when that was last checked
+        self._mtimes: dict[str, float] = {}
+        self._checked: dict[str, float] = {}
+        self._checking: set[str] = set()
+        self._pending: set[tuple[str, int]] = set()
+        self._placeholders: dict[int, QtGui.QPixmap] = {}
+        self._atlas_signals = _AtlasSignals()
+        self._atlas_signals.finished.connect(self._on_atlas_finished)
+        # Folders whose atlas was looked up, True while the lookup is running
+        self._atlases: dict[tuple[str, int], bool] = {}
+
+    def request(self, path: str, size: int) -> QtGui.QPixmap | None:
+        """
+        Returns the cached pixmap, or None after queueing it for loading.
+        A cached pixmap checked too long ago is still returned, while its file is re-checked.
+        """
+        if not path:
+            return None
+
+        mtime = self._mtimes.get(path)
+        if mtime is not None:
+            age = time.monotonic() - self._checked.get(path, 0.0)
+            if mtime < 0:
+                if age < RETRY_SECONDS:
+                    return None
+            else:
+                pixmap = self.cache.get((path, mtime, size))
+                if pixmap is not None:
+                    if age >= REVALIDATE_SECONDS:
+                        self._revalidate(path)
+                    return pixmap
+
+        if (path, size) not in self._pending:
+            self._pending.add((path, size))
+            self._pool.start(_LoadTask(path, size, self.store, self._signals))
+        return None
+
+    def load_atlas(self, folder: str, size: int):
+        """
+        Looks for the thumbnail atlas of a folder once and fills the cache from it
+        """
+        if (folder, size) in self._atlases:
+            return
+        self._atlases[(folder, size)] = True
+        self._pool.start(_AtlasTask(folder, size, self._atlas_signals), 1)
+
+    def atlas_pending(self, folder: str, size: int) -> bool:
+        """
+        Returns whether thumbnails of a folder should wait for its atlas
+        """
+        return self._atlases.get((folder, size), False)
+
+    def is_idle(self) -> bool:
+        """
+        Returns whether no thumbnail or atlas load is queued or running
+        """
+        return not self._pending and not any(self._atlases.values())
+
+    def placeholder(self, size: int) -> QtGui.QPixmap:
+        """
+        Returns a flat pixmap to show until the real thumbnail is ready
+        """
+        pixmap = self._placeholders.get(size)
+        if pixmap is None:
+            pixmap = QtGui.QPixmap(size, size)
+            pixmap.fill(QtGui.QColor(60, 60, 60))
+            self._placeholders[size] = pixmap
+        return pixmap
+
+    def invalidate(self, path: str | None = None):
+        """
+        Forgets the known mtime so the next request re-checks the file
+        """
+        if path is None:
+            self._mtimes.clear()
+            self._checked.clear()
+            self._atlases = {key: pending for key, pending in self._atlases.items() if pending}
+        else:
+            self._mtimes.pop(path, None)
+            self._checked.pop(path, None)
+
+    def invalidate_under(self, folder: str):
+        """
+        Marks every thumbnail below the folder for a re-check on its next request.
+        Cached pixmaps keep being shown until the check finds them changed.
+        """
+        prefix = folder.rstrip('/') + '/'
+        for path in self._checked:
+            if path.startswith(prefix):
+                self._checked[path] = 0.0
+
+    def cancel_pending(self):
+        """
+        Drops queued loads that have not started yet
+        """
+        self._pool.clear()
+        self._pending.clear()
+        # A dropped re-check would otherwise keep its path from ever being checked again
+        self._checking.clear()
+        self._atlases = {key: pending for key, pending in self._atlases.items() if not pending}
+
+    def _revalidate(self, path: str):
+        if path in self._checking:
+            return
+        self._checking.add(path)
+        self._checked[path] = time.monotonic()
+        self._pool.start(_StatTask(path, self._signals), -1)
+
+    def _on_checked(self, path: str, mtime: float):
+        self._checking.discard(path)
+        known = self._mtimes.get(path)
+        if known is None or known == mtime:
+            return
+        # Loaded again on the next request, the old pixmap ages out of the cache
+        self._mtimes.pop(path, None)
+        self._checked.pop(path, None)
+        self.thumbnail_changed.emit(path)
+
+    def _on_finished(self, path: str, mtime: float, size: int, image: QtGui.QImage):
+        self._pending.discard((path, size))
+        self._mtimes[path] = mtime
+        self._checked[path] = time.monotonic()
+        if mtime < 0 or image.isNull():
+            self._mtimes[path] = -1.0
+            return
+        with tracing.span('thumbnail.to_pixmap'):
+            self.cache.put((path, mtime, size), QtGui.QPixmap.fromImage(image))
+        self.thumbnail_ready.emit(path, size)
+
+    def _on_atlas_finished(self, folder: str, size: int, atlas: thumbnail_atlas.ThumbnailAtlas | None):
+        if (folder, size) not in self._atlases:
+            # Dropped by cancel_pending
+            if atlas is not None:
+                atlas.close()
+            return
+        self._atlases[(folder, size)] = False
+        if atlas is not None:
+            with tracing.span('thumbnail.atlas', folder=folder), atlas:
+                for path, mtime, image in atlas.images():
+                    # The pixmap takes its own copy before the mapping goes away
+                    self._mtimes[path] = mtime
+                    self._checked[path] = time.monotonic()
+                    self.cache.put((path, mtime, size), QtGui.QPixmap.fromImage(image))
+                    self.thumbnail_ready.emit(path, size)
+        self.atlas_loaded.emit(folder)
+
+
+def _pixmap_bytes(pixmap: QtGui.QPixmap) -> int:
+    return pixmap.width() * pixmap.height() * max(pixmap.depth(), 8) // 8
+
+
+_loader: ThumbnailLoader | None = None
+
+
+def get_loader() -> ThumbnailLoader:
+    """
+    Returns the loader shared by every widget in this session
+    """
+    global _loader
+    if _loader is None:
+        budget_mb = int(os.environ.get('CONTENTHUB_THUMBNAIL_CACHE_MB', 128))
+        _loader = ThumbnailLoader(thumbnail_store.get_store(), budget_bytes=budget_mb * 1024 * 1024)
+    return _loader
@@ -0,0 +1,268 @@
+from __future__ import annotations
+
+from typing import Any, Iterable, Iterator, NamedTuple
+
+import os
+import sys
+import abc
+import shutil
+import zlib
+import tempfile
+import multiprocessing
+from concurrent.futures import Future, ProcessPoolExecutor
+
+from PySide2 import QtCore, QtGui
+
+from shared.systems import asset_index, metadata_store, project_manifest, version_journal
+from asset_hub_maya.systems import thumbnail_atlas, thumbnail_store
+
+
+ANGLES = {
+    'front': (0.0, 0.0),
+    'three_quarter': (45.0, -20.0),
+    'side': (90.0, 0.0),
+    'top': (0.0, -89.0),
+}
+DEFAULT_ANGLE = 'three_quarter'
+CAPTURE_SIZE = 512
+
+
+class CaptureRequest(NamedTuple):
+    asset_path: str
+    version: str
+    scene_path: str
+    angle: str = DEFAULT_ANGLE
+
+    @property
+    def thumbnail_file(self) -> str:
+        """
+        Relative path of the published thumbnail, extra angles get a suffix
+        """
+        name = 'thumbnail.png' if self.angle == DEFAULT_ANGLE else f'thumbnail_{self.angle}.png'
+        return f"{version_journal.version_folder(self.version)}/{name}"
+
+
+class ThumbnailResult(NamedTuple):
+    request: CaptureRequest
+    ok: bool
+    thumbnail: str
+    variants: dict[int, str]
+    error: str
+
+
+class CaptureBackend(abc.ABC):
+    """
+    Produces full size raw images for capture requests.
+    Backends run in the pipeline's process, everything after capture runs in the pool.
+    """
+
+    @abc.abstractmethod
+    def capture(self, requests: list[CaptureRequest], output_dir: str) -> Iterator[tuple[CaptureRequest, str]]:
+        ...
+
+
+class MayaPlayblastBackend(CaptureBackend):
+    """
+    Captures every request in the current Maya session, opening each scene once.
+    Needs a session with a viewport, playblast does not work in mayapy.
+    """
+
+    def __init__(self, size: int = CAPTURE_SIZE):
+        self.size = size
+
+    def capture(self, requests: list[CaptureRequest], output_dir: str) -> Iterator[tuple[CaptureRequest, str]]:
+        import maya.cmds as cmds
+
+        by_scene: dict[str, list[CaptureRequest]] = {}
+        for request in requests:
+            by_scene.setdefault(request.scene_path, []).append(request)
+
+        for scene_path, scene_requests in by_scene.items():
+            cmds.file(scene_path, open=True, force=True)
+            camera = cmds.camera(name='contenthub_thumbnail_cam')[0]
+            panel = cmds.getPanel(withFocus=True)
+            if cmds.getPanel(typeOf=panel) != 'modelPanel':
+                panel = cmds.getPanel(type='modelPanel')[0]
+            previous_camera = cmds.modelPanel(panel, q=True, camera=True)
+            cmds.modelPanel(panel, e=True, camera=camera)
+            try:
+                for i, request in enumerate(scene_requests):
+                    yaw, pitch = ANGLES.get(request.angle, ANGLES[DEFAULT_ANGLE])
+                    cmds.xform(camera, rotation=(pitch, yaw, 0), worldSpace=True)
+                    cmds.viewFit(camera, allObjects=True)
+                    raw_path = os.path.join(output_dir, f"{zlib.crc32(scene_path.encode())}_{i}.png")
+                    cmds.playblast(frame=cmds.currentTime(q=True), format="image", completeFilename=raw_path,
+                                   forceOverwrite=True, widthHeight=(self.size, self.size), showOrnaments=False,
+                                   percent=100, quality=100, viewer=False)
+                    yield request, raw_path
+            finally:
+                cmds.modelPanel(panel, e=True, camera=previous_camera)
+                cmds.delete(camera)
+
+
+class SyntheticBackend(CaptureBackend):
+    """
+    Stand-in backend that generates flat images, to run the pipeline without Maya
+    """
+
+    def __init__(self, size: int = CAPTURE_SIZE):
+        self.size = size
+
+    def capture(self, requests: list[CaptureRequest], output_dir: str) -> Iterator[tuple[CaptureRequest, str]]:
+        for i, request in enumerate(requests):
+            seed = zlib.crc32(f"{request.asset_path}:{request.angle}".encode())
+            image = QtGui.QImage(self.size, self.size, QtGui.QImage.Format_RGB32)
+            image.fill(QtGui.QColor(seed & 0xff, (seed >> 8) & 0xff, (seed >> 16) & 0xff))
+            raw_path = os.path.join(output_dir, f"synthetic_{i}.png")
+            image.save(raw_path, 'PNG')
+            yield request, raw_path
+
+
+def encode_thumbnail(raw_path: str, request: CaptureRequest, sizes: tuple[int, ...],
+                     store_dir: str, image_format: str = 'PNG') -> dict[str, Any]:
+    """
+    Pool worker: publishes the captured image and writes every pre-scaled variant.
+    Runs in a spawned process, arguments and the return value must pickle.
+    """
+    image = QtGui.QImage(raw_path)
+    if image.isNull():
+        raise RuntimeError(f"Could not read captured image {raw_path}")
+
+    thumbnail_path = os.path.join(request.asset_path, request.thumbnail_file).replace("\\", "/")
+    if image_format.upper() != 'PNG':
+        thumbnail_path = f"{os.path.splitext(thumbnail_path)[0]}.{image_format.lower()}"
+    os.makedirs(os.path.dirname(thumbnail_path), exist_ok=True)
+    tmp_path = f"{thumbnail_path}.{os.getpid()}.tmp"
+    if not image.save(tmp_path, image_format.upper()):
+        raise RuntimeError(f"Could not encode {thumbnail_path}")
+    os.replace(tmp_path, thumbnail_path)
+
+    store = thumbnail_store.ThumbnailStore(store_dir)
+    source_mtime = os.stat(thumbnail_path).st_mtime
+    variants = {}
+    for size in sorted(sizes, reverse=True):
+        # Scale down from the previous variant, each step stays cheap
+        image = image.scaled(size, size, QtCore.Qt.KeepAspectRatio, QtCore.Qt.SmoothTransformation)
+        variants[size] = store.put(thumbnail_path, size, source_mtime, image)
+    os.remove(raw_path)
+    return {'thumbnail': thumbnail_path, 'variants': variants}
+
+
+class ThumbnailPipeline:
+    """
+    Captures thumbnails through a backend and encodes them on a process pool.
+    Encoding of one capture overlaps with capturing the next.
+    """
+
+    def __init__(self, backend: CaptureBackend, sizes: Iterable[int] = (64, 128), workers: int | None = None,
+                 store_dir: str | None = None, image_format: str = 'PNG', update_metadata: bool = True):
+        self.backend = backend
+        self.sizes = tuple(sizes)
+        self.workers = workers or max(1, (os.cpu_count() or 2) - 1)
+        self.store_dir = store_dir or thumbnail_store.default_cache_dir()
+        self.image_format = image_format
+        self.update_metadata = update_metadata
+
+    def run(self, requests: list[CaptureRequest]) -> list[ThumbnailResult]:
+        _use_mayapy_for_workers()
+        work_dir = tempfile.mkdtemp(prefix='contenthub_thumbs_')
+        futures: list[tuple[CaptureRequest, Future]] = []
+        results = []
+        context = multiprocessing.get_context('spawn')
+        try:
+            with ProcessPoolExecutor(max_workers=self.workers, mp_context=context) as pool:
+                captured = set()
+                try:
+                    for request, raw_path in self.backend.capture(requests, work_dir):
+                        captured.add(request)
+                        futures.append((request, pool.submit(encode_thumbnail, raw_path, request, self.sizes,
+                                                             self.store_dir, self.image_format)))
+                except Exception as e:
+                    print(f"Capture stopped: {e}")
+                    results.extend(ThumbnailResult(r, False, '', {}, f"Capture failed: {e}")
+                                   for r in requests if r not in captured)
+
+                for request, future in futures:
+                    try:
+                        encoded = future.result()
+                    except Exception as e:
+                        results.append(ThumbnailResult(request, False, '', {}, str(e)))
+                        continue
+                    if self.update_metadata and request.angle == DEFAULT_ANGLE:
+                        self._record_thumbnail(request)
+                    results.append(ThumbnailResult(request, True, encoded['thumbnail'], encoded['variants'], ''))
+        finally:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+        # One atlas rebuild per folder, not per asset
+        updated = {os.path.dirname(r.request.asset_path): r.request.asset_path for r in results if r.ok}
+        for asset_path in updated.values():
+            thumbnail_atlas.update_asset(asset_path)
+        return results
+
+    def _record_thumbnail(self, request: CaptureRequest):
+        thumbnail_file = request.thumbnail_file
+        if self.image_format.upper() != 'PNG':
+            thumbnail_file = f"{os.path.splitext(thumbnail_file)[0]}.{self.image_format.lower()}"
+        entry = version_journal.read_version(request.asset_path, request.version)
+        # Legacy assets have no version.json yet, update_version migrates them
+        if entry is None or entry.get('thumbnail') != thumbnail_file:
+            version_journal.update_version(request.asset_path, request.version, {'thumbnail': thumbnail_file})
+            metadata_store.get_store().invalidate(os.path.join(request.asset_path, 'metadata.json'))
+            project_manifest.update_asset(request.asset_path)
+
+
+def requests_for_library(root_path: str, angles: Iterable[str] = (DEFAULT_ANGLE,)) -> list[CaptureRequest]:
+    """
+    Builds capture requests for the latest version of every asset under a root
+    """
+    requests = []
+    for record in asset_index.get_index().assets_under(root_path):
+        metadata = metadata_store.get_store().get(os.path.join(record.path, 'metadata.json'))
+        latest = metadata.latest_version() if metadata else None
+        if latest is None or not latest.file_path('fbx'):
+            continue
+        scene_path = os.path.join(record.path, latest.file_path('fbx')).replace("\\", "/")
+        requests.extend(CaptureRequest(record.path, latest.version, scene_path, angle) for angle in angles)
+    return requests
+
+
+def _in_maya_gui() -> bool:
+    try:
+        import maya.OpenMayaUI as omui
+    except ImportError:
+        return False
+    return omui.MQtUtil.mainWindow() is not None
+
+
+def _use_mayapy_for_workers():
+    # Inside Maya sys.executable is the GUI binary, spawned workers must use mayapy
+    executable = os.path.basename(sys.executable).lower()
+    if executable.startswith('maya') and not executable.startswith('mayapy'):
+        name = 'mayapy.exe' if sys.platform == 'win32' else 'mayapy'
+        multiprocessing.set_executable(os.path.join(os.path.dirname(sys.executable), name))
+
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Regenerate thumbnails for every asset under a root")
+    parser.add_argument('root')
+    parser.add_argument('--backend', choices=('maya', 'synthetic'), default='synthetic',
+                        help="synthetic writes flat stand-in images, maya needs an interactive Maya session")
+    parser.add_argument('--angles', default=DEFAULT_ANGLE, help="Comma separated: " + ", ".join(ANGLES))
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--format', default='PNG')
+    args = parser.parse_args()
+    # Playblast needs a viewport, in mayapy or a plain Python it would fail on every asset
+    if args.backend == 'maya' and not _in_maya_gui():
+        parser.error("the maya backend only works in an interactive Maya session, "
+                     "run ThumbnailPipeline(MayaPlayblastBackend()) from Maya's script editor")
+
+    capture_backend = MayaPlayblastBackend() if args.backend == 'maya' else SyntheticBackend()
+    pipeline = ThumbnailPipeline(capture_backend, workers=args.workers, image_format=args.format)
+    pipeline_results = pipeline.run(requests_for_library(args.root, args.angles.split(',')))
+    failed = [r for r in pipeline_results if not r.ok]
+    for r in failed:
+        print(f"FAILED {r.request.asset_path} ({r.request.angle}): {r.error}")
+    print(f"{len(pipeline_results) - len(failed)} thumbnails written, {len(failed)} failed")
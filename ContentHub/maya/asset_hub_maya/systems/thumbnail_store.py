@@ -0,0 +1,146 @@
+from __future__ import annotations
+
+from typing import Iterable
+
+import os
+import hashlib
+
+from PySide2 import QtCore, QtGui
+
+from shared.systems import tracing
+
+
+GRID_SIZE = 64
+DETAILS_SIZE = 128
+
+
+class ThumbnailStore:
+    """
+    On-disk cache of pre-scaled thumbnail variants.
+    Each variant carries the mtime of its source file, a mismatch means it is stale.
+    """
+
+    def __init__(self, cache_dir: str):
+        self.cache_dir = cache_dir.replace("\\", "/")
+
+    @classmethod
+    def for_project(cls, project_root: str) -> ThumbnailStore:
+        return cls(os.path.join(project_root, '.contenthub', 'thumbnails'))
+
+    def variant_path(self, source_path: str, size: int) -> str:
+        key = hashlib.sha1(os.path.normpath(source_path).replace("\\", "/").encode('utf-8')).hexdigest()
+        return f"{self.cache_dir}/{key[:2]}/{key}_{size}.png"
+
+    def get(self, source_path: str, size: int, source_mtime: float) -> str | None:
+        """
+        Returns the variant path if it exists and matches the source mtime
+        """
+        variant = self.variant_path(source_path, size)
+        try:
+            variant_mtime = os.stat(variant).st_mtime
+        except OSError:
+            return None
+        return variant if int(variant_mtime) == int(source_mtime) else None
+
+    def put(self, source_path: str, size: int, source_mtime: float, image: QtGui.QImage) -> str | None:
+        """
+        Writes a scaled variant and stamps it with the source mtime
+        """
+        variant = self.variant_path(source_path, size)
+        os.makedirs(os.path.dirname(variant), exist_ok=True)
+        tmp_path = f"{variant}.{os.getpid()}.{id(image)}.tmp"
+        if not image.save(tmp_path, 'PNG'):
+            return None
+        os.utime(tmp_path, (source_mtime, source_mtime))
+        os.replace(tmp_path, variant)
+        return variant
+
+    @tracing.traced('thumbnail.load')
+    def load(self, source_path: str, size: int, source_mtime: float) -> QtGui.QImage:
+        """
+        Reads the small variant, or decodes the source and fills the cache on a miss
+        """
+        variant = self.get(source_path, size, source_mtime)
+        if variant:
+            image = QtGui.QImage(variant)
+            if not image.isNull():
+                return image
+
+        image = decode_scaled(source_path, size)
+        if not image.isNull():
+            try:
+                self.put(source_path, size, source_mtime, image)
+            except OSError as e:
+                print(f"Failed to cache thumbnail {source_path}: {e}")
+        return image
+
+    def prefill(self, source_paths: Iterable[str], sizes: Iterable[int] = (GRID_SIZE, DETAILS_SIZE)) -> int:
+        """
+        Builds every missing or stale variant, returns how many were written
+        """
+        sizes = tuple(sizes)
+        written = 0
+        for source_path in source_paths:
+            try:
+                source_mtime = os.stat(source_path).st_mtime
+            except OSError:
+                continue
+            missing = [size for size in sizes if not self.get(source_path, size, source_mtime)]
+            if not missing:
+                continue
+            image = decode_scaled(source_path, max(missing))
+            for size in missing:
+                scaled = image if size == max(missing) else image.scaled(
+                    size, size, QtCore.Qt.KeepAspectRatio, QtCore.Qt.SmoothTransformation)
+                if not scaled.isNull() and self.put(source_path, size, source_mtime, scaled):
+                    written += 1
+        return written
+
+
+@tracing.traced('thumbnail.decode')
+def decode_scaled(source_path: str, size: int) -> QtGui.QImage:
+    """
+    Decodes an image no larger than size x size
+    """
+    reader = QtGui.QImageReader(source_path)
+    source_size = reader.size()
+    if source_size.isValid():
+        # Let the decoder skip work for formats that support it (jpeg)
+        reader.setScaledSize(source_size.scaled(size, size, QtCore.Qt.KeepAspectRatio))
+    image = reader.read()
+    if not image.isNull() and (image.width() > size or image.height() > size):
+        image = image.scaled(size, size, QtCore.Qt.KeepAspectRatio, QtCore.Qt.SmoothTransformation)
+    return image
+
+
+def default_cache_dir() -> str:
+    cache_dir = os.environ.get('CONTENTHUB_THUMBNAIL_DIR')
+    if not cache_dir:
+        base = os.environ.get('CONTENTHUB_CACHE_DIR') or os.path.join(os.path.expanduser('~'), '.contenthub')
+        cache_dir = os.path.join(base, 'thumbnails')
+    return cache_dir.replace("\\", "/")
+
+
+_store: ThumbnailStore | None = None
+
+
+def get_store() -> ThumbnailStore:
+    """
+    Returns the store shared by this session
+    """
+    global _store
+    if _store is None:
+        _store = ThumbnailStore(default_cache_dir())
+    return _store
+
+
+if __name__ == "__main__":
+    # Batch job: python thumbnail_store.py <project_root> [--project-cache]
+    import sys
+    from shared.systems import asset_index
+
+    app = QtCore.QCoreApplication.instance() or QtCore.QCoreApplication(sys.argv)
+    root = sys.argv[1]
+    store = ThumbnailStore.for_project(root) if '--project-cache' in sys.argv else get_store()
+    thumbnails = [record.thumbnail for record in asset_index.get_index().assets_under(root) if record.thumbnail]
+    print(f"Wrote {store.prefill(thumbnails)} thumbnail variants to {store.cache_dir}")
@@ -1,18 +1,20 @@
 from __future__ import annotations
 
-from typing import Any
-
-import os
-import json
-
 from PySide2 import QtCore, QtGui, QtWidgets
 
+from asset_hub_maya.systems import thumbnail_loader
+from shared.systems import metadata_store, tracing
+
 
 class AssetDetailsDialog(QtWidgets.QWidget):
 
     def __init__(self, parent=None):
         super().__init__(parent)
+        self.thumbnail_path = ""
+        self.loader = thumbnail_loader.get_loader()
         self.setup_ui()
+        self.loader.thumbnail_ready.connect(self._on_thumbnail_ready)
+        self.loader.thumbnail_changed.connect(self._on_thumbnail_changed)
 
     def setup_ui(self):
         # Create Widgets
@@ -54,33 +56,34 @@ class AssetDetailsDialog(QtWidgets.QWidget):
         self.resize(200, 400)
 
     def populate_details(self, metadata_path: str):
-        with open(metadata_path, 'r') as f:
-                data = f.read()
-        try:
-            metadata = json.loads(data)
-        except Exception as e:
-            print(f"Failed to parse metadata {metadata_path}: {e}")
-            return
-        
-        asset_name = metadata.get("name")
-        latest = metadata.get("latest", "")
-        versions = metadata.get("versions", [])
-        latest = metadata.get('latest', '')
+        tracing.begin_operation('populate_details')
+        with tracing.span('details.populate'):
+            metadata = metadata_store.get_store().get(metadata_path)
+            if metadata is None:
+                return
+
+            latest_version = metadata.latest_version()
+            version_number = metadata_store.version_number(metadata.latest)
+
+            self.asset_name.setText(metadata.name)
+            self.version.setText(str(version_number) if version_number >= 0 else '')
+            self.author.setText(latest_version.author if latest_version else '')
+            self.date.setText(latest_version.date if latest_version else '')
+            self.show_thumbnail(metadata.thumbnail_path())
+
+    def show_thumbnail(self, thumbnail_path: str):
+        """
+        Shows the cached thumbnail, or a placeholder until the loader delivers it
+        """
+        self.thumbnail_path = thumbnail_path
+        size = self.thumbnail.width()
+        pixmap = self.loader.request(thumbnail_path, size)
+        self.thumbnail.setPixmap(pixmap if pixmap is not None else self.loader.placeholder(size))
 
-        latest_version = {}
-        for v in versions:
-            if v.get('version', '') == latest:
-                latest_version = v
-        thumbnail_path = latest_version.get('thumbnail', '')
-        thumbnail_path = os.path.join(os.path.dirname(metadata_path), thumbnail_path).replace("\\", "/")
+    def _on_thumbnail_ready(self, path: str, size: int):
+        if path == self.thumbnail_path and size == self.thumbnail.width():
+            self.thumbnail.setPixmap(self.loader.request(path, size))
 
-        self.asset_name.setText(asset_name)
-        self.version.setText(str(int(latest.lstrip('v'))))
-        self.author.setText(latest_version.get('author', ''))
-        self.date.setText(latest_version.get('date', ''))
-        if os.path.exists(thumbnail_path):
-            pixmap = QtGui.QPixmap(thumbnail_path)
-            pixmap = pixmap.scaled(self.thumbnail.size(), QtCore.Qt.KeepAspectRatio, QtCore.Qt.SmoothTransformation)
-            self.thumbnail.setPixmap(pixmap)
-        else:
-            self.thumbnail.setPixmap(QtGui.QPixmap())
\ No newline at end of file
+    def _on_thumbnail_changed(self, path: str):
+        if path == self.thumbnail_path:
+            self.show_thumbnail(path)
\ No newline at end of file
@@ -1,80 +1,399 @@
 from __future__ import annotations
 
+from typing import Any
+
 import os
-import json
 
 from PySide2 import QtCore, QtGui, QtWidgets
 
+from contenthub import core
+from asset_hub_maya.systems import asset_scanner, thumbnail_loader
+from shared.systems import asset_index, folder_watcher, search_index, tracing
+
+
+class AssetListModel(QtCore.QAbstractListModel):
+    """
+    Flat list of asset records, exposed to the view in batches
+    """
+
+    PathRole = QtCore.Qt.UserRole
+    ThumbnailRole = QtCore.Qt.UserRole + 1
+
+    def __init__(self, batch_size: int = 256, icon_size: int = 64, parent=None):
+        super().__init__(parent)
+        self.batch_size = batch_size
+        self.icon_size = icon_size
+        self._records: list[asset_index.AssetRecord] = []
+        self._loaded = 0
+        # Rows painted with a placeholder, waiting for their thumbnail
+        self._waiting: dict[str, set[int]] = {}
+        # Rows waiting for their folder's atlas before loading thumbnails one by one
+        self._atlas_waiting: dict[str, set[int]] = {}
+        self.loader = thumbnail_loader.get_loader()
+        self.loader.thumbnail_ready.connect(self._on_thumbnail_ready)
+        self.loader.thumbnail_changed.connect(self._on_thumbnail_changed)
+        self.loader.atlas_loaded.connect(self._on_atlas_loaded)
+
+    def set_records(self, records: list[asset_index.AssetRecord]):
+        self.loader.cancel_pending()
+        self.set_visible(records)
+        self._load_atlases(self._records)
+
+    def set_visible(self, records: list[asset_index.AssetRecord]):
+        """
+        Swaps the shown records, e.g. for search results.
+        Thumbnail loads in flight are kept, the records were already known.
+        """
+        self.beginResetModel()
+        self._records = list(records)
+        self._loaded = 0
+        self._waiting.clear()
+        self._atlas_waiting.clear()
+        self.endResetModel()
+
+    def append_records(self, records: list[asset_index.AssetRecord]):
+        """
+        Adds streamed records, showing them right away if the view has caught up
+        """
+        caught_up = self._loaded >= len(self._records)
+        self._records.extend(records)
+        self._load_atlases(records)
+        if caught_up:
+            self.fetchMore()
+
+    def replace_under(self, path: str, records: list[asset_index.AssetRecord]):
+        """
+        Replaces the records at or below a folder with a fresh set.
+        Changed records are updated in place, removed ones drop out and new ones are appended.
+        """
+        fresh = {record.path: record for record in records}
+        prefix = path.rstrip('/') + '/'
+        removed_rows = []
+        for row, record in enumerate(self._records):
+            if record.path != path and not record.path.startswith(prefix):
+                continue
+            updated = fresh.pop(record.path, None)
+            if updated is None:
+                removed_rows.append(row)
+            elif updated != record:
+                self._records[row] = updated
+                if row < self._loaded:
+                    self.dataChanged.emit(self.index(row), self.index(row))
+
+        # Remove contiguous runs from the end so earlier rows keep their numbers
+        self._waiting.clear()
+        self._atlas_waiting.clear()
+        while removed_rows:
+            last = first = removed_rows.pop()
+            while removed_rows and removed_rows[-1] == first - 1:
+                first = removed_rows.pop()
+            visible = first < self._loaded
+            if visible:
+                self.beginRemoveRows(QtCore.QModelIndex(), first, min(last, self._loaded - 1))
+                self._loaded -= min(last, self._loaded - 1) - first + 1
+            del self._records[first:last + 1]
+            if visible:
+                self.endRemoveRows()
+
+        if fresh:
+            self.append_records(list(fresh.values()))
+
+    def rowCount(self, parent=QtCore.QModelIndex()) -> int:
+        return 0 if parent.isValid() else self._loaded
+
+    def canFetchMore(self, parent=QtCore.QModelIndex()) -> bool:
+        return not parent.isValid() and self._loaded < len(self._records)
+
+    @tracing.traced('grid.insert_rows')
+    def fetchMore(self, parent=QtCore.QModelIndex()):
+        if parent.isValid():
+            return
+        count = min(self.batch_size, len(self._records) - self._loaded)
+        if count <= 0:
+            return
+        self.beginInsertRows(QtCore.QModelIndex(), self._loaded, self._loaded + count - 1)
+        self._loaded += count
+        self.endInsertRows()
+
+    def data(self, index: QtCore.QModelIndex, role: int = QtCore.Qt.DisplayRole) -> Any:
+        if not index.isValid() or index.row() >= self._loaded:
+            return None
+
+        record = self._records[index.row()]
+        if role in (QtCore.Qt.DisplayRole, QtCore.Qt.ToolTipRole):
+            return record.name
+        if role == self.PathRole:
+            return record.path
+        if role == self.ThumbnailRole:
+            return record.thumbnail
+        if role == QtCore.Qt.DecorationRole:
+            return self._pixmap(index.row(), record)
+        return None
+
+    def _load_atlases(self, records: list[asset_index.AssetRecord]):
+        for folder in {os.path.dirname(record.path) for record in records if record.thumbnail}:
+            self.loader.load_atlas(folder, self.icon_size)
+
+    def _pixmap(self, row: int, record: asset_index.AssetRecord) -> QtGui.QPixmap:
+        # Only rows that get painted ever reach here
+        thumbnail_path = record.thumbnail
+        folder = os.path.dirname(record.path)
+        if thumbnail_path and self.loader.atlas_pending(folder, self.icon_size):
+            self._atlas_waiting.setdefault(folder, set()).add(row)
+            return self.loader.placeholder(self.icon_size)
+
+        pixmap = self.loader.request(thumbnail_path, self.icon_size)
+        if pixmap is None:
+            if thumbnail_path:
+                self._waiting.setdefault(thumbnail_path, set()).add(row)
+            return self.loader.placeholder(self.icon_size)
+        return pixmap
+
+    def _on_thumbnail_ready(self, path: str, size: int):
+        if size != self.icon_size:
+            return
+        for row in self._waiting.pop(path, ()):
+            if row < self._loaded:
+                index = self.index(row)
+                self.dataChanged.emit(index, index, [QtCore.Qt.DecorationRole])
+
+    def _on_thumbnail_changed(self, path: str):
+        # Rare, a scan of the shown rows is cheaper than keeping a path to rows map
+        for row in range(self._loaded):
+            if self._records[row].thumbnail == path:
+                index = self.index(row)
+                self.dataChanged.emit(index, index, [QtCore.Qt.DecorationRole])
+
+    def _on_atlas_loaded(self, folder: str):
+        # Rows the atlas did not cover now load their thumbnail file on the next paint
+        for row in self._atlas_waiting.pop(folder, ()):
+            if row < self._loaded:
+                index = self.index(row)
+                self.dataChanged.emit(index, index, [QtCore.Qt.DecorationRole])
+
+
+class AssetItemDelegate(QtWidgets.QStyledItemDelegate):
+    """
+    Paints a thumbnail with the asset name underneath
+    """
+
+    def __init__(self, icon_size: int = 64, parent=None):
+        super().__init__(parent)
+        self.icon_size = icon_size
+        self.padding = 4
+
+    def sizeHint(self, option: QtWidgets.QStyleOptionViewItem, index: QtCore.QModelIndex) -> QtCore.QSize:
+        text_height = option.fontMetrics.height()
+        return QtCore.QSize(self.icon_size + 4 * self.padding,
+                            self.icon_size + text_height + 3 * self.padding)
+
+    def paint(self, painter: QtGui.QPainter, option: QtWidgets.QStyleOptionViewItem, index: QtCore.QModelIndex):
+        painter.save()
+        rect = option.rect
+
+        if option.state & QtWidgets.QStyle.State_Selected:
+            painter.fillRect(rect, option.palette.highlight())
+            painter.setPen(option.palette.highlightedText().color())
+        else:
+            painter.setPen(option.palette.text().color())
+
+        pixmap = index.data(QtCore.Qt.DecorationRole)
+        if pixmap is not None and not pixmap.isNull():
+            x = rect.x() + (rect.width() - pixmap.width()) // 2
+            y = rect.y() + self.padding + (self.icon_size - pixmap.height()) // 2
+            painter.drawPixmap(x, y, pixmap)
 
-class AssetDisplayView(QtWidgets.QListWidget):
+        text_rect = QtCore.QRect(rect.x() + self.padding,
+                                 rect.y() + self.icon_size + 2 * self.padding,
+                                 rect.width() - 2 * self.padding,
+                                 option.fontMetrics.height())
+        text = option.fontMetrics.elidedText(index.data(QtCore.Qt.DisplayRole) or "",
+                                             QtCore.Qt.ElideRight, text_rect.width())
+        painter.drawText(text_rect, QtCore.Qt.AlignHCenter | QtCore.Qt.AlignTop, text)
+        painter.restore()
+
+
+class AssetDisplayView(QtWidgets.QListView):
     """
     Displays assets in an icon grid
     """
 
+    itemSelectionChanged = QtCore.Signal()
+
     def __init__(self, parent=None):
         super().__init__(parent)
-        self.setViewMode(QtWidgets.QListWidget.IconMode)
+        self.asset_model = AssetListModel(icon_size=64, parent=self)
+        self.setModel(self.asset_model)
+        self.setItemDelegate(AssetItemDelegate(icon_size=64, parent=self))
+        self.setViewMode(QtWidgets.QListView.IconMode)
         self.setIconSize(QtCore.QSize(64, 64))
-        self.setResizeMode(QtWidgets.QListWidget.Adjust)
+        self.setResizeMode(QtWidgets.QListView.Adjust)
+        self.setLayoutMode(QtWidgets.QListView.Batched)
         self.setUniformItemSizes(True)
         self.setSpacing(10)
+        self.setMovement(QtWidgets.QListView.Static)
         self.setDragDropMode(QtWidgets.QAbstractItemView.NoDragDrop)
+        self.setSelectionMode(QtWidgets.QAbstractItemView.SingleSelection)
+        self.selectionModel().selectionChanged.connect(lambda *args: self.itemSelectionChanged.emit())
+
+        self.scanner = asset_scanner.AssetScanner(parent=self)
+        self.scanner.batch_ready.connect(self._on_batch_ready)
+        self.scanner.rescanned.connect(self._on_rescanned)
+        # Search covers the whole library, its own scanner fills the index once
+        self.library_scanner = asset_scanner.AssetScanner(parent=self)
+        self.library_scanner.batch_ready.connect(self._on_library_batch_ready)
+        self.library_scanner.rescanned.connect(self._on_rescanned)
+        self.search_index = search_index.SearchIndex()
+        self.search_text = ""
+        # Limits search results to the shown folder
+        self.folder_only = False
+        self.library_root = ""
+        self.root_path = ""
+        # Records of the shown folder, in scan order
+        self._folder_records: dict[str, asset_index.AssetRecord] = {}
+        self._library_loaded = False
+        self.watcher = None
+
+    def set_watcher(self, watcher: folder_watcher.FolderWatcher):
+        """
+        Keeps the grid in sync with folder changes reported by the watcher
+        """
+        self.watcher = watcher
+        self.watcher.directory_changed.connect(self._on_directory_changed)
+
+    def set_library(self, library_root: str):
+        """
+        Sets the library that search covers. It is indexed on the first search.
+        """
+        library_root = asset_index.normalize_path(library_root) if library_root else ""
+        if library_root == self.library_root:
+            return
+        self.library_scanner.cancel()
+        self.library_root = library_root
+        self.search_index.clear(library_root)
+        self._library_loaded = False
+        if self.search_text:
+            self._load_library()
+
+    def clear(self):
+        self.scanner.cancel()
+        self._folder_records.clear()
+        self.asset_model.set_records([])
+
+    def set_search_text(self, text: str):
+        """
+        Shows the library's assets matching every word of the text, the shown folder without one.
+        Only the in-memory search index is queried, never the filesystem.
+        """
+        self.search_text = text.strip()
+        if self.search_text:
+            self._load_library()
+        self._update_visible()
+
+    def set_folder_only(self, folder_only: bool):
+        """
+        Limits search results to assets at or below the shown folder
+        """
+        self.folder_only = folder_only
+        if self.search_text:
+            self._update_visible()
 
     def selected_asset_path(self) -> str | None:
         """
         Returns the absolute path of the currently selected asset
         """
-        item = self.currentItem()
-        return item.data(QtCore.Qt.UserRole) if item else None
-    
+        index = self.currentIndex()
+        return index.data(AssetListModel.PathRole) if index.isValid() else None
+
     def populate_assets(self, root_path: str):
         """
-        Populates the view with assets from the given root path
+        Populates the view with assets from the given root path.
+        The scan runs in the background and results stream in as they are found.
         """
+        tracing.begin_operation('populate_assets')
         self.clear()
-        
-        if not (root_path and os.path.exists(root_path) and os.path.isdir(root_path)):
+        if self.watcher is not None and self.root_path:
+            self.watcher.unwatch(self.root_path)
+        self.root_path = asset_index.normalize_path(root_path) if root_path else ""
+        if not self.root_path:
             return
-        
-        metas = self._find_all_metadata(root_path)
-        
-        for meta in metas:
-            with open(meta, 'r') as f:
-                data = f.read()
-            try:
-                metadata = json.loads(data)
-            except Exception as e:
-                print(f"Failed to parse metadata {meta}: {e}")
-                continue
+        if self.search_text:
+            # Search results stay up, the folder only narrows them
+            self._update_visible()
+        self.scanner.scan(self.root_path)
+        if self.watcher is not None:
+            self.watcher.watch(self.root_path)
 
-            asset_name = metadata.get("name")
-            latest = metadata.get("latest", "")
-            versions = metadata.get("versions", [])
-            latest = metadata.get('latest', '')
-
-            latest_version = {}
-            for v in versions:
-                if v.get('version', '') == latest:
-                    latest_version = v
-            thumbnail_path = latest_version.get('thumbnail', '')
-            thumbnail_path = os.path.join(os.path.dirname(meta), thumbnail_path).replace("\\", "/")
-
-            item = QtWidgets.QListWidgetItem(asset_name)
-            item.setData(QtCore.Qt.UserRole, os.path.dirname(meta))
-            item.setText(asset_name)
-            item.setIcon(QtGui.QIcon(thumbnail_path))
-            
-            self.addItem(item)
-        
-    def get_all_assets(self, root_path: str) -> list[str]:
-        pass
+    def _load_library(self):
+        if self._library_loaded or not self.library_root:
+            return
+        self._library_loaded = True
+        self.library_scanner.scan(self.library_root)
+
+    def _update_visible(self):
+        if not self.search_text:
+            self.asset_model.set_visible(list(self._folder_records.values()))
+            return
+        with tracing.span('search.query', text=self.search_text):
+            results = self.search_index.search(self.search_text)
+            if self.folder_only:
+                results = [record for record in results if _is_under(record.path, self.root_path)]
+        self.asset_model.set_visible(results)
+
+    def _on_batch_ready(self, records: list[asset_index.AssetRecord]):
+        for record in records:
+            self._folder_records[record.path] = record
+        new = records
+        if self._library_loaded:
+            # Records the index already had are shown already, if they match
+            new = [record for record in records if record.path not in self.search_index]
+            self.search_index.add(records)
+        self.asset_model.append_records(self._matching(new) if self.search_text else records)
 
-    def _find_all_metadata(self, root: str) -> list[str]:
+    def _on_library_batch_ready(self, records: list[asset_index.AssetRecord]):
+        new = [record for record in records if record.path not in self.search_index]
+        self.search_index.add(records)
+        if self.search_text:
+            self.asset_model.append_records(self._matching(new))
+
+    def _on_rescanned(self, path: str, records: list[asset_index.AssetRecord]):
+        if self._library_loaded:
+            self.search_index.replace_under(path, records)
+        if self.root_path and (_is_under(path, self.root_path) or _is_under(self.root_path, path)):
+            prefix = path.rstrip('/') + '/'
+            for stale in [p for p in self._folder_records if p == path or p.startswith(prefix)]:
+                del self._folder_records[stale]
+            for record in records:
+                if _is_under(record.path, self.root_path):
+                    self._folder_records[record.path] = record
+        if self.search_text:
+            self.asset_model.replace_under(path, self._matching(records))
+        else:
+            self.asset_model.replace_under(path, [record for record in records
+                                                  if _is_under(record.path, self.root_path)])
+
+    def _matching(self, records: list[asset_index.AssetRecord]) -> list[asset_index.AssetRecord]:
+        """
+        The records search would show, for records that streamed in after the search ran
+        """
+        return [record for record in records if self.search_index.matches(record, self.search_text)
+                and (not self.folder_only or _is_under(record.path, self.root_path))]
+
+    def _on_directory_changed(self, path: str):
+        if self.root_path and _is_under(path, self.root_path):
+            self.scanner.rescan(path)
+        elif self._library_loaded and _is_under(path, self.library_root):
+            self.library_scanner.rescan(path)
+        else:
+            return
+        self.asset_model.loader.invalidate_under(path)
+
+    def get_all_assets(self, root_path: str) -> list[str]:
         """
-        Finds all metadata.json files under the given root path.
+        Returns every asset folder below the root, straight from the filesystem
         """
-        metadata_files = []
-        for dirpath, dirnames, filenames in os.walk(root):
-            if 'metadata.json' in filenames:
-                metadata_files.append(os.path.join(dirpath, 'metadata.json'))
-        return metadata_files
\ No newline at end of file
+        return sorted(core.iter_asset_paths(root_path))
+
+
+def _is_under(path: str, folder: str) -> bool:
+    return bool(folder) and (path == folder or path.startswith(folder.rstrip('/') + '/'))
@@ -2,6 +2,7 @@ import sys
 import os
 
 tool_paths = [
+    r"D:\Xicheng\Projects\HarshBlue\Maya-Unreal-Tool-Dev-Course\Code\maya-unreal-devtools\ContentHub",
     r"D:\Xicheng\Projects\HarshBlue\Maya-Unreal-Tool-Dev-Course\Code\maya-unreal-devtools\ContentHub\maya",
     r"D:\Xicheng\Projects\HarshBlue\Maya-Unreal-Tool-Dev-Course\Code\maya-unreal-devtools\ContentHub\shared",
 ]
@@ -9,6 +9,8 @@ class DockWindow(QtWidgets.QWidget):
     CONTROL_NAME = "DockableQtTool"
     TITLE = "Dockable Qt Tool"
     WIDGET_OBJECT_NAME = "DockableQtToolWidget"
+    # Set to keep the widget when its dock is closed, setParentWindow() puts it in the next one
+    KEEP_ALIVE = False
 
     def __init__(self, parent=None):
         super().__init__(parent)
@@ -41,15 +43,21 @@ class DockWindow(QtWidgets.QWidget):
 
         # Create the container if needed
         if not cmds.workspaceControl(ctrl, q=True, exists=True):
-            cmds.workspaceControl(ctrl, label=title, retain=False, floating=False)
+            # The control is deleted on close, a kept widget is taken out of it first
+            close_command = {'closeCommand': self.detachFromDock} if self.KEEP_ALIVE else {}
+            cmds.workspaceControl(ctrl, label=title, retain=False, floating=False, **close_command)
+        elif self.KEEP_ALIVE:
+            # Made by an earlier session or restored by Maya's layout, without our close command
+            cmds.workspaceControl(ctrl, e=True, closeCommand=self.detachFromDock)
 
         # Wrap the control container as a QWidget
         ptr = window_utils.get_maya_control_ptr(ctrl)
         container = shiboken2.wrapInstance(int(ptr), QtWidgets.QWidget)
 
         # Parent this widget into the container
-        self.setParent(container)
-        self.setWindowFlags(QtCore.Qt.Widget)
+        if self.parent() is not container:
+            self.setParent(container)
+            self.setWindowFlags(QtCore.Qt.Widget)
 
         # Ensure a clean layout, then add self
         lay = container.layout()
@@ -57,14 +65,25 @@ class DockWindow(QtWidgets.QWidget):
             lay = QtWidgets.QVBoxLayout(container)
             lay.setContentsMargins(0, 0, 0, 0)
         else:
-            # remove any existing children to avoid duplicates
-            while lay.count():
-                item = lay.takeAt(0)
-                w = item.widget()
+            # remove any other children to avoid duplicates, this widget may already be docked here
+            for i in reversed(range(lay.count())):
+                w = lay.itemAt(i).widget()
+                if w is self:
+                    continue
+                lay.takeAt(i)
                 if w:
                     w.setParent(None)
 
-        lay.addWidget(self)
+        if lay.indexOf(self) < 0:
+            lay.addWidget(self)
+        self.show()
 
         # Raise/restore the dock
-        cmds.workspaceControl(ctrl, e=True, restore=True)
\ No newline at end of file
+        cmds.workspaceControl(ctrl, e=True, restore=True)
+
+    def detachFromDock(self):
+        """
+        Takes this widget out of its closing workspaceControl, so it outlives the control
+        """
+        self.hide()
+        self.setParent(None)
@@ -0,0 +1,361 @@
+from __future__ import annotations
+
+from typing import Any, Callable, NamedTuple
+
+import os
+import time
+import sqlite3
+import threading
+
+from shared.systems import dir_walker, metadata_store, tracing
+
+
+METADATA_FILE = 'metadata.json'
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS dirs (
+    path TEXT PRIMARY KEY,
+    parent TEXT,
+    mtime REAL NOT NULL,
+    is_asset INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS dirs_parent ON dirs (parent);
+CREATE TABLE IF NOT EXISTS assets (
+    path TEXT PRIMARY KEY,
+    name TEXT,
+    latest TEXT,
+    author TEXT,
+    date TEXT,
+    thumbnail TEXT,
+    mtime REAL NOT NULL,
+    size INTEGER NOT NULL,
+    tags TEXT NOT NULL DEFAULT ''
+);
+"""
+# Bump when the schema changes, older index files are rebuilt from scratch
+SCHEMA_VERSION = 2
+
+_RECORD_COLUMNS = "path, name, latest, author, date, thumbnail, mtime, tags"
+# Folders probed per round trip to the pool, small enough to check for cancellation often
+PROBE_CHUNK = 256
+
+
+class ScanCancelled(Exception):
+    pass
+
+
+class _Known(NamedTuple):
+    # What the index holds for a folder, -1 where nothing is known
+    mtime: float = -1
+    is_asset: bool = False
+    metadata_mtime: float = -1
+    metadata_size: int = -1
+
+
+class _Probe(NamedTuple):
+    # What the filesystem holds for a folder, gathered off the indexing thread
+    mtime: float | None
+    subdirs: list[str] | None = None
+    is_asset: bool = False
+    metadata_stat: os.stat_result | None = None
+    record: dict[str, Any] | None = None
+    # Whether metadata.json changed and was read into record, which stays None if it was unreadable
+    parsed: bool = False
+
+
+class AssetRecord(NamedTuple):
+    path: str
+    name: str
+    latest: str
+    author: str
+    date: str
+    thumbnail: str
+    mtime: float
+    # Comma separated tags of the latest version
+    tags: str = ''
+
+
+def normalize_path(path: str) -> str:
+    return os.path.normpath(path).replace("\\", "/")
+
+
+def default_index_path() -> str:
+    """
+    Returns the location of the local index database
+    """
+    cache_dir = os.environ.get('CONTENTHUB_CACHE_DIR') or os.path.join(os.path.expanduser('~'), '.contenthub')
+    return os.path.join(cache_dir, 'asset_index.sqlite').replace("\\", "/")
+
+
+def read_asset_record(asset_path: str) -> dict[str, Any] | None:
+    """
+    Reads the metadata.json of an asset folder into a flat record
+    """
+    metadata = metadata_store.get_store().get(os.path.join(asset_path, METADATA_FILE))
+    if metadata is None:
+        return None
+    return metadata_record(metadata)
+
+
+def metadata_record(metadata: metadata_store.AssetMetadata) -> dict[str, Any]:
+    """
+    Flattens parsed metadata into the fields of an AssetRecord
+    """
+    latest_version = metadata.latest_version()
+    tags = latest_version.extra.get('tags', []) if latest_version else []
+    return {
+        'name': metadata.name,
+        'latest': str(metadata.latest),
+        'author': latest_version.author if latest_version else '',
+        'date': latest_version.date if latest_version else '',
+        'thumbnail': metadata.thumbnail_path(),
+        'tags': tags if isinstance(tags, str) else ','.join(tags),
+    }
+
+
+class AssetIndex:
+    """
+    Local SQLite index of asset records, kept up to date by comparing mtimes
+    """
+
+    def __init__(self, db_path: str | None = None, max_age: float = 5.0):
+        self.db_path = db_path or default_index_path()
+        self.max_age = max_age
+        if self.db_path != ':memory:':
+            os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        if self._conn.execute("PRAGMA user_version").fetchone()[0] < SCHEMA_VERSION:
+            self._conn.executescript("DROP TABLE IF EXISTS dirs; DROP TABLE IF EXISTS assets;")
+            self._conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        self._conn.executescript(_SCHEMA)
+        self._lock = threading.RLock()
+        self._refreshed: dict[str, float] = {}
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def assets_under(self, root_path: str, refresh: bool = True) -> list[AssetRecord]:
+        """
+        Returns every indexed asset at or below the given path, sorted by path
+        """
+        root_path = normalize_path(root_path)
+        if refresh and self._is_stale(root_path):
+            self.refresh(root_path)
+
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT {_RECORD_COLUMNS} FROM assets "
+                "WHERE path = ? OR (path >= ? AND path < ?) ORDER BY path",
+                (root_path, *_prefix_range(root_path)),
+            ).fetchall()
+        return [AssetRecord(*row) for row in rows]
+
+    def is_stale(self, root_path: str) -> bool:
+        """
+        Returns whether the subtree has not been refreshed within max_age
+        """
+        return self._is_stale(normalize_path(root_path))
+
+    def refresh(self, root_path: str,
+                on_asset: Callable[[AssetRecord], None] | None = None,
+                should_cancel: Callable[[], bool] | None = None):
+        """
+        Brings the index up to date for the given subtree.
+        Unchanged directories are only stat'ed, unchanged metadata is never re-parsed.
+        The filesystem is probed from the dir_walker pool, so high latency shares
+        are walked many folders at a time.
+        on_asset is called with every asset found, parents' levels first. If should_cancel
+        returns True the walk stops, the partial update is rolled back and
+        ScanCancelled is raised.
+        """
+        root_path = normalize_path(root_path)
+        with tracing.span('index.refresh', root=root_path), self._lock, self._conn:
+            # Level by level, the folders of a level are probed concurrently and
+            # then applied to the database on this thread
+            level = [(root_path, self._parent_of(root_path))]
+            while level:
+                next_level = []
+                for start in range(0, len(level), PROBE_CHUNK):
+                    if should_cancel and should_cancel():
+                        raise ScanCancelled(root_path)
+                    chunk = level[start:start + PROBE_CHUNK]
+                    known = [self._known(path) for path, _ in chunk]
+                    probes = dir_walker.map_paths(_probe_dir, zip((path for path, _ in chunk), known))
+                    for (path, parent), probe in zip(chunk, probes):
+                        children, record = self._refresh_dir(path, parent, probe)
+                        next_level.extend(children)
+                        if record and on_asset:
+                            on_asset(record)
+                level = next_level
+        self._refreshed[root_path] = time.monotonic()
+
+    def invalidate(self, path: str | None = None):
+        """
+        Forces the next query at or below the path (or everywhere) to refresh
+        """
+        if path is None:
+            self._refreshed.clear()
+            return
+        path = normalize_path(path)
+        for refreshed in list(self._refreshed):
+            if refreshed == path or _is_below(path, refreshed) or _is_below(refreshed, path):
+                # The watcher and the GUI thread may drop the same entry
+                self._refreshed.pop(refreshed, None)
+
+    def forget(self, path: str):
+        """
+        Drops everything indexed at or below the path, the next refresh rebuilds it from scratch
+        """
+        path = normalize_path(path)
+        self.invalidate(path)
+        with self._lock, self._conn:
+            self._remove_subtree(path, include_self=True)
+
+    def _is_stale(self, path: str) -> bool:
+        now = time.monotonic()
+        # Copied first, refreshes on other threads write to it. Taking the lock would wait out their walk.
+        for refreshed, stamp in list(self._refreshed.items()):
+            if (refreshed == path or _is_below(path, refreshed)) and now - stamp < self.max_age:
+                return False
+        return True
+
+    def _parent_of(self, path: str) -> str | None:
+        row = self._conn.execute("SELECT parent FROM dirs WHERE path = ?", (path,)).fetchone()
+        return row[0] if row else None
+
+    def _known(self, path: str) -> _Known:
+        row = self._conn.execute("SELECT mtime, is_asset FROM dirs WHERE path = ?", (path,)).fetchone()
+        if not row:
+            return _Known()
+        asset = self._conn.execute("SELECT mtime, size FROM assets WHERE path = ?", (path,)).fetchone() \
+            if row[1] else None
+        return _Known(row[0], bool(row[1]), *(asset or ()))
+
+    @tracing.traced('index.refresh_dir')
+    def _refresh_dir(self, path: str, parent: str | None, probe: _Probe
+                     ) -> tuple[list[tuple[str, str]], AssetRecord | None]:
+        """
+        Updates one directory row from its probe.
+        Returns the child directories to visit and the asset record if it is an asset folder.
+        """
+        if probe.mtime is None:
+            self._remove_subtree(path, include_self=True)
+            return [], None
+
+        if probe.subdirs is None:
+            # Unchanged since the last visit
+            if probe.is_asset:
+                return [], self._refresh_asset(path, probe)
+            children = self._conn.execute("SELECT path FROM dirs WHERE parent = ?", (path,)).fetchall()
+            return [(child, path) for (child,) in children], None
+
+        # Directory listing changed (or first visit), this level was rescanned
+        known = {child for (child,) in self._conn.execute("SELECT path FROM dirs WHERE parent = ?", (path,))}
+        for stale in known.difference(probe.subdirs):
+            self._remove_subtree(stale, include_self=True)
+
+        self._conn.execute(
+            "INSERT OR REPLACE INTO dirs (path, parent, mtime, is_asset) VALUES (?, ?, ?, ?)",
+            (path, parent, probe.mtime, int(probe.is_asset)),
+        )
+        if probe.is_asset:
+            return [], self._refresh_asset(path, probe)
+
+        self._conn.execute("DELETE FROM assets WHERE path = ?", (path,))
+        return [(child, path) for child in probe.subdirs], None
+
+    def _refresh_asset(self, asset_path: str, probe: _Probe) -> AssetRecord | None:
+        st = probe.metadata_stat
+        if st is None:
+            self._conn.execute("DELETE FROM assets WHERE path = ?", (asset_path,))
+            self._conn.execute("UPDATE dirs SET mtime = -1 WHERE path = ?", (asset_path,))
+            return None
+
+        record = probe.record
+        if not probe.parsed:
+            row = self._conn.execute(
+                f"SELECT {_RECORD_COLUMNS}, size FROM assets WHERE path = ?", (asset_path,)
+            ).fetchone()
+            if row and row[6] == st.st_mtime and row[8] == st.st_size:
+                return AssetRecord(*row[:8])
+            record = read_asset_record(asset_path)
+        if record is None:
+            self._conn.execute("DELETE FROM assets WHERE path = ?", (asset_path,))
+            return None
+
+        self._conn.execute(
+            "INSERT OR REPLACE INTO assets (path, name, latest, author, date, thumbnail, mtime, size, tags) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (asset_path, record['name'], record['latest'], record['author'], record['date'],
+             record['thumbnail'], st.st_mtime, st.st_size, record['tags']),
+        )
+        return AssetRecord(asset_path, record['name'], record['latest'], record['author'],
+                           record['date'], record['thumbnail'], st.st_mtime, record['tags'])
+
+    def _remove_subtree(self, path: str, include_self: bool = False):
+        low, high = _prefix_range(path)
+        for table in ('dirs', 'assets'):
+            self._conn.execute(f"DELETE FROM {table} WHERE path >= ? AND path < ?", (low, high))
+            if include_self:
+                self._conn.execute(f"DELETE FROM {table} WHERE path = ?", (path,))
+
+
+def _probe_dir(args: tuple[str, _Known]) -> _Probe:
+    """
+    Does the filesystem part of refreshing a folder: a stat, a listing only if
+    the folder changed, and a parse only if its metadata.json changed
+    """
+    path, known = args
+    try:
+        mtime = os.stat(path).st_mtime
+    except OSError:
+        return _Probe(None)
+
+    subdirs = None
+    metadata_entry = None
+    is_asset = known.is_asset
+    if mtime != known.mtime:
+        listing = dir_walker.list_dir(path)
+        if listing.error is not None:
+            return _Probe(None)
+        metadata_entry = listing.file(METADATA_FILE)
+        is_asset = metadata_entry is not None
+        subdirs = [] if is_asset else [normalize_path(entry.path) for entry in listing.dirs]
+    if not is_asset:
+        return _Probe(mtime, subdirs)
+
+    try:
+        # Free from the listing on Windows, one stat elsewhere
+        st = metadata_entry.stat() if metadata_entry else os.stat(os.path.join(path, METADATA_FILE))
+    except OSError:
+        return _Probe(mtime, subdirs, True)
+    if st.st_mtime == known.metadata_mtime and st.st_size == known.metadata_size:
+        return _Probe(mtime, subdirs, True, st)
+    return _Probe(mtime, subdirs, True, st, read_asset_record(path), True)
+
+
+def _prefix_range(path: str) -> tuple[str, str]:
+    # '0' sorts directly after '/', so this range selects everything below path
+    base = path.rstrip('/')
+    return base + '/', base + '0'
+
+
+def _is_below(path: str, ancestor: str) -> bool:
+    return path.startswith(ancestor.rstrip('/') + '/')
+
+
+_index: AssetIndex | None = None
+_index_lock = threading.Lock()
+
+
+def get_index() -> AssetIndex:
+    """
+    Returns the shared index for this session
+    """
+    global _index
+    # Scanner and prefetcher threads may ask first, only one of them may open the database
+    with _index_lock:
+        if _index is None:
+            _index = AssetIndex()
+    return _index
@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+from typing import Any
+
+import os
+import stat
+import shutil
+import socket
+import hashlib
+from contextlib import suppress
+
+
+STORE_DIR = '.contenthub/blobs'
+CHUNK_SIZE = 1024 * 1024
+
+
+def hash_file(path: str) -> str:
+    """
+    Returns the sha256 hex digest of a file
+    """
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class BlobStore:
+    """
+    Content-addressed store for published files.
+    Each distinct file is stored once under its hash, version folders hardlink to it.
+    """
+
+    def __init__(self, root: str):
+        self.root = root.replace("\\", "/")
+
+    @classmethod
+    def for_project(cls, project_root: str) -> BlobStore:
+        return cls(os.path.join(project_root, STORE_DIR))
+
+    def blob_path(self, digest: str) -> str:
+        return f"{self.root}/{digest[:2]}/{digest}"
+
+    def has(self, digest: str) -> bool:
+        return os.path.exists(self.blob_path(digest))
+
+    def put(self, source_path: str, digest: str | None = None) -> str:
+        """
+        Stores a file and returns its digest. Content already in the store is not copied again.
+        """
+        digest = digest or hash_file(source_path)
+        blob = self.blob_path(digest)
+        if os.path.exists(blob):
+            return digest
+
+        os.makedirs(os.path.dirname(blob), exist_ok=True)
+        tmp_path = f"{blob}.{socket.gethostname()}.{os.getpid()}.tmp"
+        shutil.copyfile(source_path, tmp_path)
+        # Blobs are shared by every version that links them, never edit in place
+        os.chmod(tmp_path, stat.S_IREAD | stat.S_IRGRP | stat.S_IROTH)
+        try:
+            os.replace(tmp_path, blob)
+        except OSError:
+            # Another publisher stored the same content first
+            with suppress(OSError):
+                os.remove(tmp_path)
+            if not os.path.exists(blob):
+                raise
+        return digest
+
+    def link(self, digest: str, dest_path: str) -> bool:
+        """
+        Places a blob at dest_path, as a hardlink when the filesystem allows it.
+        Returns False if it had to fall back to a copy.
+        """
+        os.makedirs(os.path.dirname(dest_path), exist_ok=True)
+        with suppress(FileNotFoundError):
+            os.remove(dest_path)
+        try:
+            os.link(self.blob_path(digest), dest_path)
+            return True
+        except OSError:
+            shutil.copyfile(self.blob_path(digest), dest_path)
+            return False
+
+
+def find_store(path: str) -> BlobStore | None:
+    """
+    Returns the store for a path: CONTENTHUB_BLOB_STORE if set, otherwise the
+    closest .contenthub/blobs folder in the path's parents
+    """
+    configured = os.environ.get('CONTENTHUB_BLOB_STORE')
+    if configured:
+        return BlobStore(configured)
+
+    current = os.path.abspath(path)
+    while True:
+        candidate = os.path.join(current, STORE_DIR)
+        if os.path.isdir(candidate):
+            return BlobStore(candidate)
+        parent = os.path.dirname(current)
+        if parent == current:
+            return None
+        current = parent
+
+
+def publish_files(files: dict[str, str], asset_path: str, version_folder: str,
+                  store: BlobStore | None = None) -> dict[str, dict[str, Any]]:
+    """
+    Publishes local files into a version folder and returns the metadata 'files' dict.
+    With a store, each file is uploaded only if its content is new and the
+    version folder links to the blob. Without one, files are copied as before.
+    """
+    published = {}
+    for key, source_path in files.items():
+        relative = f"{version_folder}/{os.path.basename(source_path)}"
+        dest_path = os.path.join(asset_path, relative)
+        digest = hash_file(source_path)
+        if store is not None:
+            store.put(source_path, digest)
+            store.link(digest, dest_path)
+        elif os.path.normcase(os.path.abspath(source_path)) != os.path.normcase(os.path.abspath(dest_path)):
+            os.makedirs(os.path.dirname(dest_path), exist_ok=True)
+            shutil.copyfile(source_path, dest_path)
+        published[key] = {'path': relative, 'hash': digest, 'size': os.path.getsize(source_path)}
+    return published
+
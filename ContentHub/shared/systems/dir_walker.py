@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+from typing import Any, Callable, Iterable, Iterator, NamedTuple
+
+import os
+import threading
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+
+from shared.systems import tracing
+
+
+# Listing a folder on a network share is one round trip of mostly waiting, and
+# scandir releases the GIL while it waits, so many more threads than cores pay off
+DEFAULT_WORKERS = int(os.environ.get('CONTENTHUB_WALK_WORKERS', 16))
+
+_executor: ThreadPoolExecutor | None = None
+_executor_lock = threading.Lock()
+
+
+class DirListing(NamedTuple):
+    path: str
+    # Sub folders, without hidden ones such as .contenthub
+    dirs: list[os.DirEntry]
+    files: list[os.DirEntry]
+    error: OSError | None = None
+
+    def file(self, name: str) -> os.DirEntry | None:
+        for entry in self.files:
+            if entry.name == name:
+                return entry
+        return None
+
+
+def get_executor() -> ThreadPoolExecutor:
+    """
+    Returns the pool shared by every walk, so concurrent walks stay within DEFAULT_WORKERS threads
+    """
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=DEFAULT_WORKERS, thread_name_prefix='dir_walker')
+        return _executor
+
+
+def list_dir(path: str) -> DirListing:
+    """
+    Lists one folder with a single scandir.
+    The entries keep the type scandir reported, so is_dir/is_file cost no further stat.
+    """
+    dirs, files = [], []
+    with tracing.span('walk.list_dir'):
+        try:
+            with os.scandir(path) as entries:
+                for entry in entries:
+                    if entry.is_dir():
+                        if not entry.name.startswith('.'):
+                            dirs.append(entry)
+                    else:
+                        files.append(entry)
+        except OSError as e:
+            return DirListing(path, [], [], e)
+    return DirListing(path, dirs, files)
+
+
+def walk(roots: str | Iterable[str], descend: Callable[[DirListing], bool] | None = None,
+         workers: int | None = None, should_cancel: Callable[[], bool] | None = None) -> Iterator[DirListing]:
+    """
+    Lists the roots and every folder below them, up to workers folders at a time.
+    Listings are yielded as they arrive, so not in tree order. descend decides
+    whether the sub folders of a listing are visited, by default all are.
+    Closing the generator or should_cancel returning True drops what is still queued.
+    """
+    if isinstance(roots, str):
+        roots = [roots]
+    executor = get_executor()
+    limit = workers or DEFAULT_WORKERS
+    queued: deque[str] = deque(roots)
+    running: set[Future] = set()
+    try:
+        while queued or running:
+            if should_cancel and should_cancel():
+                return
+            while queued and len(running) < limit:
+                running.add(executor.submit(list_dir, queued.popleft()))
+            done, running = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                listing = future.result()
+                if descend is None or descend(listing):
+                    queued.extend(entry.path for entry in listing.dirs)
+                yield listing
+    finally:
+        for future in running:
+            future.cancel()
+
+
+def map_paths(function: Callable[[Any], Any], items: Iterable[Any]) -> list[Any]:
+    """
+    Runs a blocking filesystem function over the items on the shared pool, results in item order
+    """
+    return list(get_executor().map(function, items))
@@ -0,0 +1,245 @@
+from __future__ import annotations
+
+import os
+
+try:
+    from PySide2 import QtCore
+except:
+    from PySide6 import QtCore
+
+
+class _PollSignals(QtCore.QObject):
+    finished = QtCore.Signal(object)
+    scanned = QtCore.Signal(str, object)
+
+
+class _PollTask(QtCore.QRunnable):
+    """
+    Stats watched directories off the GUI thread
+    """
+
+    def __init__(self, paths: list[str], signals: _PollSignals):
+        super().__init__()
+        self.paths = paths
+        self.signals = signals
+
+    def run(self):
+        mtimes = {}
+        for path in self.paths:
+            try:
+                mtimes[path] = os.stat(path).st_mtime
+            except OSError:
+                mtimes[path] = None
+        self.signals.finished.emit(mtimes)
+
+
+class _ScanTask(QtCore.QRunnable):
+    """
+    Lists the sub folders of a watched directory off the GUI thread, with their identity.
+    Reports None if the directory could not be listed.
+    """
+
+    def __init__(self, path: str, list_dirs: bool, signals: _PollSignals):
+        super().__init__()
+        self.path = path
+        self.list_dirs = list_dirs
+        self.signals = signals
+
+    def run(self):
+        try:
+            device = os.stat(self.path).st_dev
+            current = {}
+            if self.list_dirs:
+                with os.scandir(self.path) as entries:
+                    for entry in entries:
+                        if entry.is_dir() and not entry.name.startswith('.'):
+                            # A freed inode is handed to the next new folder, the mtime tells them apart.
+                            # Some shares report no inode, their renames are reported as remove and add.
+                            inode = entry.inode()
+                            current[entry.name] = (device, inode, entry.stat().st_mtime_ns) if inode else None
+        except OSError:
+            current = None
+        self.signals.scanned.emit(self.path, current)
+
+
+class FolderWatcher(QtCore.QObject):
+    """
+    Watches folders and reports which sub folders were added, removed or renamed.
+    Uses QFileSystemWatcher, with mtime polling as a fallback for network shares
+    where change notifications are unreliable. Bursts of events are coalesced.
+    Folders are listed on a background thread. A rename is only reported when the
+    new folder is the one that disappeared, by device, inode and modification time.
+    """
+
+    directory_changed = QtCore.Signal(str)
+    entries_added = QtCore.Signal(str, list)
+    entries_removed = QtCore.Signal(str, list)
+    entry_renamed = QtCore.Signal(str, str, str)
+
+    def __init__(self, mode: str | None = None, delay_ms: int = 200, poll_ms: int | None = None, parent=None):
+        super().__init__(parent)
+        self.mode = mode or os.environ.get('CONTENTHUB_WATCH_MODE', 'auto')
+        # Sub folder name -> (device, inode, mtime) per watched path, None when only change notifications
+        # are wanted. The identity is None until the folder has been listed in the background.
+        self._snapshots: dict[str, dict[str, tuple[int, int, int] | None] | None] = {}
+        self._mtimes: dict[str, float | None] = {}
+        self._pending: set[str] = set()
+        # Paths being listed, and those whose listing only records identities
+        self._scanning: set[str] = set()
+        self._capturing: set[str] = set()
+
+        self._native = None
+        if self.mode in ('auto', 'native'):
+            self._native = QtCore.QFileSystemWatcher(self)
+            self._native.directoryChanged.connect(self._on_changed)
+
+        self._timer = QtCore.QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(delay_ms)
+        self._timer.timeout.connect(self._flush)
+
+        # One thread, so listings of a path arrive in the order they were asked for
+        self._pool = QtCore.QThreadPool(self)
+        self._pool.setMaxThreadCount(1)
+        self._poll_signals = _PollSignals()
+        self._poll_signals.finished.connect(self._on_polled)
+        self._poll_signals.scanned.connect(self._on_scanned)
+
+        self._poll_timer = None
+        if self.mode in ('auto', 'poll'):
+            self._poll_timer = QtCore.QTimer(self)
+            self._poll_timer.setInterval(poll_ms or int(os.environ.get('CONTENTHUB_WATCH_POLL_MS', 5000)))
+            self._poll_timer.timeout.connect(self._poll)
+            self._poll_timer.start()
+
+    def watch(self, path: str, dir_names: list[str] | None = None):
+        """
+        Starts watching a folder.
+        Pass its current sub folder names to get added/removed/renamed reports.
+        """
+        path = _normalize(path)
+        if dir_names is not None:
+            self._snapshots[path] = dict.fromkeys(dir_names)
+            # Records the identities a later rename is confirmed against
+            self._capturing.add(path)
+            self._scan(path)
+        elif path in self._snapshots:
+            return
+        else:
+            self._snapshots[path] = None
+        self._mtimes.setdefault(path, None)
+        if self._native is not None and path not in self._native.directories():
+            self._native.addPath(path)
+
+    def unwatch(self, path: str, keep_snapshot: bool = True):
+        """
+        Stops watching a folder. Folders with a snapshot are kept unless keep_snapshot is False.
+        """
+        path = _normalize(path)
+        if keep_snapshot and self._snapshots.get(path) is not None:
+            return
+        self._snapshots.pop(path, None)
+        self._mtimes.pop(path, None)
+        self._pending.discard(path)
+        self._capturing.discard(path)
+        if self._native is not None:
+            self._native.removePath(path)
+
+    def unwatch_under(self, path: str):
+        """
+        Stops watching a folder and everything below it
+        """
+        path = _normalize(path)
+        prefix = path.rstrip('/') + '/'
+        for watched in [p for p in self._snapshots if p == path or p.startswith(prefix)]:
+            self.unwatch(watched, keep_snapshot=False)
+
+    def clear(self):
+        for path in list(self._snapshots):
+            self.unwatch(path, keep_snapshot=False)
+
+    def is_watched(self, path: str) -> bool:
+        return _normalize(path) in self._snapshots
+
+    def sync(self, path: str):
+        """
+        Diffs a watched folder without waiting for a notification, e.g. after this process changed it
+        """
+        path = _normalize(path)
+        self._pending.discard(path)
+        if path in self._snapshots:
+            self._scan(path)
+
+    def _on_changed(self, path: str):
+        self._pending.add(_normalize(path))
+        self._timer.start()
+
+    def _poll(self):
+        if self._snapshots:
+            self._pool.start(_PollTask(list(self._snapshots), self._poll_signals))
+
+    def _on_polled(self, mtimes: dict[str, float | None]):
+        for path, mtime in mtimes.items():
+            if path not in self._mtimes:
+                continue
+            known = self._mtimes[path]
+            self._mtimes[path] = mtime
+            if known is not None and known != mtime:
+                self._on_changed(path)
+
+    def _flush(self):
+        pending, self._pending = self._pending, set()
+        for path in sorted(pending, key=len):
+            if path in self._snapshots:
+                self._scan(path)
+
+    def _scan(self, path: str):
+        if path in self._scanning:
+            # Listed again once the running listing is in
+            self._pending.add(path)
+            return
+        self._scanning.add(path)
+        self._pool.start(_ScanTask(path, self._snapshots[path] is not None, self._poll_signals))
+
+    def _on_scanned(self, path: str, current: dict[str, tuple[int, int, int] | None] | None):
+        self._scanning.discard(path)
+        if path in self._pending:
+            self._timer.start()
+        if path not in self._snapshots:
+            return
+        capturing = path in self._capturing
+        self._capturing.discard(path)
+        if current is None:
+            # Unreadable for now, e.g. a share dropping out. Its sub folders are not known to be gone.
+            return
+
+        # Some platforms drop the native watch once a folder is replaced
+        if self._native is not None and path not in self._native.directories():
+            self._native.addPath(path)
+
+        known = self._snapshots[path]
+        if known is not None:
+            self._snapshots[path] = current
+            added = [name for name in sorted(current) if name not in known]
+            removed = [name for name in sorted(known) if name not in current]
+            new_names = {current[name]: name for name in added if current[name] is not None}
+            for old_name in list(removed):
+                new_name = new_names.pop(known[old_name], None) if known[old_name] is not None else None
+                if new_name is not None:
+                    removed.remove(old_name)
+                    added.remove(new_name)
+                    self.entry_renamed.emit(path, old_name, new_name)
+            if removed:
+                self.entries_removed.emit(path, removed)
+            if added:
+                self.entries_added.emit(path, added)
+            for name in set(known).difference(current):
+                self.unwatch_under(f"{path}/{name}")
+
+        # Only listed to learn the identities, nothing was reported as changed
+        if not capturing:
+            self.directory_changed.emit(path)
+
+
+def _normalize(path: str) -> str:
+    return os.path.normpath(path).replace("\\", "/")
@@ -0,0 +1,204 @@
+from __future__ import annotations
+
+from typing import Any
+
+import os
+import json
+import threading
+from collections import OrderedDict
+
+from shared.systems import tracing
+
+
+class VersionRecord:
+    """
+    One published version of an asset
+    """
+
+    __slots__ = ('version', 'files', 'author', 'date', 'thumbnail', 'extra')
+
+    def __init__(self, version: str, files: dict[str, Any], author: str, date: str, thumbnail: str,
+                 extra: dict[str, Any] | None = None):
+        self.version = version
+        self.files = files
+        self.author = author
+        self.date = date
+        self.thumbnail = thumbnail
+        self.extra = extra or {}
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> VersionRecord:
+        known = ('version', 'files', 'author', 'date', 'thumbnail')
+        return cls(
+            version=data.get('version', ''),
+            files=data.get('files', {}),
+            author=data.get('author', ''),
+            date=data.get('date', ''),
+            thumbnail=data.get('thumbnail', ''),
+            extra={k: v for k, v in data.items() if k not in known},
+        )
+
+    def file_path(self, key: str) -> str:
+        """
+        Returns the relative path of a published file, entries are either a path or a
+        {'path', 'hash', 'size'} dict
+        """
+        value = self.files.get(key, '')
+        return value if isinstance(value, str) else value.get('path', '')
+
+    def file_hash(self, key: str) -> str:
+        value = self.files.get(key, '')
+        return '' if isinstance(value, str) else value.get('hash', '')
+
+    def to_dict(self) -> dict[str, Any]:
+        data = {'version': self.version, 'files': self.files, 'author': self.author, 'date': self.date}
+        if self.thumbnail:
+            data['thumbnail'] = self.thumbnail
+        data.update(self.extra)
+        return data
+
+
+class AssetMetadata:
+    """
+    Parsed metadata.json of one asset, with O(1) version lookup
+    """
+
+    __slots__ = ('path', 'name', 'latest', 'versions', 'mtime', 'size', '_by_number')
+
+    def __init__(self, path: str, name: str, latest: str, versions: list[VersionRecord],
+                 mtime: float = 0.0, size: int = 0):
+        self.path = path
+        self.name = name
+        self.latest = latest
+        self.versions = versions
+        self.mtime = mtime
+        self.size = size
+        self._by_number = {version_number(v.version): v for v in versions}
+
+    @classmethod
+    def from_dict(cls, path: str, data: dict[str, Any], mtime: float = 0.0, size: int = 0) -> AssetMetadata:
+        return cls(
+            path=path,
+            name=data.get('name') or os.path.basename(os.path.dirname(path)),
+            latest=data.get('latest', ''),
+            versions=[VersionRecord.from_dict(v) for v in data.get('versions', [])],
+            mtime=mtime,
+            size=size,
+        )
+
+    @property
+    def asset_path(self) -> str:
+        return os.path.dirname(self.path).replace("\\", "/")
+
+    def version(self, version: str | int) -> VersionRecord | None:
+        return self._by_number.get(version_number(version))
+
+    def latest_version(self) -> VersionRecord | None:
+        return self.version(self.latest) if self.latest != '' else None
+
+    def thumbnail_path(self) -> str:
+        """
+        Returns the absolute thumbnail path of the latest version, or an empty string
+        """
+        latest = self.latest_version()
+        if not (latest and latest.thumbnail):
+            return ''
+        return os.path.join(self.asset_path, latest.thumbnail).replace("\\", "/")
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            'name': self.name,
+            'versions': [v.to_dict() for v in self.versions],
+            'latest': self.latest,
+        }
+
+
+def version_number(version: str | int) -> int:
+    """
+    Returns the number of a version given as 3, '3' or 'v003'
+    """
+    if isinstance(version, int):
+        return version
+    try:
+        return int(str(version).lstrip('v') or -1)
+    except ValueError:
+        return -1
+
+
+class MetadataStore:
+    """
+    Parses each metadata.json once and re-validates cached records by mtime and size
+    """
+
+    def __init__(self, max_entries: int = 4096):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: OrderedDict[str, AssetMetadata] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, metadata_path: str) -> AssetMetadata | None:
+        """
+        Returns the parsed metadata, or None if it is missing or invalid
+        """
+        metadata_path = metadata_path.replace("\\", "/")
+        try:
+            st = os.stat(metadata_path)
+        except OSError:
+            self.invalidate(metadata_path)
+            return None
+
+        with self._lock:
+            cached = self._entries.get(metadata_path)
+            if cached is not None and cached.mtime == st.st_mtime and cached.size == st.st_size:
+                self._entries.move_to_end(metadata_path)
+                self.hits += 1
+                return cached
+            self.misses += 1
+
+        with tracing.span('metadata.parse'):
+            try:
+                with open(metadata_path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+            except Exception as e:
+                print(f"Failed to parse metadata {metadata_path}: {e}")
+                return None
+
+            metadata = AssetMetadata.from_dict(metadata_path, data, st.st_mtime, st.st_size)
+        self.put(metadata)
+        return metadata
+
+    def put(self, metadata: AssetMetadata):
+        with self._lock:
+            self._entries[metadata.path] = metadata
+            self._entries.move_to_end(metadata.path)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, metadata_path: str | None = None):
+        with self._lock:
+            if metadata_path is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(metadata_path.replace("\\", "/"), None)
+
+    def stats(self) -> dict[str, int]:
+        return {'entries': len(self._entries), 'hits': self.hits, 'misses': self.misses, 'evictions': self.evictions}
+
+
+_store: MetadataStore | None = None
+
+
+def get_store() -> MetadataStore:
+    """
+    Returns the store shared by this session
+    """
+    global _store
+    if _store is None:
+        _store = MetadataStore()
+    return _store
@@ -0,0 +1,333 @@
+from __future__ import annotations
+
+from typing import Any
+
+import os
+import json
+import socket
+import threading
+
+from shared.systems import asset_index, metadata_store, version_journal
+
+
+MANIFEST_FILE = '.contenthub/manifest.json'
+SEGMENT_DIR = '.contenthub/manifest'
+FORMAT = 1
+
+# Project layout, maintained by every publish once a manifest exists:
+#   .contenthub/manifest.json         generation counter and one {generation, count} per segment
+#   .contenthub/manifest/<folder>.json every asset below one top-level folder of the project
+# A publish bumps the project generation and stamps it on the one segment it
+# touched, so clients re-read manifest.json and only the segments that moved.
+# Paths are relative to the project root, the share is mounted differently per client.
+
+
+def find_project_root(path: str) -> str | None:
+    """
+    Returns CONTENTHUB_PROJECT_ROOT if set, otherwise the closest folder at or
+    above the path. Either way only if it holds a manifest, projects opt in by building one.
+    """
+    configured = os.environ.get('CONTENTHUB_PROJECT_ROOT')
+    if configured:
+        return asset_index.normalize_path(configured) if os.path.isfile(os.path.join(configured, MANIFEST_FILE)) \
+            else None
+
+    current = os.path.abspath(path)
+    while True:
+        if os.path.isfile(os.path.join(current, MANIFEST_FILE)):
+            return asset_index.normalize_path(current)
+        parent = os.path.dirname(current)
+        if parent == current:
+            return None
+        current = parent
+
+
+def update_asset(asset_path: str, head: dict[str, Any] | None = None) -> bool:
+    """
+    Records the latest state of one asset in its project's manifest.
+    Called after every publish, does nothing for projects without a manifest.
+    """
+    asset_path = asset_index.normalize_path(asset_path)
+    project_root = find_project_root(os.path.dirname(asset_path))
+    if project_root is None:
+        return False
+    relative = _relative(project_root, asset_path)
+    if not relative:
+        return False
+
+    head = head or version_journal.read_head(asset_path)
+    entry = _entry(asset_path, head) if head else None
+    with version_journal.publish_lock(os.path.join(project_root, SEGMENT_DIR)):
+        manifest = _read_json(os.path.join(project_root, MANIFEST_FILE)) or _new_manifest()
+        name = relative.split('/', 1)[0]
+        segment = _read_json(_segment_path(project_root, name)) or {'assets': {}}
+        if entry is None:
+            segment['assets'].pop(relative, None)
+        else:
+            segment['assets'][relative] = entry
+        _commit(project_root, manifest, {name: segment})
+    return True
+
+
+def move_folder(old_path: str, new_path: str | None) -> bool:
+    """
+    Moves the entries of every asset at or below a renamed folder, drops them
+    without a new path or when it is outside the project.
+    Does nothing for projects without a manifest, or when no entry was below the folder.
+    """
+    old_path = asset_index.normalize_path(old_path)
+    project_root = find_project_root(os.path.dirname(old_path))
+    if project_root is None:
+        return False
+    old_relative = _relative(project_root, old_path)
+    if not old_relative:
+        return False
+    new_relative = _relative(project_root, new_path) if new_path else None
+
+    prefix = old_relative + '/'
+    with version_journal.publish_lock(os.path.join(project_root, SEGMENT_DIR)):
+        manifest = _read_json(os.path.join(project_root, MANIFEST_FILE)) or _new_manifest()
+        name = old_relative.split('/', 1)[0]
+        segments = {name: _read_json(_segment_path(project_root, name)) or {'assets': {}}}
+        moved = {relative: entry for relative, entry in segments[name]['assets'].items()
+                 if relative == old_relative or relative.startswith(prefix)}
+        if not moved:
+            # Already moved, e.g. by the client that did the rename
+            return False
+        for relative in moved:
+            del segments[name]['assets'][relative]
+        if new_relative:
+            # Renaming a top-level folder moves its assets to another segment
+            new_name = new_relative.split('/', 1)[0]
+            if new_name not in segments:
+                segments[new_name] = _read_json(_segment_path(project_root, new_name)) or {'assets': {}}
+            for relative, entry in moved.items():
+                segments[new_name]['assets'][new_relative + relative[len(old_relative):]] = entry
+        _commit(project_root, manifest, segments)
+    return True
+
+
+def remove_folder(path: str) -> bool:
+    """
+    Drops the entries of every asset at or below a deleted folder
+    """
+    return move_folder(path, None)
+
+
+def build_manifest(project_root: str) -> dict[str, Any]:
+    """
+    Writes the manifest from scratch, from a walk of the whole project
+    """
+    project_root = asset_index.normalize_path(project_root)
+    segments: dict[str, dict[str, Any]] = {}
+    index = asset_index.AssetIndex(':memory:')
+    try:
+        for record in index.assets_under(project_root):
+            relative = _relative(project_root, record.path)
+            if not relative:
+                continue
+            segment = segments.setdefault(relative.split('/', 1)[0], {'assets': {}})
+            segment['assets'][relative] = _record_entry(record)
+    finally:
+        index.close()
+
+    os.makedirs(os.path.join(project_root, SEGMENT_DIR), exist_ok=True)
+    with version_journal.publish_lock(os.path.join(project_root, SEGMENT_DIR)):
+        manifest = _read_json(os.path.join(project_root, MANIFEST_FILE)) or _new_manifest()
+        # Segments of folders that are gone are dropped with the rest
+        for name in set(manifest['segments']).difference(segments):
+            segments[name] = {'assets': {}}
+        return _commit(project_root, manifest, segments)
+
+
+class ManifestReader:
+    """
+    Client side of a project manifest.
+    refresh() is one read of manifest.json, segments are read on first use and
+    again only after their generation changed.
+    """
+
+    def __init__(self, project_root: str):
+        self.project_root = asset_index.normalize_path(project_root)
+        self.generation = -1
+        self._table: dict[str, dict[str, int]] = {}
+        self._segments: dict[str, list[asset_index.AssetRecord]] = {}
+        self._lock = threading.RLock()
+
+    def refresh(self) -> list[str]:
+        """
+        Re-reads manifest.json, returns the segments that changed since the last refresh
+        """
+        manifest = _read_json(os.path.join(self.project_root, MANIFEST_FILE))
+        if manifest is None:
+            return []
+        with self._lock:
+            if manifest['generation'] == self.generation:
+                return []
+            table = manifest['segments']
+            changed = sorted(name for name in set(table) | set(self._table)
+                             if table.get(name, {}).get('generation') != self._table.get(name, {}).get('generation'))
+            for name in changed:
+                self._segments.pop(name, None)
+            self._table = table
+            self.generation = manifest['generation']
+        return changed
+
+    def segments(self) -> list[str]:
+        with self._lock:
+            return sorted(name for name, info in self._table.items() if info.get('count'))
+
+    def segment(self, name: str) -> list[asset_index.AssetRecord]:
+        """
+        Returns the records of one top-level folder, sorted by path
+        """
+        with self._lock:
+            records = self._segments.get(name)
+            if records is not None:
+                return records
+            if name not in self._table:
+                return []
+        data = _read_json(_segment_path(self.project_root, name)) or {'assets': {}}
+        records = sorted(self._record(relative, entry) for relative, entry in data['assets'].items())
+        with self._lock:
+            if name in self._table:
+                self._segments[name] = records
+        return records
+
+    def records_under(self, path: str, refresh: bool = True) -> list[asset_index.AssetRecord]:
+        """
+        Returns every asset at or below the path, sorted by path
+        """
+        if refresh:
+            self.refresh()
+        path = asset_index.normalize_path(path)
+        relative = _relative(self.project_root, path)
+        if relative is None:
+            return []
+        if not relative:
+            return [record for name in self.segments() for record in self.segment(name)]
+        prefix = path.rstrip('/') + '/'
+        return [record for record in self.segment(relative.split('/', 1)[0])
+                if record.path == path or record.path.startswith(prefix)]
+
+    def child_folders(self, path: str) -> list[str] | None:
+        """
+        Returns the names of the folders below path that lead to assets,
+        none for an asset itself, None if the path is outside the project
+        """
+        path = asset_index.normalize_path(path)
+        relative = _relative(self.project_root, path)
+        if relative is None:
+            return None
+        if not relative:
+            return self.segments()
+        names = set()
+        prefix = path.rstrip('/') + '/'
+        for record in self.records_under(path, refresh=False):
+            if record.path == path:
+                return []
+            names.add(record.path[len(prefix):].split('/', 1)[0])
+        return sorted(names)
+
+    def _record(self, relative: str, entry: list[Any]) -> asset_index.AssetRecord:
+        name, latest, author, date, thumbnail, tags, mtime = entry
+        path = f"{self.project_root}/{relative}"
+        return asset_index.AssetRecord(path, name, latest, author, date, f"{path}/{thumbnail}" if thumbnail else '',
+                                       mtime, tags)
+
+
+_readers: dict[str, ManifestReader] = {}
+_readers_lock = threading.Lock()
+
+
+def get_reader(path: str) -> ManifestReader | None:
+    """
+    Returns the session's reader for the project holding the path, None without a manifest
+    """
+    project_root = find_project_root(path)
+    if project_root is None:
+        return None
+    with _readers_lock:
+        reader = _readers.get(project_root)
+        if reader is None:
+            reader = _readers[project_root] = ManifestReader(project_root)
+    return reader
+
+
+def _entry(asset_path: str, head: dict[str, Any]) -> list[Any] | None:
+    metadata_path = os.path.join(asset_path, version_journal.HEAD_FILE)
+    try:
+        mtime = os.stat(metadata_path).st_mtime
+    except OSError:
+        return None
+    metadata = metadata_store.AssetMetadata.from_dict(metadata_path, head, mtime)
+    fields = asset_index.metadata_record(metadata)
+    return _record_entry(asset_index.AssetRecord(asset_path, mtime=mtime, **fields))
+
+
+def _record_entry(record: asset_index.AssetRecord) -> list[Any]:
+    thumbnail = record.thumbnail
+    if thumbnail.startswith(record.path + '/'):
+        thumbnail = thumbnail[len(record.path) + 1:]
+    return [record.name, record.latest, record.author, record.date, thumbnail, record.tags, record.mtime]
+
+
+def _commit(project_root: str, manifest: dict[str, Any], segments: dict[str, dict[str, Any]]) -> dict[str, Any]:
+    # Segments first, so a reader that sees the new manifest always finds them
+    generation = manifest['generation'] + 1
+    for name, segment in segments.items():
+        segment['generation'] = generation
+        _write_json(_segment_path(project_root, name), segment)
+        manifest['segments'][name] = {'generation': generation, 'count': len(segment['assets'])}
+    manifest['generation'] = generation
+    _write_json(os.path.join(project_root, MANIFEST_FILE), manifest)
+    return manifest
+
+
+def _new_manifest() -> dict[str, Any]:
+    return {'format': FORMAT, 'generation': 0, 'segments': {}}
+
+
+def _segment_path(project_root: str, name: str) -> str:
+    return os.path.join(project_root, SEGMENT_DIR, f"{name}.json")
+
+
+def _relative(project_root: str, path: str) -> str | None:
+    path = asset_index.normalize_path(path)
+    if path == project_root:
+        return ''
+    if not path.startswith(project_root.rstrip('/') + '/'):
+        return None
+    return path[len(project_root.rstrip('/')) + 1:]
+
+
+def _read_json(path: str) -> dict[str, Any] | None:
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return None
+
+
+def _write_json(path: str, data: dict[str, Any]):
+    # Compact, every client reads these. Atomic like the asset heads.
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{socket.gethostname()}.{os.getpid()}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, separators=(',', ':'), ensure_ascii=False)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+if __name__ == '__main__':
+    # Opting a project in: python -m shared.systems.project_manifest <project_root>
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Build the project manifest that publishes keep up to date")
+    parser.add_argument('project_root')
+    args = parser.parse_args()
+
+    result = build_manifest(args.project_root)
+    print(f"Generation {result['generation']}, {sum(s['count'] for s in result['segments'].values())} assets "
+          f"in {len(result['segments'])} segments")
@@ -0,0 +1,201 @@
+from __future__ import annotations
+
+from typing import Iterable
+
+import re
+import bisect
+from functools import lru_cache
+
+from shared.systems.asset_index import AssetRecord
+
+
+# Prefixes up to this length get their own posting sets, the short ones match the
+# most tokens and would otherwise need the largest unions while typing
+PREFIX_DEPTH = 3
+
+_WORD = re.compile(r'[A-Z]+(?![a-z])|[A-Z]?[a-z]+|\d+')
+_TERM = re.compile(r'[^\W_]+')
+
+
+@lru_cache(maxsize=65536)
+def tokenize(text: str) -> frozenset[str]:
+    """
+    Splits text into lower case tokens, 'OakTree_02' gives oaktree, oak, tree and 02.
+    Folder names, authors and tags repeat across assets, hence the cache.
+    """
+    tokens = set()
+    for chunk in _TERM.findall(text):
+        tokens.add(chunk.lower())
+        tokens.update(word.lower() for word in _WORD.findall(chunk))
+    return frozenset(tokens)
+
+
+@lru_cache(maxsize=65536)
+def _short_prefixes(token: str) -> tuple[str, ...]:
+    return tuple(token[:length] for length in range(1, min(len(token), PREFIX_DEPTH) + 1))
+
+
+def query_terms(query: str) -> list[str]:
+    return [term.lower() for term in _TERM.findall(query)]
+
+
+class SearchIndex:
+    """
+    In-memory inverted prefix index over asset records.
+    Covers name, folder names below the root, author and tags. Queries never touch
+    the filesystem, every term of a query must prefix-match a token of the asset.
+    """
+
+    def __init__(self, root_path: str = ''):
+        self.root_path = root_path.rstrip('/')
+        self._records: dict[int, AssetRecord] = {}
+        self._ids: dict[str, int] = {}
+        self._tokens: dict[int, set[str]] = {}
+        self._postings: dict[str, set[int]] = {}
+        self._prefixes: dict[str, set[int]] = {}
+        self._vocabulary: list[str] = []
+        self._vocabulary_dirty = True
+        self._next_id = 0
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def __contains__(self, path: str) -> bool:
+        return path in self._ids
+
+    def clear(self, root_path: str | None = None):
+        if root_path is not None:
+            self.root_path = root_path.rstrip('/')
+        self._records.clear()
+        self._ids.clear()
+        self._tokens.clear()
+        self._postings.clear()
+        self._prefixes.clear()
+        self._vocabulary = []
+        self._vocabulary_dirty = True
+        self._next_id = 0
+
+    def records(self) -> list[AssetRecord]:
+        """
+        Returns every indexed record in the order they were added
+        """
+        return list(self._records.values())
+
+    def add(self, records: Iterable[AssetRecord]):
+        """
+        Adds records, replacing any already indexed under the same path
+        """
+        for record in records:
+            doc_id = self._ids.get(record.path)
+            if doc_id is not None:
+                if self._records[doc_id] == record:
+                    continue
+                # Keep the id, and with it the position in results
+                self._unindex(doc_id)
+            else:
+                doc_id = self._next_id
+                self._next_id += 1
+                self._ids[record.path] = doc_id
+            self._records[doc_id] = record
+            self._index(doc_id, self._record_tokens(record))
+
+    def remove(self, path: str):
+        doc_id = self._ids.pop(path, None)
+        if doc_id is not None:
+            self._unindex(doc_id)
+            del self._records[doc_id]
+
+    def replace_under(self, path: str, records: list[AssetRecord]):
+        """
+        Replaces the records at or below a folder with a fresh set, as reported by a rescan
+        """
+        fresh = {record.path for record in records}
+        prefix = path.rstrip('/') + '/'
+        for indexed in [p for p in self._ids if (p == path or p.startswith(prefix)) and p not in fresh]:
+            self.remove(indexed)
+        self.add(records)
+
+    def search(self, query: str, limit: int | None = None) -> list[AssetRecord]:
+        """
+        Returns the records matching every term of the query, in the order they were added
+        """
+        terms = query_terms(query)
+        if not terms:
+            return self.records()[:limit]
+
+        matches = None
+        # Longest terms first, they tend to match the fewest assets
+        for term in sorted(set(terms), key=len, reverse=True):
+            found = self._prefix_matches(term)
+            matches = found if matches is None else matches & found
+            if not matches:
+                return []
+        return [self._records[doc_id] for doc_id in sorted(matches)[:limit]]
+
+    def matches(self, record: AssetRecord, query: str) -> bool:
+        """
+        Checks a single record against a query, without looking at the index
+        """
+        tokens = self._record_tokens(record)
+        return all(any(token.startswith(term) for token in tokens) for term in query_terms(query))
+
+    def _prefix_matches(self, term: str) -> set[int]:
+        if len(term) <= PREFIX_DEPTH:
+            return self._prefixes.get(term, set())
+
+        vocabulary = self._sorted_vocabulary()
+        found = set()
+        start = bisect.bisect_left(vocabulary, term)
+        for token in vocabulary[start:bisect.bisect_left(vocabulary, term + '\uffff', start)]:
+            found |= self._postings[token]
+        return found
+
+    def _sorted_vocabulary(self) -> list[str]:
+        if self._vocabulary_dirty:
+            self._vocabulary = sorted(self._postings)
+            self._vocabulary_dirty = False
+        return self._vocabulary
+
+    def _vocabulary_add(self, token: str):
+        # Small updates keep the sorted list valid, bulk loads sort once on the next query
+        if not self._vocabulary_dirty:
+            bisect.insort(self._vocabulary, token)
+
+    def _vocabulary_remove(self, token: str):
+        if not self._vocabulary_dirty:
+            del self._vocabulary[bisect.bisect_left(self._vocabulary, token)]
+
+    def _record_tokens(self, record: AssetRecord) -> set[str]:
+        tokens = set(tokenize(record.name)) | tokenize(record.author)
+        for tag in record.tags.split(','):
+            tokens |= tokenize(tag)
+        relative = record.path[len(self.root_path):] if record.path.startswith(self.root_path) else record.path
+        for segment in relative.split('/'):
+            tokens |= tokenize(segment)
+        return tokens
+
+    def _index(self, doc_id: int, tokens: set[str]):
+        self._tokens[doc_id] = tokens
+        for token in tokens:
+            posting = self._postings.get(token)
+            if posting is None:
+                posting = self._postings[token] = set()
+                self._vocabulary_add(token)
+            posting.add(doc_id)
+            for prefix in _short_prefixes(token):
+                self._prefixes.setdefault(prefix, set()).add(doc_id)
+
+    def _unindex(self, doc_id: int):
+        tokens = self._tokens.pop(doc_id, set())
+        for token in tokens:
+            posting = self._postings[token]
+            posting.discard(doc_id)
+            if not posting:
+                del self._postings[token]
+                self._vocabulary_remove(token)
+        for prefix in {prefix for token in tokens for prefix in _short_prefixes(token)}:
+            posting = self._prefixes.get(prefix)
+            if posting is not None:
+                posting.discard(doc_id)
+                if not posting:
+                    del self._prefixes[prefix]
@@ -0,0 +1,188 @@
+from __future__ import annotations
+
+from typing import Any, Callable
+
+import os
+import json
+import time
+import atexit
+import functools
+import threading
+from collections import deque
+
+
+MAX_EVENTS = 200000
+
+# Tracing is off unless CONTENTHUB_TRACE is set, or CONTENTHUB_TRACE_FILE which
+# also writes the trace there when the process exits
+_enabled = bool(os.environ.get('CONTENTHUB_TRACE') or os.environ.get('CONTENTHUB_TRACE_FILE'))
+_epoch = time.perf_counter()
+_lock = threading.Lock()
+# (name, start, end, thread id, args) per finished span
+_events: deque[tuple[str, float, float, int, dict[str, Any] | None]] = deque(maxlen=MAX_EVENTS)
+_thread_names: dict[int, str] = {}
+_operation: Operation | None = None
+
+
+class Operation:
+    """
+    Per-phase totals of one user action, e.g. populating the grid.
+    Spans from every thread count towards the latest operation until the next one begins.
+    Phases can nest, so their totals may add up to more than the duration.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.start = time.perf_counter()
+        self.end = self.start
+        self.totals: dict[str, list[float]] = {}
+
+    def add(self, name: str, seconds: float, end: float):
+        total = self.totals.get(name)
+        if total is None:
+            self.totals[name] = [seconds, 1]
+        else:
+            total[0] += seconds
+            total[1] += 1
+        self.end = max(self.end, end)
+
+    @property
+    def duration(self) -> float:
+        return self.end - self.start
+
+    def phases(self) -> list[tuple[str, float, int]]:
+        """
+        Returns (phase, total seconds, count), slowest first
+        """
+        with _lock:
+            items = [(name, total, int(count)) for name, (total, count) in self.totals.items()]
+        return sorted(items, key=lambda item: item[1], reverse=True)
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    __slots__ = ('name', 'args', 'start')
+
+    def __init__(self, name: str, args: dict[str, Any] | None):
+        self.name = name
+        self.args = args
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *args):
+        _record(self.name, self.start, time.perf_counter(), self.args)
+        return False
+
+
+def is_enabled() -> bool:
+    return _enabled
+
+
+def enable(enabled: bool = True):
+    global _enabled
+    _enabled = enabled
+
+
+def span(name: str, **args):
+    """
+    Times a block: with tracing.span('metadata.parse', path=path): ...
+    Costs one global lookup when tracing is disabled.
+    """
+    if not _enabled:
+        return _NULL_SPAN
+    return _Span(name, args or None)
+
+
+def traced(name: str | None = None) -> Callable:
+    """
+    Decorator form of span, named after the function unless a name is given
+    """
+    def decorate(function: Callable) -> Callable:
+        span_name = name or function.__qualname__
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return function(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                _record(span_name, start, time.perf_counter(), None)
+        return wrapper
+    return decorate
+
+
+def begin_operation(name: str) -> Operation | None:
+    """
+    Starts collecting per-phase totals for a new user action
+    """
+    global _operation
+    if not _enabled:
+        return None
+    with _lock:
+        _operation = Operation(name)
+    return _operation
+
+
+def last_operation() -> Operation | None:
+    return _operation
+
+
+def clear():
+    global _operation
+    with _lock:
+        _events.clear()
+        _operation = None
+
+
+def export_chrome_trace(path: str) -> str:
+    """
+    Writes the recorded spans as Chrome trace-event JSON, for chrome://tracing or Perfetto
+    """
+    pid = os.getpid()
+    with _lock:
+        events = list(_events)
+        thread_names = dict(_thread_names)
+
+    trace = [{'name': 'thread_name', 'ph': 'M', 'pid': pid, 'tid': tid, 'args': {'name': thread_name}}
+             for tid, thread_name in thread_names.items()]
+    for name, start, end, tid, args in events:
+        event = {'name': name, 'cat': name.split('.', 1)[0], 'ph': 'X', 'pid': pid, 'tid': tid,
+                 'ts': (start - _epoch) * 1e6, 'dur': (end - start) * 1e6}
+        if args:
+            event['args'] = args
+        trace.append(event)
+
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({'traceEvents': trace, 'displayTimeUnit': 'ms'}, f, default=str)
+    return path
+
+
+def _record(name: str, start: float, end: float, args: dict[str, Any] | None):
+    tid = threading.get_ident()
+    with _lock:
+        if tid not in _thread_names:
+            _thread_names[tid] = threading.current_thread().name
+        _events.append((name, start, end, tid, args))
+        if _operation is not None and end >= _operation.start:
+            _operation.add(name, end - start, end)
+
+
+if os.environ.get('CONTENTHUB_TRACE_FILE'):
+    atexit.register(export_chrome_trace, os.environ['CONTENTHUB_TRACE_FILE'])
@@ -0,0 +1,216 @@
+from __future__ import annotations
+
+from typing import Any, Iterator
+
+import os
+import json
+import time
+import socket
+from contextlib import contextmanager, suppress
+
+from shared.systems.metadata_store import version_number
+
+
+HEAD_FILE = 'metadata.json'
+JOURNAL_FILE = 'versions.jsonl'
+VERSION_FILE = 'version.json'
+LOCK_FILE = '.publish.lock'
+
+# Asset folder layout:
+#   metadata.json       small head: name, latest, the latest entry and the next free version
+#   versions.jsonl      append-only journal, one version entry per line
+#   v_###/version.json  entry of that version, its existence marks the version as published
+# The head keeps a one-element 'versions' list, so readers that only look for
+# the latest version keep working without ever loading the journal.
+
+
+@contextmanager
+def publish_lock(asset_path: str, timeout: float = 30.0, stale_after: float = 120.0) -> Iterator[None]:
+    """
+    Exclusive lock on an asset folder. Uses an O_EXCL lock file, which also works on SMB shares.
+    """
+    lock_path = os.path.join(asset_path, LOCK_FILE)
+    os.makedirs(asset_path, exist_ok=True)
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            fd = os.open(lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+            break
+        except FileExistsError:
+            with suppress(OSError):
+                if time.time() - os.stat(lock_path).st_mtime > stale_after:
+                    # The holder died without cleaning up
+                    os.remove(lock_path)
+                    continue
+            if time.monotonic() > deadline:
+                raise TimeoutError(f"Timed out waiting for the publish lock on {asset_path}")
+            time.sleep(0.05)
+
+    try:
+        os.write(fd, f"{socket.gethostname()}:{os.getpid()}".encode('utf-8'))
+        os.close(fd)
+        yield
+    finally:
+        with suppress(OSError):
+            os.remove(lock_path)
+
+
+def version_folder(version: str | int) -> str:
+    return f"v_{version_number(version):03d}"
+
+
+def read_head(asset_path: str) -> dict[str, Any] | None:
+    head_path = os.path.join(asset_path, HEAD_FILE)
+    try:
+        with open(head_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+def read_version(asset_path: str, version: str | int) -> dict[str, Any] | None:
+    """
+    Returns the entry of one published version without touching the journal
+    """
+    try:
+        with open(os.path.join(asset_path, version_folder(version), VERSION_FILE), 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return None
+
+
+def read_versions(asset_path: str) -> list[dict[str, Any]]:
+    """
+    Returns the full version history, oldest first
+    """
+    head = read_head(asset_path) or {}
+    if 'journal' not in head:
+        return list(head.get('versions', []))
+
+    return _read_journal(os.path.join(asset_path, head['journal']))
+
+
+def allocate_version(asset_path: str, name: str = '') -> int:
+    """
+    Reserves the next version number of the asset
+    """
+    with publish_lock(asset_path):
+        head = _upgrade(asset_path, read_head(asset_path), name)
+        version = head['next_version']
+        head['next_version'] = version + 1
+        _write_head(asset_path, head)
+    return version
+
+
+def append_version(asset_path: str, name: str, entry: dict[str, Any]) -> dict[str, Any]:
+    """
+    Publishes one version: appends it to the journal and swaps in a new head.
+    Raises ValueError if the version was already published.
+    """
+    number = version_number(entry['version'])
+    with publish_lock(asset_path):
+        if read_version(asset_path, number) is not None:
+            raise ValueError(f"Version {entry['version']} already exists for asset '{name}'.")
+
+        head = _upgrade(asset_path, read_head(asset_path), name)
+        _write_json(os.path.join(asset_path, version_folder(number), VERSION_FILE), entry)
+        with open(os.path.join(asset_path, JOURNAL_FILE), 'a', encoding='utf-8') as f:
+            f.write(json.dumps(entry, ensure_ascii=False) + '\n')
+            f.flush()
+            os.fsync(f.fileno())
+
+        head['count'] = head.get('count', 0) + 1
+        head['next_version'] = max(head['next_version'], number + 1)
+        if number >= version_number(head.get('latest', '')):
+            head['latest'] = entry['version']
+            head['versions'] = [entry]
+        _write_head(asset_path, head)
+    return head
+
+
+def update_version(asset_path: str, version: str | int, changes: dict[str, Any]) -> dict[str, Any] | None:
+    """
+    Updates fields of an already published version, e.g. a regenerated thumbnail.
+    The journal is left untouched, version.json and the head are rewritten atomically.
+    """
+    with publish_lock(asset_path):
+        head = read_head(asset_path)
+        if head is None:
+            return None
+        if 'journal' not in head:
+            head = _upgrade(asset_path, head, '')
+            _write_head(asset_path, head)
+        entry = read_version(asset_path, version)
+        if entry is None:
+            return None
+
+        entry.update(changes)
+        _write_json(os.path.join(asset_path, version_folder(version), VERSION_FILE), entry)
+        if version_number(head.get('latest', '')) == version_number(version):
+            head['versions'] = [entry]
+            _write_head(asset_path, head)
+    return entry
+
+
+def _upgrade(asset_path: str, head: dict[str, Any] | None, name: str) -> dict[str, Any]:
+    """
+    Returns a journal-format head, moving a legacy full metadata.json into the journal once
+    """
+    if head is None:
+        return {'name': name or os.path.basename(os.path.normpath(asset_path)), 'latest': '', 'versions': [],
+                'journal': JOURNAL_FILE, 'next_version': 1, 'count': 0}
+    if 'journal' in head:
+        return head
+
+    legacy = head.get('versions', [])
+    journal_path = os.path.join(asset_path, JOURNAL_FILE)
+    # An upgrade that died before the head was swapped already wrote some of them
+    journaled = {version_number(entry.get('version', '')) for entry in _read_journal(journal_path)}
+    with open(journal_path, 'a', encoding='utf-8') as f:
+        for entry in legacy:
+            if version_number(entry.get('version', '')) not in journaled:
+                f.write(json.dumps(entry, ensure_ascii=False) + '\n')
+            entry_path = os.path.join(asset_path, version_folder(entry.get('version', '')), VERSION_FILE)
+            if not os.path.exists(entry_path):
+                _write_json(entry_path, entry)
+        f.flush()
+        os.fsync(f.fileno())
+
+    latest = [v for v in legacy if v.get('version') == head.get('latest')]
+    numbers = [version_number(v.get('version', '')) for v in legacy]
+    return {'name': head.get('name') or name, 'latest': head.get('latest', ''), 'versions': latest,
+            'journal': JOURNAL_FILE, 'next_version': max(numbers, default=0) + 1, 'count': len(legacy)}
+
+
+def _read_journal(journal_path: str) -> list[dict[str, Any]]:
+    versions = []
+    try:
+        with open(journal_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    versions.append(json.loads(line))
+                except ValueError:
+                    # A writer died mid-line, the entry is also missing from the head
+                    continue
+    except FileNotFoundError:
+        pass
+    return versions
+
+
+def _write_head(asset_path: str, head: dict[str, Any]):
+    _write_json(os.path.join(asset_path, HEAD_FILE), head)
+
+
+def _write_json(path: str, data: dict[str, Any]):
+    """
+    Writes through a temp file and an atomic rename, readers never see a partial file
+    """
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{socket.gethostname()}.{os.getpid()}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=4, ensure_ascii=False)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+import os
+import time
+
+try:
+    from PySide2 import QtCore, QtWidgets
+except:
+    from PySide6 import QtCore, QtWidgets
+
+from shared.systems import tracing
+
+
+class TracePanel(QtWidgets.QWidget):
+    """
+    Shows per-phase totals of the last traced operation and saves Chrome traces
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._shown_operation = None
+        self._shown_end = 0.0
+
+        self.record_check = QtWidgets.QCheckBox("Record")
+        self.record_check.setChecked(tracing.is_enabled())
+        self.operation_label = QtWidgets.QLabel()
+        self.save_btn = QtWidgets.QPushButton("Save Trace...")
+        self.clear_btn = QtWidgets.QPushButton("Clear")
+        self.phase_tree = QtWidgets.QTreeWidget()
+        self.phase_tree.setRootIsDecorated(False)
+        self.phase_tree.setUniformRowHeights(True)
+        self.phase_tree.setHeaderLabels(["Phase", "Total (ms)", "Calls", "Avg (ms)"])
+
+        top_layout = QtWidgets.QHBoxLayout()
+        top_layout.setContentsMargins(0, 0, 0, 0)
+        top_layout.addWidget(self.record_check)
+        top_layout.addWidget(self.operation_label, 1)
+        top_layout.addWidget(self.clear_btn)
+        top_layout.addWidget(self.save_btn)
+        layout = QtWidgets.QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.addLayout(top_layout)
+        layout.addWidget(self.phase_tree)
+
+        self.record_check.toggled.connect(tracing.enable)
+        self.save_btn.clicked.connect(self.save_trace)
+        self.clear_btn.clicked.connect(self.clear)
+
+        # Spans arrive from worker threads too, so poll instead of connecting to them
+        self._timer = QtCore.QTimer(self)
+        self._timer.setInterval(250)
+        self._timer.timeout.connect(self.refresh)
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.refresh()
+        self._timer.start()
+
+    def hideEvent(self, event):
+        super().hideEvent(event)
+        self._timer.stop()
+
+    def refresh(self):
+        operation = tracing.last_operation()
+        if operation is None:
+            self.operation_label.setText("No operation recorded" if tracing.is_enabled() else "Tracing is off")
+            self.phase_tree.clear()
+            return
+        if operation is self._shown_operation and operation.end == self._shown_end:
+            return
+        self._shown_operation = operation
+        self._shown_end = operation.end
+
+        self.operation_label.setText(f"{operation.name}: {operation.duration * 1000:.1f} ms")
+        self.phase_tree.clear()
+        for name, total, count in operation.phases():
+            self.phase_tree.addTopLevelItem(QtWidgets.QTreeWidgetItem(
+                [name, f"{total * 1000:.1f}", str(count), f"{total * 1000 / count:.2f}"]))
+
+    def clear(self):
+        tracing.clear()
+        self._shown_operation = None
+        self.refresh()
+
+    def save_trace(self):
+        default_path = os.path.join(os.path.expanduser('~'), f"contenthub_trace_{time.strftime('%Y%m%d-%H%M%S')}.json")
+        path, _ = QtWidgets.QFileDialog.getSaveFileName(self, "Save Chrome Trace", default_path, "Trace (*.json)")
+        if path:
+            tracing.export_chrome_trace(path)
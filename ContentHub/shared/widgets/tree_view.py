@@ -7,7 +7,8 @@ try:
 except:
     from PySide6 import QtCore, QtGui, QtWidgets
 
-from importlib import reload
+from contenthub import core
+from shared.systems import dir_walker, folder_watcher, project_manifest, tracing
 
 
 class AssetTreeWidget(QtWidgets.QTreeWidget):
@@ -17,6 +18,8 @@ class AssetTreeWidget(QtWidgets.QTreeWidget):
 
     item_selected = QtCore.Signal(str)
 
+    LOADED_ROLE = QtCore.Qt.UserRole + 1
+
     def __init__(self, root_path: str, parent=None):
         super().__init__(parent)
         self.root_path = root_path
@@ -29,10 +32,39 @@ class AssetTreeWidget(QtWidgets.QTreeWidget):
         # Add context menu
         self.setContextMenuPolicy(QtCore.Qt.CustomContextMenu)
         self.customContextMenuRequested.connect(self.contextMenuEvent)
+        # Children are listed the first time a folder is expanded
+        self.itemExpanded.connect(self._on_item_expanded)
+        # Listed folders are watched and updated in place
+        self._items: dict[str, QtWidgets.QTreeWidgetItem] = {}
+        self.watcher = folder_watcher.FolderWatcher(parent=self)
+        self.watcher.entries_added.connect(self._on_entries_added)
+        self.watcher.entries_removed.connect(self._on_entries_removed)
+        self.watcher.entry_renamed.connect(self._on_entry_renamed)
+        # With a project manifest the hierarchy comes from it instead of listing the share
+        self.manifest: project_manifest.ManifestReader | None = None
 
         if self.root_path:
             self.rebuild_tree(self.root_path)
 
+    def set_manifest(self, manifest: project_manifest.ManifestReader | None):
+        """
+        Builds the tree from a project manifest, the folders that lead to published assets
+        """
+        self.manifest = manifest
+        if manifest is not None:
+            manifest.refresh()
+        self.rebuild_tree()
+
+    def refresh_manifest(self) -> bool:
+        """
+        Checks the manifest for publishes since the last check, one small read when nothing changed.
+        Rebuilds the tree, from memory apart from the changed segments, if something did.
+        """
+        if self.manifest is None or not self.manifest.refresh():
+            return False
+        self.rebuild_tree()
+        return True
+
     def contextMenuEvent(self, pos: QtCore.QPoint):
         menu = QtWidgets.QMenu(self)
 
@@ -81,8 +113,9 @@ class AssetTreeWidget(QtWidgets.QTreeWidget):
         else:
             try:
                 os.rename(old_path, new_path)
-                item.setText(0, new_name)
-                item.setData(0, QtCore.Qt.UserRole, new_path)
+                project_manifest.move_folder(old_path, new_path)
+                self._retarget_item(item, new_path)
+                self.watcher.sync(parent_path)
             except Exception as e:
                 QtWidgets.QMessageBox.critical(self, "Error", f"Failed to rename folder: {e}")
                 item.setText(0, old_path)
@@ -104,13 +137,22 @@ class AssetTreeWidget(QtWidgets.QTreeWidget):
             counter += 1
 
         os.makedirs(new_folder_path)
-        self.rebuild_tree(parent_path)
+        # Only an already listed parent needs the new item, others list it on expand
+        if self.watcher.is_watched(parent_path):
+            self.watcher.sync(parent_path)
 
     def rebuild_tree(self, root_path: str | None = None):
         """
         Rebuilds the tree view from the given root path.
+        Only the top level is listed, expanded folders and the selection are restored.
         """
+        tracing.begin_operation('rebuild_tree')
+        expanded_paths = self.expanded_paths()
+        selected_path = self.selected_path()
+
         self.clear()
+        self._items.clear()
+        self.watcher.clear()
         self.setHeaderLabels(['Asset Hierarchy'])
 
         if not root_path:
@@ -123,9 +165,12 @@ class AssetTreeWidget(QtWidgets.QTreeWidget):
         root_item = QtWidgets.QTreeWidgetItem([root_name])
         root_item.setData(0, QtCore.Qt.UserRole, root_path)
         self.addTopLevelItem(root_item)
+        self._items[_normalize(root_path)] = root_item
 
         self._add_dir_children(root_item, root_path)
-        self.expandToDepth(0)
+        root_item.setExpanded(True)
+
+        self.restore_state(expanded_paths, selected_path)
 
     def selected_path(self) -> str | None:
         """
@@ -134,25 +179,149 @@ class AssetTreeWidget(QtWidgets.QTreeWidget):
         item = self.currentItem()
         return item.data(0, QtCore.Qt.UserRole) if item else None
 
-    def _add_dir_children(self, parent_item: QtGui.QStandardItem, parent_path: str):       
+    def expanded_paths(self) -> list[str]:
         """
-        Recursively adds directory children to the parent item.
+        Returns the paths of all expanded folders, parents first
         """
-        if os.path.isfile(os.path.join(parent_path, 'metadata.json')):
+        paths = []
+        stack = [self.topLevelItem(i) for i in range(self.topLevelItemCount())]
+        while stack:
+            item = stack.pop()
+            if not item.isExpanded():
+                continue
+            paths.append(item.data(0, QtCore.Qt.UserRole))
+            stack.extend(item.child(i) for i in range(item.childCount()))
+        return sorted(paths, key=len)
+
+    def restore_state(self, expanded_paths: list[str], selected_path: str | None = None):
+        """
+        Re-expands the given folders and restores the selection
+        """
+        for path in expanded_paths:
+            item = self.find_item(path)
+            if item:
+                item.setExpanded(True)
+
+        if selected_path:
+            item = self.find_item(selected_path)
+            if item:
+                self.setCurrentItem(item)
+
+    def find_item(self, path: str) -> QtWidgets.QTreeWidgetItem | None:
+        """
+        Returns the item for the given path, listing folders on the way down if needed
+        """
+        target = os.path.normpath(path)
+        stack = [self.topLevelItem(i) for i in range(self.topLevelItemCount())]
+        while stack:
+            item = stack.pop()
+            item_path = os.path.normpath(item.data(0, QtCore.Qt.UserRole))
+            if item_path == target:
+                return item
+            if not target.startswith(item_path.rstrip(os.sep) + os.sep):
+                continue
+            self._ensure_children(item)
+            stack.extend(item.child(i) for i in range(item.childCount()))
+        return None
+
+    def _on_item_expanded(self, item: QtWidgets.QTreeWidgetItem):
+        self._ensure_children(item)
+
+    def _ensure_children(self, item: QtWidgets.QTreeWidgetItem):
+        if item.data(0, self.LOADED_ROLE):
+            return
+        self._add_dir_children(item, item.data(0, QtCore.Qt.UserRole))
+
+    @tracing.traced('tree.add_dir_children')
+    def _add_dir_children(self, parent_item: QtWidgets.QTreeWidgetItem, parent_path: str):
+        """
+        Adds the direct directory children of the parent item.
+        Subfolders get an expand indicator and are listed when first expanded.
+        """
+        parent_item.setData(0, self.LOADED_ROLE, True)
+
+        if self.manifest is not None:
+            names = self.manifest.child_folders(parent_path)
+            if names is not None:
+                for name in names:
+                    self._add_child_item(parent_item, f"{_normalize(parent_path)}/{name}")
+                parent_item.setChildIndicatorPolicy(QtWidgets.QTreeWidgetItem.DontShowIndicatorWhenChildless)
+                return
+
+        # One listing tells both whether this is an asset folder and what is below it
+        listing = dir_walker.list_dir(parent_path)
+        if listing.error is not None or listing.file('metadata.json') is not None:
+            parent_item.setChildIndicatorPolicy(QtWidgets.QTreeWidgetItem.DontShowIndicatorWhenChildless)
             return
 
-        entries = os.scandir(parent_path)
-        for entry in entries:
-            if not entry.is_dir():
+        names = []
+        for entry in listing.dirs:
+            self._add_child_item(parent_item, entry.path)
+            names.append(entry.name)
+
+        parent_item.setChildIndicatorPolicy(QtWidgets.QTreeWidgetItem.DontShowIndicatorWhenChildless)
+        self.watcher.watch(parent_path, names)
+
+    def _add_child_item(self, parent_item: QtWidgets.QTreeWidgetItem, child_path: str) -> QtWidgets.QTreeWidgetItem:
+        child_item = QtWidgets.QTreeWidgetItem([os.path.basename(child_path)])
+        child_item.setData(0, QtCore.Qt.UserRole, child_path)
+        child_item.setChildIndicatorPolicy(QtWidgets.QTreeWidgetItem.ShowIndicator)
+        parent_item.addChild(child_item)
+        self._items[_normalize(child_path)] = child_item
+        return child_item
+
+    def _retarget_item(self, item: QtWidgets.QTreeWidgetItem, new_path: str):
+        """
+        Points an item and its listed descendants at a renamed folder
+        """
+        old_root = _normalize(item.data(0, QtCore.Qt.UserRole))
+        new_root = _normalize(new_path)
+        item.setText(0, os.path.basename(new_root))
+
+        stack = [item]
+        while stack:
+            current = stack.pop()
+            old_path = _normalize(current.data(0, QtCore.Qt.UserRole))
+            path = new_root + old_path[len(old_root):]
+            current.setData(0, QtCore.Qt.UserRole, path)
+            self._items.pop(old_path, None)
+            self._items[path] = current
+            children = [current.child(i) for i in range(current.childCount())]
+            if self.watcher.is_watched(old_path):
+                self.watcher.unwatch(old_path, keep_snapshot=False)
+                self.watcher.watch(path, [child.text(0) for child in children])
+            stack.extend(children)
+
+    def _on_entries_added(self, parent_path: str, names: list[str]):
+        parent_item = self._items.get(parent_path)
+        if parent_item is None or not parent_item.data(0, self.LOADED_ROLE):
+            return
+        parent_dir = parent_item.data(0, QtCore.Qt.UserRole)
+        for name in names:
+            if _normalize(os.path.join(parent_dir, name)) not in self._items:
+                self._add_child_item(parent_item, os.path.join(parent_dir, name))
+
+    def _on_entries_removed(self, parent_path: str, names: list[str]):
+        # Only the view follows, the manifest is changed by whoever moved or deleted the folder
+        for name in names:
+            item = self._items.get(f"{parent_path}/{name}")
+            if item is None:
                 continue
+            stack = [item]
+            while stack:
+                current = stack.pop()
+                self._items.pop(_normalize(current.data(0, QtCore.Qt.UserRole)), None)
+                stack.extend(current.child(i) for i in range(current.childCount()))
+            item.parent().removeChild(item)
+
+    def _on_entry_renamed(self, parent_path: str, old_name: str, new_name: str):
+        item = self._items.get(f"{parent_path}/{old_name}")
+        if item is not None:
+            self._retarget_item(item, os.path.join(item.parent().data(0, QtCore.Qt.UserRole), new_name))
 
-            child_path = entry.path
-            child_item = QtWidgets.QTreeWidgetItem([entry.name])
-            child_item.setData(0, QtCore.Qt.UserRole, child_path)
-            parent_item.addChild(child_item)
 
-            # recurse into subdirectories
-            self._add_dir_children(child_item, child_path)
+def _normalize(path: str) -> str:
+    return os.path.normpath(path).replace("\\", "/")
 
 
 class AssetExplorerWidget(QtWidgets.QWidget):
@@ -205,9 +374,4 @@ class AssetExplorerWidget(QtWidgets.QWidget):
         """
         Recursively collects all asset file paths under the given root path.
         """
-        asset_paths = []
-        for dirpath, _, filenames in os.walk(root_path):
-            for filename in filenames:
-                if filename.lower().endswith(('.png', '.jpg', '.jpeg', '.bmp', '.gif')):  # Example image formats
-                    asset_paths.append(os.path.join(dirpath, filename))
-        return asset_paths
+        return core.find_files(root_path)
@@ -0,0 +1,21 @@
+import os
+import sys
+
+CONTENTHUB_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# The tool is run from these roots inside Maya and Unreal, the tests import it the same way
+for path in (CONTENTHUB_ROOT, os.path.join(CONTENTHUB_ROOT, 'maya')):
+    if path not in sys.path:
+        sys.path.insert(0, path)
+
+# Outside the editors the benchmarks' stand-in maya and unreal modules are imported instead
+try:
+    import maya.cmds  # noqa: F401
+except ImportError:
+    # The failed import left the tool's maya folder cached as a namespace package
+    sys.modules.pop('maya', None)
+    sys.path.insert(0, os.path.join(CONTENTHUB_ROOT, 'benchmarks', 'maya_stub'))
+try:
+    import unreal  # noqa: F401
+except ImportError:
+    sys.path.insert(0, os.path.join(CONTENTHUB_ROOT, 'benchmarks', 'unreal_stub'))
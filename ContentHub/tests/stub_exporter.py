@@ -0,0 +1,30 @@
+"""
+Exporter used by batch export workers in the tests instead of mayapy.
+What it does is chosen by the job's asset name:
+    fail   always raises
+    flaky  raises on the first attempt for its folder, succeeds afterwards
+Every export appends "<scene> <start> <end>" to export.log in the asset folder.
+"""
+from __future__ import annotations
+
+from typing import Any
+
+import os
+import time
+
+
+def export(job) -> dict[str, Any]:
+    os.makedirs(job.asset_folder, exist_ok=True)
+    start = time.time()
+    if job.asset_name == 'fail':
+        raise RuntimeError("scene could not be opened")
+    if job.asset_name == 'flaky':
+        marker = os.path.join(job.asset_folder, 'attempted')
+        if not os.path.exists(marker):
+            open(marker, 'w').close()
+            raise RuntimeError("license not available")
+    time.sleep(0.02)
+    with open(os.path.join(job.asset_folder, 'export.log'), 'a', encoding='utf-8') as f:
+        f.write(f"{job.scene_path} {start} {time.time()}\n")
+    name = os.path.splitext(os.path.basename(job.scene_path))[0]
+    return {'version': 'v001', 'files': {'fbx': {'path': f"v_001/{name}.fbx", 'hash': '', 'size': 0}}}
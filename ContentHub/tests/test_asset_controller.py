@@ -0,0 +1,60 @@
+import os
+
+import pytest
+from maya import cmds
+
+from asset_hub_maya.systems import asset_controller
+from shared.systems import version_journal
+
+
+def _read(path):
+    with open(path, 'rb') as f:
+        return f.read()
+
+
+@pytest.fixture
+def scene(tmp_path, monkeypatch):
+    """
+    The stand-in's file and playblast commands write what the scene holds
+    """
+    content = {'mesh': b'mesh'}
+
+    def export_file(path, **kwargs):
+        with open(path, 'wb') as f:
+            f.write(content['mesh'])
+
+    def playblast(completeFilename, **kwargs):
+        with open(completeFilename, 'wb') as f:
+            f.write(b'png')
+
+    monkeypatch.setenv('CONTENTHUB_CACHE_DIR', str(tmp_path / 'cache'))
+    monkeypatch.delenv('CONTENTHUB_BLOB_STORE', raising=False)
+    monkeypatch.setitem(cmds.handlers, 'file', export_file)
+    monkeypatch.setitem(cmds.handlers, 'playblast', playblast)
+    return content
+
+
+def test_versions_are_allocated_in_order(tmp_path, scene):
+    asset_folder = str(tmp_path / 'Props' / 'Barrel')
+
+    first = asset_controller.export_asset_version(asset_folder, ['pCube1'])
+    scene['mesh'] = b'mesh 2'
+    second = asset_controller.export_asset_version(asset_folder, ['pCube1'])
+
+    assert (first['latest'], second['latest']) == ('v001', 'v002')
+    assert _read(os.path.join(asset_folder, 'v_002', 'Barrel.fbx')) == b'mesh 2'
+    assert version_journal.read_head(asset_folder)['latest'] == 'v002'
+
+
+def test_existing_version_is_refused_before_anything_is_written(tmp_path, scene):
+    asset_folder = str(tmp_path / 'Props' / 'Barrel')
+    asset_controller.export_asset_version(asset_folder, ['pCube1'], version=1)
+    scene['mesh'] = b'overwritten'
+    exported = len([call for call in cmds.calls if call[0] == 'file'])
+
+    with pytest.raises(ValueError, match="Version 1 already exists"):
+        asset_controller.export_asset_version(asset_folder, ['pCube1'], version=1)
+
+    assert len([call for call in cmds.calls if call[0] == 'file']) == exported
+    assert _read(os.path.join(asset_folder, 'v_001', 'Barrel.fbx')) == b'mesh'
+    assert _read(os.path.join(asset_folder, 'v_001', 'thumbnail.png')) == b'png'
@@ -0,0 +1,125 @@
+import os
+import json
+import shutil
+import threading
+
+import pytest
+
+from shared.systems import asset_index
+from shared.systems.asset_index import AssetIndex
+
+
+def _asset(path, author='ana', tags=(), latest='v001'):
+    os.makedirs(path, exist_ok=True)
+    entry = {'version': latest, 'files': {}, 'author': author, 'date': '', 'tags': list(tags)}
+    with open(os.path.join(path, 'metadata.json'), 'w', encoding='utf-8') as f:
+        json.dump({'name': os.path.basename(path), 'latest': latest, 'versions': [entry]}, f)
+
+
+def _paths(records):
+    return [record.path for record in records]
+
+
+@pytest.fixture
+def library(tmp_path):
+    root = str(tmp_path / 'Library').replace('\\', '/')
+    _asset(f"{root}/Props/Barrel", tags=('wood', 'dressing'))
+    _asset(f"{root}/Props/Crate", author='ben')
+    _asset(f"{root}/Props/Crate/Nested")
+    _asset(f"{root}/Env/Forest/Oak")
+    os.makedirs(f"{root}/Env/Empty")
+    return root
+
+
+@pytest.fixture
+def index(tmp_path):
+    index = AssetIndex(str(tmp_path / 'cache' / 'index.sqlite'), max_age=60.0)
+    yield index
+    index.close()
+
+
+def test_assets_are_indexed_without_descending_into_them(library, index):
+    records = index.assets_under(library)
+
+    assert _paths(records) == [f"{library}/Env/Forest/Oak", f"{library}/Props/Barrel", f"{library}/Props/Crate"]
+    barrel = records[1]
+    assert (barrel.name, barrel.latest, barrel.author, barrel.tags) == ('Barrel', 'v001', 'ana', 'wood,dressing')
+    assert _paths(index.assets_under(f"{library}/Props", refresh=False)) == [f"{library}/Props/Barrel",
+                                                                             f"{library}/Props/Crate"]
+
+
+def test_index_survives_a_reopen(library, tmp_path, index):
+    index.assets_under(library)
+    index.close()
+
+    reopened = AssetIndex(index.db_path)
+    try:
+        assert len(reopened.assets_under(library, refresh=False)) == 3
+    finally:
+        reopened.close()
+
+
+def test_refreshed_subtrees_stay_fresh_until_invalidated(library, index):
+    assert index.is_stale(library)
+    index.assets_under(library)
+
+    assert not index.is_stale(library)
+    assert not index.is_stale(f"{library}/Props")
+
+    index.invalidate(f"{library}/Props/Barrel")
+    assert index.is_stale(f"{library}/Props")
+    assert index.is_stale(library)
+
+    index.refresh(f"{library}/Env")
+    index.invalidate(f"{library}/Props")
+    assert not index.is_stale(f"{library}/Env/Forest")
+    index.invalidate()
+    assert index.is_stale(f"{library}/Env/Forest")
+
+
+def test_invalidating_an_unknown_path_does_nothing(library, index):
+    index.refresh(f"{library}/Env")
+    index.refresh(f"{library}/Props")
+
+    index.invalidate(f"{library}/Missing")
+    index.invalidate(f"{library}/Props/Barrel")
+    index.invalidate(f"{library}/Props/Barrel")
+
+    assert not index.is_stale(f"{library}/Env")
+
+
+def test_changes_show_up_once_the_index_is_stale(library, index):
+    index.assets_under(library)
+    _asset(f"{library}/Props/Barrel", latest='v002', author='ben')
+    shutil.rmtree(f"{library}/Props/Crate")
+    _asset(f"{library}/Env/Forest/Pine")
+
+    # Still fresh, the earlier result is served
+    assert len(index.assets_under(library)) == 3
+
+    index.invalidate(library)
+    records = {record.path: record for record in index.assets_under(library)}
+    assert sorted(records) == [f"{library}/Env/Forest/Oak", f"{library}/Env/Forest/Pine", f"{library}/Props/Barrel"]
+    assert (records[f"{library}/Props/Barrel"].latest, records[f"{library}/Props/Barrel"].author) == ('v002', 'ben')
+
+
+def test_cancelled_refresh_is_rolled_back(library, index):
+    with pytest.raises(asset_index.ScanCancelled):
+        index.refresh(library, should_cancel=lambda: True)
+
+    assert index.assets_under(library, refresh=False) == []
+    assert index.is_stale(library)
+
+
+def test_session_index_is_created_once(tmp_path, monkeypatch):
+    monkeypatch.setenv('CONTENTHUB_CACHE_DIR', str(tmp_path / 'cache'))
+    monkeypatch.setattr(asset_index, '_index', None)
+    indexes = []
+    threads = [threading.Thread(target=lambda: indexes.append(asset_index.get_index())) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len({id(index) for index in indexes}) == 1
+    indexes[0].close()
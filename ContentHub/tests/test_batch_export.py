@@ -0,0 +1,94 @@
+import os
+import sys
+import json
+import subprocess
+
+from asset_hub_maya.systems import batch_export
+from asset_hub_maya.systems.batch_export import BatchExporter, ExportJob
+
+STUB_COMMAND = [sys.executable, batch_export.__file__, '--worker', '--exporter', 'tests.stub_exporter:export']
+
+
+def _exports(asset_folder):
+    with open(os.path.join(asset_folder, 'export.log'), 'r', encoding='utf-8') as f:
+        return [line.split() for line in f]
+
+
+def test_jobs_of_one_folder_run_in_order_one_at_a_time(tmp_path):
+    jobs = [ExportJob(f"{tmp_path}/scenes/{folder}_{i}.ma", str(tmp_path / folder))
+            for i in range(3) for folder in ('Barrel', 'Crate', 'Tower')]
+
+    results = BatchExporter(STUB_COMMAND, workers=3).run(jobs)
+
+    assert [result.job for result in results] == jobs
+    assert all(result.ok and result.attempts == 1 for result in results)
+    for folder in ('Barrel', 'Crate', 'Tower'):
+        exports = _exports(tmp_path / folder)
+        assert [scene for scene, _, _ in exports] == [job.scene_path for job in jobs
+                                                    if job.asset_folder == str(tmp_path / folder)]
+        for (_, _, end), (_, start, _) in zip(exports, exports[1:]):
+            assert float(start) >= float(end)
+
+
+def test_failed_attempt_is_retried(tmp_path):
+    job = ExportJob(f"{tmp_path}/flaky.ma", str(tmp_path / 'Flaky'), asset_name='flaky')
+
+    result, = BatchExporter(STUB_COMMAND, workers=1, retries=2).run([job])
+
+    assert result.ok
+    assert result.attempts == 2
+    assert result.version == 'v001'
+    assert result.files['fbx']['path'] == 'v_001/flaky.fbx'
+
+
+def test_job_fails_once_retries_run_out(tmp_path):
+    job = ExportJob(f"{tmp_path}/broken.ma", str(tmp_path / 'Broken'), asset_name='fail')
+
+    result, = BatchExporter(STUB_COMMAND, workers=1, retries=2).run([job])
+
+    assert not result.ok
+    assert result.attempts == 3
+    assert result.error == "RuntimeError: scene could not be opened"
+
+
+def test_report_counts_every_result(tmp_path):
+    jobs = [ExportJob(f"{tmp_path}/ok.ma", str(tmp_path / 'Ok')),
+            ExportJob(f"{tmp_path}/broken.ma", str(tmp_path / 'Broken'), asset_name='fail')]
+    results = BatchExporter(STUB_COMMAND, workers=2, retries=0).run(jobs)
+
+    report_path = tmp_path / 'reports' / 'report.json'
+    batch_export.write_report(results, str(report_path))
+
+    with open(report_path, 'r', encoding='utf-8') as f:
+        report = json.load(f)
+    assert report['succeeded'] == 1
+    assert report['failed'] == 1
+    assert [r['job']['scene_path'] for r in report['results']] == [job.scene_path for job in jobs]
+    assert report['results'][1]['error'] == "RuntimeError: scene could not be opened"
+
+
+def _run_cli(tmp_path, jobs):
+    jobs_path = tmp_path / 'jobs.json'
+    with open(jobs_path, 'w', encoding='utf-8') as f:
+        json.dump([job.to_dict() for job in jobs], f)
+    report_path = tmp_path / 'report.json'
+    process = subprocess.run([sys.executable, batch_export.__file__, str(jobs_path), '--retries', '0',
+                              '--report', str(report_path), '--exporter', 'tests.stub_exporter:export'],
+                             capture_output=True, text=True)
+    return process, report_path
+
+
+def test_cli_exits_with_1_when_a_job_failed(tmp_path):
+    process, report_path = _run_cli(tmp_path, [
+        ExportJob(f"{tmp_path}/ok.ma", str(tmp_path / 'Ok')),
+        ExportJob(f"{tmp_path}/broken.ma", str(tmp_path / 'Broken'), asset_name='fail'),
+    ])
+
+    assert process.returncode == 1
+    assert os.path.isfile(report_path)
+
+
+def test_cli_exits_with_0_when_every_job_succeeded(tmp_path):
+    process, report_path = _run_cli(tmp_path, [ExportJob(f"{tmp_path}/ok.ma", str(tmp_path / 'Ok'))])
+
+    assert process.returncode == 0, process.stderr
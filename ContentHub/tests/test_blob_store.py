@@ -0,0 +1,74 @@
+import os
+import hashlib
+
+import pytest
+
+from shared.systems import blob_store
+from shared.systems.blob_store import BlobStore
+
+
+def _file(path, content):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'wb') as f:
+        f.write(content)
+    return str(path)
+
+
+def _read(path):
+    with open(path, 'rb') as f:
+        return f.read()
+
+
+@pytest.fixture
+def project(tmp_path, monkeypatch):
+    monkeypatch.delenv('CONTENTHUB_BLOB_STORE', raising=False)
+    os.makedirs(tmp_path / blob_store.STORE_DIR)
+    return tmp_path
+
+
+def test_blobs_are_stored_once_under_their_hash(project):
+    store = BlobStore.for_project(str(project))
+    first = _file(project / 'work' / 'a.fbx', b'mesh')
+    second = _file(project / 'work' / 'b.fbx', b'mesh')
+
+    digest = store.put(first)
+
+    assert digest == hashlib.sha256(b'mesh').hexdigest()
+    assert store.put(second) == digest
+    assert store.has(digest)
+    assert _read(store.blob_path(digest)) == b'mesh'
+    assert os.listdir(os.path.dirname(store.blob_path(digest))) == [digest]
+
+
+def test_published_versions_share_unchanged_files(project):
+    store = blob_store.find_store(str(project / 'Props' / 'Barrel'))
+    source = _file(project / 'work' / 'Barrel.fbx', b'mesh')
+    asset_path = str(project / 'Props' / 'Barrel')
+
+    first = blob_store.publish_files({'fbx': source}, asset_path, 'v_001', store)
+    second = blob_store.publish_files({'fbx': source}, asset_path, 'v_002', store)
+
+    assert first['fbx'] == {'path': 'v_001/Barrel.fbx', 'hash': hashlib.sha256(b'mesh').hexdigest(), 'size': 4}
+    assert second['fbx']['hash'] == first['fbx']['hash']
+    linked = [os.path.join(asset_path, entry['fbx']['path']) for entry in (first, second)]
+    assert all(_read(path) == b'mesh' for path in linked)
+    if hasattr(os, 'link'):
+        assert os.path.samefile(*linked)
+
+
+def test_without_a_store_files_are_copied(tmp_path, monkeypatch):
+    monkeypatch.delenv('CONTENTHUB_BLOB_STORE', raising=False)
+    source = _file(tmp_path / 'work' / 'Barrel.fbx', b'mesh')
+
+    assert blob_store.find_store(str(tmp_path / 'Barrel')) is None
+    files = blob_store.publish_files({'fbx': source}, str(tmp_path / 'Barrel'), 'v_001')
+
+    assert _read(tmp_path / 'Barrel' / 'v_001' / 'Barrel.fbx') == b'mesh'
+    assert files['fbx']['hash'] == blob_store.hash_file(source)
+
+
+def test_configured_store_wins(tmp_path, monkeypatch):
+    monkeypatch.setenv('CONTENTHUB_BLOB_STORE', str(tmp_path / 'shared_blobs'))
+
+    assert blob_store.find_store(str(tmp_path)).root == str(tmp_path / 'shared_blobs').replace('\\', '/')
+
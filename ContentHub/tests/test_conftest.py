@@ -0,0 +1,13 @@
+import os
+
+import pytest
+from maya import cmds, OpenMayaUI
+
+STUB_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'benchmarks', 'maya_stub')
+
+
+def test_maya_stand_in_is_imported_without_maya():
+    if not os.path.abspath(cmds.__file__).startswith(STUB_DIR):
+        pytest.skip("Maya's own cmds module is importable")
+    assert cmds.workspaceControl('Control', q=True, exists=True) is False
+    assert OpenMayaUI.MQtUtil.mainWindow() is None
@@ -0,0 +1,102 @@
+import os
+import sys
+import json
+import hashlib
+import subprocess
+
+import pytest
+
+from contenthub import core
+from shared.systems import version_journal
+
+CONTENTHUB_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _publish(asset_path, number=1, content=b'mesh', author='ana'):
+    relative = f"{version_journal.version_folder(number)}/{os.path.basename(asset_path)}.fbx"
+    os.makedirs(os.path.join(asset_path, os.path.dirname(relative)), exist_ok=True)
+    with open(os.path.join(asset_path, relative), 'wb') as f:
+        f.write(content)
+    entry = {'version': f"v{number:03d}", 'author': author, 'date': '',
+             'files': {'fbx': {'path': relative, 'hash': hashlib.sha256(content).hexdigest(),
+                               'size': len(content)}}}
+    version_journal.append_version(asset_path, os.path.basename(asset_path), entry)
+    return os.path.join(asset_path, relative)
+
+
+@pytest.fixture
+def library(tmp_path):
+    root = str(tmp_path / 'Library').replace('\\', '/')
+    _publish(f"{root}/Props/Barrel")
+    _publish(f"{root}/Props/Barrel", 2, b'mesh 2', author='ben')
+    _publish(f"{root}/Props/Crate")
+    _publish(f"{root}/Env/Forest/Oak", author='ben')
+    os.makedirs(f"{root}/Env/Empty")
+    return root
+
+
+def _run(library, *args):
+    env = dict(os.environ, CONTENTHUB_CACHE_DIR=os.path.join(os.path.dirname(library), 'cache'))
+    return subprocess.run([sys.executable, '-m', 'contenthub', *args], cwd=CONTENTHUB_ROOT, env=env,
+                          capture_output=True, text=True)
+
+
+def test_asset_folders_are_found_but_not_descended(library):
+    _publish(f"{library}/Props/Barrel/Nested")
+
+    assert sorted(core.iter_asset_paths(library)) == [f"{library}/Env/Forest/Oak", f"{library}/Props/Barrel",
+                                                      f"{library}/Props/Crate"]
+
+
+def test_latest_version_comes_from_the_head(library):
+    latest = core.latest_version(f"{library}/Props/Barrel")
+
+    assert (latest.version, latest.author) == ('v002', 'ben')
+    assert core.latest_version(f"{library}/Env/Empty") is None
+
+
+def test_published_assets_validate(library):
+    for asset_path in core.iter_asset_paths(library):
+        assert core.validate_asset(asset_path, check_hashes=True) == []
+
+
+def test_validation_reports_missing_and_changed_files(library):
+    os.remove(f"{library}/Props/Barrel/v_001/Barrel.fbx")
+    with open(f"{library}/Props/Crate/v_001/Crate.fbx", 'wb') as f:
+        f.write(b'MESH')
+
+    assert core.validate_asset(f"{library}/Props/Barrel") == ["v001: Barrel.fbx is missing"]
+    assert core.validate_asset(f"{library}/Props/Crate") == []
+    assert core.validate_asset(f"{library}/Props/Crate", check_hashes=True) == \
+        ["v001: Crate.fbx does not match its published hash"]
+    assert core.validate_asset(f"{library}/Env/Empty") == ["metadata.json is missing"]
+
+
+def test_stats_add_up_over_assets(library):
+    total = {}
+    for asset_path in sorted(core.iter_asset_paths(library)):
+        core.merge_stats(total, core.asset_stats(asset_path))
+
+    assert {key: total[key] for key in ('assets', 'versions', 'files', 'bytes', 'thumbnails')} == \
+        {'assets': 3, 'versions': 4, 'files': 4, 'bytes': 18, 'thumbnails': 0}
+    assert total['authors'] == {'ana': 2, 'ben': 2}
+
+
+def test_cli_validate_exits_with_1_on_problems(library):
+    assert _run(library, 'validate', library, '--workers', '2').returncode == 0
+
+    os.remove(f"{library}/Env/Forest/Oak/v_001/Oak.fbx")
+    process = _run(library, 'validate', library, '--workers', '2', '--json')
+
+    assert process.returncode == 1
+    assert [json.loads(line) for line in process.stdout.splitlines()] == [
+        {'path': f"{library}/Env/Forest/Oak", 'problems': ["v001: Oak.fbx is missing"]}]
+
+
+def test_cli_stats_and_scan(library):
+    stats = json.loads(_run(library, 'stats', library, '--workers', '1', '--json').stdout)
+    scan = _run(library, 'scan', library, '--json')
+
+    assert stats['versions'] == 4
+    assert sorted(json.loads(line)['path'] for line in scan.stdout.splitlines()) == \
+        sorted(core.iter_asset_paths(library))
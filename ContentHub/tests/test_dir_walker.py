@@ -0,0 +1,95 @@
+import os
+import time
+import threading
+
+from shared.systems import dir_walker
+
+
+def _tree(root, depth=3, fanout=2):
+    """
+    Folders a, b below every folder down to depth, each with a file and a hidden folder
+    """
+    paths = [str(root)]
+    level = [str(root)]
+    for _ in range(depth):
+        level = [os.path.join(parent, name) for parent in level for name in 'ab'[:fanout]]
+        paths.extend(level)
+    for path in paths:
+        os.makedirs(os.path.join(path, '.contenthub'), exist_ok=True)
+        open(os.path.join(path, 'file.txt'), 'w').close()
+    return paths
+
+
+def _depth(root, path):
+    relative = os.path.relpath(path, root)
+    return 0 if relative == '.' else relative.count(os.sep) + 1
+
+
+def test_map_paths_keeps_item_order_while_running_concurrently():
+    running = []
+    peak = []
+    lock = threading.Lock()
+
+    def probe(item):
+        with lock:
+            running.append(item)
+            peak.append(len(running))
+        # Later items finish first
+        time.sleep(0.002 * (10 - item))
+        with lock:
+            running.remove(item)
+        return item * item
+
+    assert dir_walker.map_paths(probe, range(10)) == [item * item for item in range(10)]
+    assert max(peak) > 1
+
+
+def test_map_paths_probes_one_level_at_a_time(tmp_path):
+    _tree(tmp_path)
+    level = [str(tmp_path)]
+    depths = []
+    while level:
+        listings = dir_walker.map_paths(dir_walker.list_dir, level)
+        assert [listing.path for listing in listings] == level
+        depths.append({_depth(tmp_path, listing.path) for listing in listings})
+        level = [entry.path for listing in listings for entry in sorted(listing.dirs, key=lambda e: e.name)]
+
+    assert depths == [{0}, {1}, {2}, {3}]
+
+
+def test_walk_lists_every_folder_once_without_hidden_ones(tmp_path):
+    paths = _tree(tmp_path)
+
+    listings = list(dir_walker.walk(str(tmp_path), workers=4))
+
+    assert sorted(listing.path for listing in listings) == sorted(paths)
+    assert all([entry.name for entry in listing.files] == ['file.txt'] for listing in listings)
+    assert all(listing.error is None for listing in listings)
+
+
+def test_descend_limits_the_depth(tmp_path):
+    _tree(tmp_path)
+
+    listings = list(dir_walker.walk(str(tmp_path), descend=lambda listing: _depth(tmp_path, listing.path) < 2))
+
+    assert sorted(_depth(tmp_path, listing.path) for listing in listings) == [0, 1, 1, 2, 2, 2, 2]
+
+
+def test_unreadable_folder_is_reported_not_raised(tmp_path):
+    missing = str(tmp_path / 'missing')
+
+    listing, = dir_walker.walk(missing)
+
+    assert listing.path == missing
+    assert isinstance(listing.error, FileNotFoundError)
+    assert (listing.dirs, listing.files) == ([], [])
+
+
+def test_cancelled_walk_stops(tmp_path):
+    _tree(tmp_path)
+    seen = []
+
+    for listing in dir_walker.walk(str(tmp_path), workers=1, should_cancel=lambda: len(seen) >= 2):
+        seen.append(listing)
+
+    assert len(seen) == 2
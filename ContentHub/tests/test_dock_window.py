@@ -0,0 +1,78 @@
+import pytest
+
+pytest.importorskip('PySide2')
+shiboken2 = pytest.importorskip('shiboken2')
+
+from PySide2 import QtWidgets
+from maya import cmds, OpenMayaUI
+
+from benchmarks.run_benchmarks import FakeWorkspace
+from utils import dock_window
+
+
+class KeptWindow(dock_window.DockWindow):
+    CONTROL_NAME = 'TestKeptControl'
+    KEEP_ALIVE = True
+
+
+class Window(dock_window.DockWindow):
+    CONTROL_NAME = 'TestControl'
+
+
+@pytest.fixture
+def workspace():
+    app = QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+    workspace = FakeWorkspace()
+    cmds.calls.clear()
+    yield workspace
+    cmds.handlers.pop('workspaceControl', None)
+    OpenMayaUI.MQtUtil.main_window = None
+    OpenMayaUI.MQtUtil.controls.clear()
+    app.processEvents()
+
+
+def _close_commands(name):
+    return [kwargs['closeCommand'] for command, args, kwargs in cmds.calls
+            if command == 'workspaceControl' and args == (name,) and 'closeCommand' in kwargs]
+
+
+def test_new_control_takes_the_widget_out_before_closing(workspace):
+    window = KeptWindow()
+
+    assert _close_commands(KeptWindow.CONTROL_NAME) == [window.detachFromDock]
+    workspace.close(KeptWindow.CONTROL_NAME)
+
+    assert shiboken2.isValid(window)
+    assert window.parent() is None
+
+
+def test_existing_control_gets_the_close_command_too(workspace):
+    # Maya restored the control from its layout before the tool was launched
+    cmds.workspaceControl(KeptWindow.CONTROL_NAME, label=KeptWindow.TITLE)
+    cmds.calls.clear()
+
+    window = KeptWindow()
+
+    assert ('workspaceControl', (KeptWindow.CONTROL_NAME,),
+            {'e': True, 'closeCommand': window.detachFromDock}) in cmds.calls
+    workspace.close(KeptWindow.CONTROL_NAME)
+    assert shiboken2.isValid(window)
+
+
+def test_reattached_widget_moves_into_the_new_control(workspace):
+    window = KeptWindow()
+    workspace.close(KeptWindow.CONTROL_NAME)
+
+    window.setParentWindow()
+
+    container = shiboken2.wrapInstance(OpenMayaUI.MQtUtil.controls[KeptWindow.CONTROL_NAME], QtWidgets.QWidget)
+    assert window.parent() is container
+    assert container.layout().indexOf(window) >= 0
+
+
+def test_widgets_not_kept_alive_close_with_their_control(workspace):
+    window = Window()
+
+    assert not _close_commands(Window.CONTROL_NAME)
+    workspace.close(Window.CONTROL_NAME)
+    assert not shiboken2.isValid(window)
@@ -0,0 +1,87 @@
+import time
+
+import pytest
+
+pytest.importorskip('PySide2')
+
+from PySide2 import QtCore
+
+from asset_hub_maya.systems import folder_prefetcher
+from shared.systems import asset_index
+
+
+class Loader:
+    def is_idle(self):
+        return True
+
+    def request(self, path, size):
+        pass
+
+    def load_atlas(self, folder, size):
+        pass
+
+
+class Index:
+    """
+    Refreshing the folders in broken fails, like an unreadable share
+    """
+
+    def __init__(self, broken):
+        self.broken = set(broken)
+        self.refreshed = []
+
+    def refresh(self, path, should_cancel=None):
+        self.refreshed.append(path)
+        if path in self.broken:
+            raise OSError(f"Permission denied: '{path}'")
+
+    def assets_under(self, path, refresh=True):
+        return []
+
+
+@pytest.fixture
+def folders(tmp_path):
+    app = QtCore.QCoreApplication.instance() or QtCore.QCoreApplication([])
+    paths = [asset_index.normalize_path(str(tmp_path / name)) for name in ('Broken', 'Props', 'Env')]
+    yield app, paths
+
+
+def _wait_until(app, condition, timeout=5.0):
+    deadline = time.perf_counter() + timeout
+    while not condition():
+        assert time.perf_counter() < deadline, "timed out"
+        app.processEvents(QtCore.QEventLoop.AllEvents, 10)
+        time.sleep(0.001)
+
+
+def test_failed_folder_is_dropped_and_the_rest_are_warmed(folders):
+    app, (broken, props, env) = folders
+    index = Index([broken])
+    prefetcher = folder_prefetcher.FolderPrefetcher(index=index, loader=Loader(), idle_ms=0)
+
+    prefetcher._on_planned(prefetcher.selection, [broken, props, env])
+    _wait_until(app, lambda: prefetcher.counters['warmed'] == 2)
+
+    assert index.refreshed == [broken, props, env]
+    assert prefetcher.counters['failed'] == 1
+    assert prefetcher._running is None
+
+    # Not planned again until the folder changes
+    prefetcher._on_planned(prefetcher.selection, [broken])
+    assert not prefetcher._queue
+    prefetcher.invalidate(broken)
+    prefetcher._on_planned(prefetcher.selection, [broken])
+    assert prefetcher._queue == [broken]
+
+
+def test_failure_after_a_pause_is_not_queued_again(folders):
+    app, (broken, props, env) = folders
+    prefetcher = folder_prefetcher.FolderPrefetcher(index=Index([broken]), loader=Loader(), idle_ms=10000)
+    prefetcher._running = broken
+    prefetcher.pause()
+    assert prefetcher._queue == [broken]
+
+    prefetcher._on_failed(prefetcher.generation - 1, broken)
+
+    assert not prefetcher._queue
+    assert prefetcher._running is None
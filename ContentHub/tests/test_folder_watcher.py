@@ -0,0 +1,80 @@
+import os
+import time
+import shutil
+
+import pytest
+
+pytest.importorskip('PySide2')
+
+from PySide2 import QtCore
+
+from shared.systems.folder_watcher import FolderWatcher
+
+
+def _wait_until(app, condition, timeout=5.0):
+    deadline = time.perf_counter() + timeout
+    while not condition():
+        assert time.perf_counter() < deadline
+        app.processEvents()
+        time.sleep(0.005)
+
+
+@pytest.fixture
+def watched(tmp_path):
+    """
+    A watched Props folder with Barrel and Crate, and the reports it made
+    """
+    app = QtCore.QCoreApplication.instance() or QtCore.QCoreApplication([])
+    props = str(tmp_path / 'Props').replace('\\', '/')
+    for name in ('Barrel', 'Crate'):
+        os.makedirs(f"{props}/{name}")
+        # Published a while ago, not within the clock tick of a folder made by the test
+        os.utime(f"{props}/{name}", (time.time() - 3600, time.time() - 3600))
+    watcher = FolderWatcher(mode='poll', poll_ms=60000)
+    reports = []
+    watcher.entries_added.connect(lambda path, names: reports.append(('added', path, names)))
+    watcher.entries_removed.connect(lambda path, names: reports.append(('removed', path, names)))
+    watcher.entry_renamed.connect(lambda path, old, new: reports.append(('renamed', path, old, new)))
+    watcher.directory_changed.connect(lambda path: reports.append(('changed', path)))
+    watcher.watch(props, ['Barrel', 'Crate'])
+    _wait_until(app, lambda: not watcher._scanning)
+
+    def sync():
+        watcher.sync(props)
+        _wait_until(app, lambda: not watcher._scanning)
+        return reports
+
+    yield props, sync
+    watcher.clear()
+    app.processEvents()
+
+
+def test_listing_the_identities_reports_nothing(watched):
+    _, sync = watched
+
+    assert sync() == [('changed', watched[0])]
+
+
+def test_rename_is_reported_as_one(watched):
+    props, sync = watched
+    os.rename(f"{props}/Crate", f"{props}/Boxes")
+
+    assert sync() == [('renamed', props, 'Crate', 'Boxes'), ('changed', props)]
+
+
+def test_delete_and_create_is_not_a_rename(watched):
+    props, sync = watched
+    os.rmdir(f"{props}/Crate")
+    os.makedirs(f"{props}/Boxes")
+
+    assert sync() == [('removed', props, ['Crate']), ('added', props, ['Boxes']), ('changed', props)]
+
+
+def test_unreadable_folder_reports_nothing_removed(watched):
+    props, sync = watched
+    shutil.rmtree(props)
+
+    assert sync() == []
+    # Back again, nothing was forgotten in between
+    os.makedirs(f"{props}/Barrel")
+    assert sync() == [('removed', props, ['Crate']), ('changed', props)]
@@ -0,0 +1,132 @@
+import os
+import json
+
+import pytest
+import unreal
+
+from hb_unreal.asset_hub_unreal.systems import import_queue
+from hb_unreal.asset_hub_unreal.systems.import_queue import ImportQueue
+from shared.systems import version_journal
+
+
+def _publish(asset_path, number=1, content=b'fbx'):
+    relative = f"{version_journal.version_folder(number)}/{os.path.basename(asset_path)}.fbx"
+    os.makedirs(os.path.join(asset_path, os.path.dirname(relative)), exist_ok=True)
+    with open(os.path.join(asset_path, relative), 'wb') as f:
+        f.write(content)
+    entry = {'version': f"v{number:03d}", 'files': {'fbx': {'path': relative, 'hash': f"hash-{content.decode()}",
+                                                            'size': len(content)}}}
+    version_journal.append_version(asset_path, os.path.basename(asset_path), entry)
+
+
+@pytest.fixture
+def library(tmp_path):
+    unreal.imported_tasks.clear()
+    unreal.failing_files.clear()
+    unreal.logs.clear()
+    root = str(tmp_path / 'Library').replace('\\', '/')
+    for asset in ('Props/Barrel', 'Props/Crate', 'Props/Old Lamp', 'Env/Oak', 'Env/Pine'):
+        _publish(f"{root}/{asset}")
+    yield root
+    unreal.failing_files.clear()
+
+
+def _queue(library, tmp_path, **kwargs):
+    queue = ImportQueue(library, state_path=str(tmp_path / 'Saved' / 'imported.json'), **kwargs)
+    queue.add_folder(library)
+    return queue
+
+
+def _imported_files():
+    return [task.get_editor_property('filename') for task in unreal.imported_tasks]
+
+
+def test_assets_are_imported_in_batches(library, tmp_path):
+    queue = _queue(library, tmp_path, batch_size=2)
+    progress = []
+
+    report = queue.run(progress=lambda done, total: progress.append((done, total)))
+
+    assert len(report.imported) == 5
+    assert progress == [(2, 5), (4, 5), (5, 5)]
+    assert _imported_files() == [item.fbx_path for item in report.imported]
+    assert not queue.items
+
+
+def test_destination_mirrors_the_library_folders(library, tmp_path):
+    queue = _queue(library, tmp_path)
+
+    lamp = queue.items[f"{library}/Props/Old Lamp"]
+
+    assert lamp.destination_path == f"{import_queue.DEFAULT_DESTINATION}/Props"
+    assert lamp.destination_name == 'Old_Lamp'
+    assert lamp.fbx_path == f"{library}/Props/Old Lamp/v_001/Old Lamp.fbx"
+    assert lamp.fingerprint == 'hash-fbx'
+
+
+def test_unchanged_assets_are_skipped_across_sessions(library, tmp_path):
+    _queue(library, tmp_path).run()
+    unreal.imported_tasks.clear()
+
+    queue = _queue(library, tmp_path)
+    report = queue.run()
+
+    assert not report.imported
+    assert len(report.skipped) == 5
+    assert not unreal.imported_tasks
+    assert not queue.items
+
+
+def test_republished_assets_are_imported_again(library, tmp_path):
+    _queue(library, tmp_path).run()
+    unreal.imported_tasks.clear()
+    _publish(f"{library}/Env/Oak", 2, b'changed')
+
+    report = _queue(library, tmp_path).run()
+
+    assert [item.asset_path for item in report.imported] == [f"{library}/Env/Oak"]
+    assert _imported_files() == [f"{library}/Env/Oak/v_002/Oak.fbx"]
+    assert len(report.skipped) == 4
+
+
+def test_force_imports_unchanged_assets(library, tmp_path):
+    _queue(library, tmp_path).run()
+
+    report = _queue(library, tmp_path).run(force=True)
+
+    assert len(report.imported) == 5
+    assert not report.skipped
+
+
+def test_failed_imports_stay_queued_and_are_not_remembered(library, tmp_path):
+    unreal.failing_files.add(f"{library}/Env/Pine/v_001/Pine.fbx")
+    queue = _queue(library, tmp_path)
+
+    report = queue.run()
+
+    assert [item.asset_path for item in report.failed] == [f"{library}/Env/Pine"]
+    assert list(queue.items) == [f"{library}/Env/Pine"]
+    assert ('warning', f"Content Hub: failed to import {library}/Env/Pine/v_001/Pine.fbx") in unreal.logs
+
+    unreal.failing_files.clear()
+    report = queue.run()
+    assert [item.asset_path for item in report.imported] == [f"{library}/Env/Pine"]
+
+
+def test_state_file_records_what_was_imported(library, tmp_path):
+    unreal.failing_files.add(f"{library}/Env/Pine/v_001/Pine.fbx")
+    _queue(library, tmp_path).run()
+
+    with open(tmp_path / 'Saved' / 'imported.json', 'r', encoding='utf-8') as f:
+        state = json.load(f)
+
+    assert sorted(state) == [f"{library}/{asset}" for asset in ('Env/Oak', 'Props/Barrel', 'Props/Crate',
+                                                                'Props/Old Lamp')]
+    assert state[f"{library}/Env/Oak"] == {'version': 'v001', 'fingerprint': 'hash-fbx'}
+
+
+def test_assets_without_an_fbx_are_not_queued(library, tmp_path):
+    version_journal.append_version(f"{library}/Props/Empty", 'Empty', {'version': 'v001', 'files': {}})
+    queue = ImportQueue(library, state_path=str(tmp_path / 'imported.json'))
+
+    assert queue.add_assets([f"{library}/Props/Empty", f"{library}/Props/Barrel"]) == 1
@@ -0,0 +1,103 @@
+import os
+import json
+
+from shared.systems.metadata_store import AssetMetadata, MetadataStore, VersionRecord, version_number
+
+
+def _write(path, data, mtime=None):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f)
+    if mtime is not None:
+        os.utime(path, (mtime, mtime))
+    return str(path).replace('\\', '/')
+
+
+def _head(latest='v002', author='ana'):
+    return {'name': 'Barrel', 'latest': latest, 'versions': [
+        {'version': 'v001', 'files': {'fbx': 'v_001/Barrel.fbx'}, 'author': 'ana', 'date': ''},
+        {'version': 'v002', 'files': {'fbx': {'path': 'v_002/Barrel.fbx', 'hash': 'abc', 'size': 3}},
+         'author': author, 'date': '', 'thumbnail': 'v_002/thumbnail.png', 'tags': ['wood']},
+    ]}
+
+
+def test_version_number_accepts_every_spelling():
+    assert [version_number(v) for v in (3, '3', 'v003', '', 'latest')] == [3, 3, 3, -1, -1]
+
+
+def test_versions_are_looked_up_by_number():
+    metadata = AssetMetadata.from_dict('/library/Barrel/metadata.json', _head())
+
+    assert metadata.asset_path == '/library/Barrel'
+    assert metadata.version(1).file_path('fbx') == 'v_001/Barrel.fbx'
+    assert metadata.version('v002') is metadata.latest_version()
+    assert metadata.version(3) is None
+    assert metadata.thumbnail_path() == '/library/Barrel/v_002/thumbnail.png'
+
+
+def test_plain_and_hashed_file_entries():
+    latest = AssetMetadata.from_dict('/library/Barrel/metadata.json', _head()).latest_version()
+
+    assert latest.file_path('fbx') == 'v_002/Barrel.fbx'
+    assert latest.file_hash('fbx') == 'abc'
+    assert latest.file_path('abc') == ''
+    assert VersionRecord.from_dict(_head()['versions'][0]).file_hash('fbx') == ''
+
+
+def test_unknown_fields_survive_a_round_trip():
+    data = _head()
+
+    assert AssetMetadata.from_dict('/library/Barrel/metadata.json', data).to_dict() == data
+
+
+def test_unchanged_file_is_parsed_once(tmp_path):
+    path = _write(tmp_path / 'Barrel' / 'metadata.json', _head())
+    store = MetadataStore()
+
+    first = store.get(path)
+
+    assert store.get(path) is first
+    assert store.stats() == {'entries': 1, 'hits': 1, 'misses': 1, 'evictions': 0}
+
+
+def test_changed_file_is_parsed_again(tmp_path):
+    path = _write(tmp_path / 'Barrel' / 'metadata.json', _head(), mtime=1000)
+    store = MetadataStore()
+    store.get(path)
+
+    # Same mtime, as on a share with coarse timestamps, but a different size
+    _write(tmp_path / 'Barrel' / 'metadata.json', _head(author='benjamin'), mtime=1000)
+
+    assert store.get(path).latest_version().author == 'benjamin'
+    assert store.misses == 2
+
+
+def test_missing_and_invalid_files_return_none(tmp_path):
+    path = _write(tmp_path / 'Barrel' / 'metadata.json', _head())
+    store = MetadataStore()
+    store.get(path)
+
+    os.remove(path)
+    assert store.get(path) is None
+    assert len(store) == 0
+
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write('{not json')
+    assert store.get(path) is None
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    paths = [_write(tmp_path / name / 'metadata.json', _head()) for name in ('A', 'B', 'C')]
+    store = MetadataStore(max_entries=2)
+
+    store.get(paths[0])
+    store.get(paths[1])
+    store.get(paths[0])
+    store.get(paths[2])
+
+    assert store.evictions == 1
+    hits = store.hits
+    store.get(paths[0])
+    assert store.hits == hits + 1
+    store.get(paths[1])
+    assert store.misses == 4
@@ -0,0 +1,86 @@
+import os
+import shutil
+
+import pytest
+
+from shared.systems import project_manifest, version_journal
+
+
+def _publish(asset_path, number=1, author='ana'):
+    entry = {'version': f"v{number:03d}", 'author': author, 'date': '2026-01-01', 'files': {}}
+    version_journal.append_version(asset_path, os.path.basename(asset_path), entry)
+    project_manifest.update_asset(asset_path)
+
+
+@pytest.fixture
+def project(tmp_path, monkeypatch):
+    monkeypatch.delenv('CONTENTHUB_PROJECT_ROOT', raising=False)
+    root = str(tmp_path / 'Project').replace('\\', '/')
+    for asset in ('Props/Barrel', 'Props/Crates/Crate', 'Env/Forest/Oak'):
+        version_journal.append_version(f"{root}/{asset}", os.path.basename(asset),
+                                       {'version': 'v001', 'author': 'ana', 'date': '', 'files': {}})
+    project_manifest.build_manifest(root)
+    return root
+
+
+def _paths(project_root):
+    reader = project_manifest.ManifestReader(project_root)
+    return [record.path[len(project_root) + 1:] for record in reader.records_under(project_root)]
+
+
+def test_projects_without_a_manifest_are_left_alone(tmp_path, monkeypatch):
+    monkeypatch.delenv('CONTENTHUB_PROJECT_ROOT', raising=False)
+    asset_path = str(tmp_path / 'Props' / 'Barrel')
+    version_journal.append_version(asset_path, 'Barrel', {'version': 'v001', 'files': {}})
+
+    assert not project_manifest.update_asset(asset_path)
+    assert not project_manifest.move_folder(str(tmp_path / 'Props'), str(tmp_path / 'Items'))
+    assert not os.path.exists(tmp_path / project_manifest.MANIFEST_FILE)
+
+
+def test_build_lists_every_asset_by_top_level_folder(project):
+    reader = project_manifest.ManifestReader(project)
+
+    assert sorted(reader.refresh()) == ['Env', 'Props']
+    assert _paths(project) == ['Env/Forest/Oak', 'Props/Barrel', 'Props/Crates/Crate']
+    assert reader.child_folders(f"{project}/Props") == ['Barrel', 'Crates']
+    assert reader.child_folders(f"{project}/Props/Barrel") == []
+
+
+def test_publish_only_moves_its_own_segment(project):
+    reader = project_manifest.ManifestReader(project)
+    reader.refresh()
+
+    _publish(f"{project}/Props/Barrel", 2, author='ben')
+
+    assert reader.refresh() == ['Props']
+    barrel, = reader.records_under(f"{project}/Props/Barrel")
+    assert (barrel.latest, barrel.author) == ('v002', 'ben')
+
+
+def test_renamed_folder_moves_its_entries(project):
+    os.rename(f"{project}/Props/Crates", f"{project}/Props/Boxes")
+
+    assert project_manifest.move_folder(f"{project}/Props/Crates", f"{project}/Props/Boxes")
+    # Repeating the move, e.g. a retried rename, changes nothing
+    assert not project_manifest.move_folder(f"{project}/Props/Crates", f"{project}/Props/Boxes")
+    assert _paths(project) == ['Env/Forest/Oak', 'Props/Barrel', 'Props/Boxes/Crate']
+
+
+def test_renamed_top_level_folder_moves_to_another_segment(project):
+    os.rename(f"{project}/Env", f"{project}/Environment")
+
+    project_manifest.move_folder(f"{project}/Env", f"{project}/Environment")
+
+    reader = project_manifest.ManifestReader(project)
+    reader.refresh()
+    assert reader.segments() == ['Environment', 'Props']
+    oak, = reader.records_under(f"{project}/Environment")
+    assert oak.path == f"{project}/Environment/Forest/Oak"
+
+
+def test_deleted_folder_drops_its_entries(project):
+    shutil.rmtree(f"{project}/Props/Crates")
+
+    assert project_manifest.remove_folder(f"{project}/Props/Crates")
+    assert _paths(project) == ['Env/Forest/Oak', 'Props/Barrel']
@@ -0,0 +1,135 @@
+import pytest
+import unreal
+
+from hb_unreal.lib import unreal_stylesheet
+from hb_unreal.asset_hub_unreal.systems.qt_pump import QtTickPump
+
+
+class QtCore:
+    class QEventLoop:
+        AllEvents = 'AllEvents'
+
+    class QEvent:
+        DeferredDelete = 'DeferredDelete'
+
+
+class Signal:
+    def __init__(self):
+        self.slots = []
+
+    def connect(self, slot):
+        self.slots.append(slot)
+
+    def emit(self, *args):
+        for slot in list(self.slots):
+            slot(*args)
+
+
+class Window:
+    def __init__(self, app):
+        self.app = app
+        self.destroyed = Signal()
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+    def deleteLater(self):
+        self.app.posted_deletes.append(self)
+
+
+class Application:
+    """
+    Records the pump's calls. Queued work is measured in milliseconds and
+    processEvents does at most its budget of it, like QApplication does.
+    """
+
+    def __init__(self):
+        self.calls = []
+        self.pending_ms = 0
+        self.posted_deletes = []
+
+    def processEvents(self, flags, max_ms):
+        self.calls.append(('processEvents', flags, max_ms))
+        self.pending_ms -= min(self.pending_ms, max_ms)
+
+    def sendPostedEvents(self, receiver, event_type):
+        self.calls.append(('sendPostedEvents', receiver, event_type))
+        if event_type == QtCore.QEvent.DeferredDelete:
+            deletes, self.posted_deletes = self.posted_deletes, []
+            for window in deletes:
+                window.destroyed.emit(window)
+
+
+@pytest.fixture
+def pump(monkeypatch):
+    monkeypatch.setattr(unreal_stylesheet, 'import_qt_bindings', lambda: (None, QtCore))
+    pump = QtTickPump(Application(), budget_ms=4)
+    yield pump
+    pump.stop()
+
+
+def test_pump_only_ticks_while_it_has_windows(pump):
+    assert not pump.running
+    unreal.tick()
+    assert not pump.app.calls
+
+    pump.add_window(Window(pump.app))
+    pump.add_window(pump.windows[0])
+
+    assert pump.running
+    assert len(pump.windows) == 1
+
+
+def test_every_tick_processes_events_within_the_budget(pump):
+    pump.add_window(Window(pump.app))
+    pump.app.pending_ms = 10
+
+    for _ in range(3):
+        unreal.tick()
+
+    assert pump.app.calls == [('processEvents', 'AllEvents', 4), ('sendPostedEvents', None, 'DeferredDelete')] * 3
+    assert pump.app.pending_ms == 0
+    assert pump.stats()['ticks'] == 3
+
+
+def test_budget_leaves_the_rest_for_later_ticks(pump):
+    pump.add_window(Window(pump.app))
+    pump.app.pending_ms = 20
+
+    unreal.tick()
+    assert pump.app.pending_ms == 16
+
+    pump.budget_ms = 8
+    unreal.tick()
+    assert pump.app.pending_ms == 8
+
+
+def test_deleted_windows_are_flushed_and_stop_the_pump(pump):
+    window = Window(pump.app)
+    pump.add_window(window)
+
+    window.deleteLater()
+    unreal.tick()
+
+    assert not pump.app.posted_deletes
+    assert not pump.windows
+    assert not pump.running
+    calls = len(pump.app.calls)
+    unreal.tick()
+    assert len(pump.app.calls) == calls
+
+
+def test_editor_shutdown_closes_and_deletes_every_window(pump):
+    windows = [Window(pump.app), Window(pump.app)]
+    for window in windows:
+        pump.add_window(window)
+
+    unreal.shutdown()
+
+    assert all(window.closed for window in windows)
+    assert ('processEvents', 'AllEvents', 0) in pump.app.calls
+    assert pump.app.calls[-1] == ('sendPostedEvents', None, 'DeferredDelete')
+    assert not pump.app.posted_deletes
+    assert not pump.windows
+    assert not pump.running
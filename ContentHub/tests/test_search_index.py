@@ -0,0 +1,80 @@
+from shared.systems.asset_index import AssetRecord
+from shared.systems.search_index import SearchIndex, tokenize
+
+LIBRARY = '/library'
+
+
+def _record(path, author='', tags=''):
+    return AssetRecord(path, path.rsplit('/', 1)[-1], 'v001', author, '', '', 0.0, tags)
+
+
+def _library():
+    index = SearchIndex(LIBRARY)
+    index.add([
+        _record('/library/Props/Barrel', author='Ana', tags='wood,dressing'),
+        _record('/library/Props/OakCrate', author='Ben'),
+        _record('/library/Env/Forest/OakTree_02', author='Ana', tags='foliage'),
+        _record('/library/Env/Forest/PineTree', author='Ben', tags='foliage'),
+    ])
+    return index
+
+
+def _paths(records):
+    return [record.path for record in records]
+
+
+def test_tokenize_splits_words_and_numbers():
+    assert tokenize('OakTree_02') == {'oaktree', 'oak', 'tree', '02'}
+
+
+def test_every_term_must_prefix_match():
+    index = _library()
+
+    assert _paths(index.search('oak')) == ['/library/Props/OakCrate', '/library/Env/Forest/OakTree_02']
+    assert _paths(index.search('oak fol')) == ['/library/Env/Forest/OakTree_02']
+    assert _paths(index.search('forest ben')) == ['/library/Env/Forest/PineTree']
+    assert _paths(index.search('props dressing')) == ['/library/Props/Barrel']
+    assert index.search('oak metal') == []
+
+
+def test_folders_above_the_library_are_not_searchable():
+    assert _library().search('library') == []
+
+
+def test_empty_query_returns_everything_in_order():
+    index = _library()
+
+    assert _paths(index.search('')) == _paths(index.records())
+    assert len(index.search('', limit=2)) == 2
+
+
+def test_replace_under_only_touches_that_folder():
+    index = _library()
+
+    index.replace_under('/library/Env/Forest', [_record('/library/Env/Forest/PineTree', author='Cy'),
+                                               _record('/library/Env/Forest/Birch')])
+
+    assert '/library/Env/Forest/OakTree_02' not in index
+    assert _paths(index.search('forest')) == ['/library/Env/Forest/PineTree', '/library/Env/Forest/Birch']
+    assert _paths(index.search('cy')) == ['/library/Env/Forest/PineTree']
+    assert _paths(index.search('ben')) == ['/library/Props/OakCrate']
+    assert _paths(index.search('props')) == ['/library/Props/Barrel', '/library/Props/OakCrate']
+
+
+def test_updated_record_keeps_its_position():
+    index = _library()
+
+    index.add([_record('/library/Props/Barrel', author='Dee')])
+
+    assert _paths(index.records())[0] == '/library/Props/Barrel'
+    assert index.search('ana') == [_record('/library/Env/Forest/OakTree_02', author='Ana', tags='foliage')]
+    assert _paths(index.search('dee')) == ['/library/Props/Barrel']
+    assert len(index) == 4
+
+
+def test_matches_agrees_with_search():
+    index = _library()
+
+    for record in index.records():
+        for query in ('oak', 'foliage ana', 'env', 'crate'):
+            assert index.matches(record, query) == (record in index.search(query))
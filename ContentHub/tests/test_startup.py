@@ -0,0 +1,22 @@
+import pytest
+
+pytest.importorskip('PySide2')
+
+from benchmarks import generate_library, run_benchmarks
+
+
+@pytest.fixture(scope='module')
+def library_root(tmp_path_factory):
+    root = str(tmp_path_factory.mktemp('library') / 'Library')
+    generate_library.generate_library(root, generate_library.LibrarySpec(assets=200, thumbnail_size=64))
+    return root
+
+
+@pytest.mark.parametrize('name', ['startup', 'relaunch', 'relaunch_docked'])
+def test_hub_opens_within_its_budget(library_root, name):
+    # A fresh interpreter per scenario, so the cold run includes importing the tool
+    result = run_benchmarks.run_suite(library_root, [name], repeat=1)[name]
+
+    assert 'error' not in result, result['error']
+    assert result['cold_s'] <= run_benchmarks.BUDGETS[name], \
+        f"{name} took {result['cold_s'] * 1000:.0f} ms, the budget is {run_benchmarks.BUDGETS[name] * 1000:.0f} ms"
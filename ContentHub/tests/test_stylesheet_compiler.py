@@ -0,0 +1,79 @@
+import os
+
+from hb_unreal.lib.unreal_stylesheet import compiler
+
+SOURCE = """
+// Colours
+$black: #000;
+$black-dark: #111;
+
+QWidget {
+    color: $black;  /* inline */
+    QPushButton, QLabel {
+        background: $black-dark;
+        &:hover { color: white; }
+    }
+}
+QTableWidget QTableCornerButton::section { border: none; }
+#ContentHub > QLabel { margin:  2px  4px; }
+"""
+
+
+def test_variables_nesting_and_parent_selectors():
+    rules = compiler.compile_scss(SOURCE)
+
+    assert rules == [
+        (['QWidget'], [('color', '#000')]),
+        (['QWidget QPushButton', 'QWidget QLabel'], [('background', '#111')]),
+        (['QWidget QPushButton:hover', 'QWidget QLabel:hover'], [('color', 'white')]),
+        (['QTableWidget QTableCornerButton::section'], [('border', 'none')]),
+        (['#ContentHub > QLabel'], [('margin', '2px 4px')]),
+    ]
+
+
+def test_selector_types():
+    assert compiler.selector_types('QTableWidget QTableCornerButton::section') == ['QTableWidget',
+                                                                                   'QTableCornerButton']
+    assert compiler.selector_types('#ContentHub > QLabel:hover') == ['#ContentHub', 'QLabel']
+
+
+def test_prune_drops_selectors_of_unused_types():
+    rules = compiler.prune(compiler.compile_scss(SOURCE), ['QWidget', 'QLabel'])
+
+    assert [selectors for selectors, _ in rules] == [['QWidget'], ['QWidget QLabel'], ['QWidget QLabel:hover']]
+
+
+def test_minified_output_is_headed_by_the_source_hash():
+    compiled = compiler.compile_stylesheet(SOURCE, ['QWidget', 'QPushButton'])
+
+    assert compiled.splitlines() == [
+        f"/* source-sha1: {compiler.source_hash(SOURCE, ('QWidget', 'QPushButton'))} */",
+        'QWidget{color:#000}',
+        'QWidget QPushButton{background:#111}',
+        'QWidget QPushButton:hover{color:white}',
+    ]
+
+
+def test_compiled_file_is_only_rewritten_when_the_source_changes(tmp_path):
+    scss_path = tmp_path / 'ue.scss'
+    compiled_path = tmp_path / 'ue.min.qss'
+    scss_path.write_text(SOURCE, encoding='utf-8')
+
+    first = compiler.load_compiled(str(scss_path), str(compiled_path))
+    os.utime(compiled_path, (1000, 1000))
+    assert compiler.load_compiled(str(scss_path), str(compiled_path)) == first
+    assert os.stat(compiled_path).st_mtime == 1000
+
+    scss_path.write_text(SOURCE.replace('#000', '#222'), encoding='utf-8')
+    assert 'QWidget{color:#222}' in compiler.load_compiled(str(scss_path), str(compiled_path))
+    assert compiled_path.read_text(encoding='utf-8') != first
+
+
+def test_shipped_stylesheet_is_up_to_date():
+    with open(compiler.SCSS_PATH, 'r', encoding='utf-8') as f:
+        source = f.read()
+    with open(compiler.COMPILED_PATH, 'r', encoding='utf-8') as f:
+        compiled = f.read()
+
+    assert compiled == compiler.compile_stylesheet(source), \
+        "ue.min.qss is stale, rebuild it with python -m hb_unreal.lib.unreal_stylesheet.compiler"
@@ -0,0 +1,115 @@
+import os
+import json
+import time
+import threading
+
+import pytest
+
+pytest.importorskip('PySide2')
+
+from PySide2 import QtCore, QtGui
+
+from asset_hub_maya.systems import thumbnail_atlas
+from shared.systems import version_journal
+
+
+def _asset(folder, name, version=1, color=None, width=128, height=64):
+    """
+    Writes the head of an asset, with a thumbnail of one color if given one
+    """
+    asset_path = os.path.join(folder, name)
+    entry = {'version': f"v{version:03d}", 'files': {}, 'author': 'ana', 'date': ''}
+    if color is not None:
+        entry['thumbnail'] = f"v_{version:03d}/thumbnail.png"
+        os.makedirs(os.path.join(asset_path, f"v_{version:03d}"), exist_ok=True)
+        image = QtGui.QImage(width, height, QtGui.QImage.Format_ARGB32)
+        image.fill(QtGui.QColor(color))
+        assert image.save(os.path.join(asset_path, entry['thumbnail']))
+    metadata_path = os.path.join(asset_path, 'metadata.json')
+    os.makedirs(asset_path, exist_ok=True)
+    with open(metadata_path, 'w', encoding='utf-8') as f:
+        json.dump({'name': name, 'latest': entry['version'], 'versions': [entry]}, f)
+    # Newer than any earlier write, so the metadata store parses it again
+    os.utime(metadata_path, (time.time() + version, time.time() + version))
+    return asset_path
+
+
+def _color(atlas, name):
+    return QtGui.QColor(atlas.image(name).pixel(0, 0)).name()
+
+
+@pytest.fixture
+def folder(tmp_path):
+    app = QtCore.QCoreApplication.instance() or QtCore.QCoreApplication([])
+    folder = str(tmp_path / 'Props').replace('\\', '/')
+    _asset(folder, 'Barrel', color='#ff0000')
+    _asset(folder, 'Crate', color='#0000ff', width=64, height=128)
+    _asset(folder, 'Rope')
+    yield folder
+    app.processEvents()
+
+
+def test_atlas_holds_every_thumbnail_of_the_folder(folder):
+    assert thumbnail_atlas.build_atlas(folder) == 2
+
+    with thumbnail_atlas.ThumbnailAtlas.open(folder) as atlas:
+        assert sorted(atlas.entries) == ['Barrel', 'Crate']
+        assert atlas.size == 64
+        assert atlas.thumbnail_path('Barrel') == f"{folder}/Barrel/v_001/thumbnail.png"
+        assert atlas.image('Barrel').size() == QtCore.QSize(64, 32)
+        assert atlas.image('Crate').size() == QtCore.QSize(32, 64)
+        assert (_color(atlas, 'Barrel'), _color(atlas, 'Crate')) == ('#ff0000', '#0000ff')
+        assert [path for path, _, _ in atlas.images()] == [f"{folder}/Barrel/v_001/thumbnail.png",
+                                                           f"{folder}/Crate/v_001/thumbnail.png"]
+
+
+def test_unchanged_thumbnails_are_not_decoded_again(folder):
+    thumbnail_atlas.build_atlas(folder)
+
+    assert thumbnail_atlas.build_atlas(folder) == 0
+    with thumbnail_atlas.ThumbnailAtlas.open(folder) as atlas:
+        assert _color(atlas, 'Crate') == '#0000ff'
+
+
+def test_republished_asset_updates_its_entry(folder):
+    thumbnail_atlas.build_atlas(folder)
+    crate = _asset(folder, 'Crate', version=2, color='#00ff00')
+
+    assert thumbnail_atlas.update_asset(crate)
+
+    with thumbnail_atlas.ThumbnailAtlas.open(folder) as atlas:
+        assert atlas.entries['Crate'][0] == 'v_002/thumbnail.png'
+        assert (_color(atlas, 'Barrel'), _color(atlas, 'Crate')) == ('#ff0000', '#00ff00')
+
+
+def test_folders_without_an_atlas_are_left_alone(folder):
+    assert not thumbnail_atlas.update_asset(os.path.join(folder, 'Crate'))
+    assert not os.path.exists(thumbnail_atlas.atlas_path(folder))
+    assert thumbnail_atlas.ThumbnailAtlas.open(folder) is None
+
+
+def test_update_waits_for_the_folder_lock(folder):
+    thumbnail_atlas.build_atlas(folder)
+    crate = _asset(folder, 'Crate', version=2, color='#00ff00')
+    updated = []
+
+    with version_journal.publish_lock(folder):
+        thread = threading.Thread(target=lambda: updated.append(thumbnail_atlas.update_asset(crate)))
+        thread.start()
+        thread.join(0.3)
+        assert thread.is_alive()
+        with thumbnail_atlas.ThumbnailAtlas.open(folder) as atlas:
+            assert atlas.entries['Crate'][0] == 'v_001/thumbnail.png'
+    thread.join(5.0)
+
+    assert updated == [True]
+    with thumbnail_atlas.ThumbnailAtlas.open(folder) as atlas:
+        assert atlas.entries['Crate'][0] == 'v_002/thumbnail.png'
+
+
+def test_unreadable_atlas_is_ignored(folder):
+    with open(thumbnail_atlas.atlas_path(folder), 'wb') as f:
+        f.write(b'not an atlas')
+
+    assert thumbnail_atlas.ThumbnailAtlas.open(folder) is None
+    assert thumbnail_atlas.build_atlas(folder) == 2
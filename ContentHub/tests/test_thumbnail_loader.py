@@ -0,0 +1,62 @@
+import time
+import threading
+
+import pytest
+
+pytest.importorskip('PySide2')
+
+from PySide2 import QtCore, QtWidgets
+
+from asset_hub_maya.systems import thumbnail_loader, thumbnail_store
+
+
+class Blocker(QtCore.QRunnable):
+    """
+    Holds the pool's only thread until released, so later tasks stay queued
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.started = threading.Event()
+        self.release = threading.Event()
+
+    def run(self):
+        self.started.set()
+        self.release.wait(5.0)
+
+
+@pytest.fixture
+def loader(tmp_path):
+    app = QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+    loader = thumbnail_loader.ThumbnailLoader(thumbnail_store.ThumbnailStore(str(tmp_path / 'cache')), max_threads=1)
+    yield app, loader
+    loader._pool.waitForDone(5000)
+
+
+def _wait_until(app, condition, timeout=5.0):
+    deadline = time.perf_counter() + timeout
+    while not condition():
+        assert time.perf_counter() < deadline, "timed out"
+        app.processEvents(QtCore.QEventLoop.AllEvents, 10)
+        time.sleep(0.001)
+
+
+def test_recheck_dropped_by_cancel_runs_on_the_next_request(loader, tmp_path):
+    app, loader = loader
+    path = str(tmp_path / 'thumbnail.png')
+    checked = []
+    loader._signals.checked.connect(lambda checked_path, mtime: checked.append(checked_path))
+    blocker = Blocker()
+    loader._pool.start(blocker)
+    assert blocker.started.wait(5.0)
+
+    loader._revalidate(path)
+    loader.cancel_pending()
+    blocker.release.set()
+    loader._pool.waitForDone(5000)
+    app.processEvents()
+    assert not checked
+
+    loader._revalidate(path)
+    _wait_until(app, lambda: checked)
+    assert checked == [path]
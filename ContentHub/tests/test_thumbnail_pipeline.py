@@ -0,0 +1,73 @@
+import os
+
+import pytest
+
+pytest.importorskip('PySide2')
+
+from PySide2 import QtCore, QtGui
+
+from asset_hub_maya.systems import thumbnail_pipeline, thumbnail_store
+from asset_hub_maya.systems.thumbnail_pipeline import SyntheticBackend, ThumbnailPipeline
+from benchmarks import generate_library
+from shared.systems import asset_index, version_journal
+
+
+@pytest.fixture
+def library(tmp_path, monkeypatch):
+    app = QtCore.QCoreApplication.instance() or QtCore.QCoreApplication([])
+    monkeypatch.setenv('CONTENTHUB_CACHE_DIR', str(tmp_path / 'cache'))
+    monkeypatch.setattr(asset_index, '_index', None)
+    root = str(tmp_path / 'Library').replace('\\', '/')
+    generate_library.generate_library(root, generate_library.LibrarySpec(depth=1, fanout=2, assets=4, versions=2,
+                                                                         thumbnail_size=16, file_size=64))
+    yield root
+    asset_index.get_index().close()
+    app.processEvents()
+
+
+def test_requests_cover_the_latest_version_of_every_asset(library):
+    requests = thumbnail_pipeline.requests_for_library(library, ['front', 'side'])
+
+    assert len(requests) == 8
+    assert {request.version for request in requests} == {'v002'}
+    assert all(os.path.isfile(request.scene_path) for request in requests)
+    assert sorted({request.angle for request in requests}) == ['front', 'side']
+
+
+def test_pool_publishes_thumbnails_and_their_variants(library, tmp_path):
+    requests = thumbnail_pipeline.requests_for_library(library, ['three_quarter', 'side'])
+    store_dir = str(tmp_path / 'variants')
+
+    results = ThumbnailPipeline(SyntheticBackend(size=96), sizes=(16, 32), workers=2, store_dir=store_dir).run(requests)
+
+    assert [result.request for result in results] == requests
+    assert all(result.ok for result in results), [result.error for result in results]
+    store = thumbnail_store.ThumbnailStore(store_dir)
+    for result in results:
+        assert result.thumbnail == f"{result.request.asset_path}/{result.request.thumbnail_file}"
+        assert QtGui.QImage(result.thumbnail).size() == QtCore.QSize(96, 96)
+        mtime = os.stat(result.thumbnail).st_mtime
+        assert sorted(result.variants) == [16, 32]
+        assert QtGui.QImage(store.get(result.thumbnail, 32, mtime)).size() == QtCore.QSize(32, 32)
+        entry = version_journal.read_version(result.request.asset_path, 'v002')
+        # Only the default angle becomes the asset's thumbnail
+        assert entry['thumbnail'] == 'v_002/thumbnail.png'
+    assert {os.path.basename(result.thumbnail) for result in results} == {'thumbnail.png', 'thumbnail_side.png'}
+
+
+def test_unreadable_capture_fails_only_its_request(library, tmp_path):
+    class Backend(SyntheticBackend):
+        def capture(self, requests, output_dir):
+            for i, (request, raw_path) in enumerate(super().capture(requests, output_dir)):
+                if i == 0:
+                    with open(raw_path, 'wb') as f:
+                        f.write(b'not an image')
+                yield request, raw_path
+
+    requests = thumbnail_pipeline.requests_for_library(library)[:2]
+    results = ThumbnailPipeline(Backend(size=32), sizes=(16,), workers=1, store_dir=str(tmp_path / 'variants'),
+                                update_metadata=False).run(requests)
+
+    assert [result.ok for result in results] == [False, True]
+    assert results[0].error.startswith("Could not read captured image")
+    assert [result.request for result in results] == requests
@@ -0,0 +1,85 @@
+import json
+import threading
+
+import pytest
+
+from shared.systems import tracing
+
+
+@pytest.fixture
+def enabled():
+    was_enabled = tracing.is_enabled()
+    tracing.clear()
+    tracing.enable()
+    yield
+    tracing.enable(was_enabled)
+    tracing.clear()
+
+
+def _export(tmp_path):
+    with open(tracing.export_chrome_trace(str(tmp_path / 'traces' / 'trace.json')), 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+@tracing.traced('index.refresh_dir')
+def _refresh_dir():
+    with tracing.span('walk.list_dir', path='/library/Props'):
+        pass
+
+
+def test_disabled_tracing_records_nothing(tmp_path):
+    was_enabled = tracing.is_enabled()
+    tracing.enable(False)
+    try:
+        tracing.clear()
+        with tracing.span('index.refresh'):
+            _refresh_dir()
+        assert tracing.begin_operation('populate') is None
+        assert _export(tmp_path)['traceEvents'] == []
+    finally:
+        tracing.enable(was_enabled)
+
+
+def test_nested_spans_are_exported_inside_their_parent(enabled, tmp_path):
+    with tracing.span('index.refresh', root='/library'):
+        _refresh_dir()
+        _refresh_dir()
+
+    events = [event for event in _export(tmp_path)['traceEvents'] if event['ph'] == 'X']
+
+    assert [event['name'] for event in events] == ['walk.list_dir', 'index.refresh_dir'] * 2 + ['index.refresh']
+    outer = events[-1]
+    assert (outer['cat'], outer['args']) == ('index', {'root': '/library'})
+    assert events[0]['args'] == {'path': '/library/Props'}
+    for inner, parent in ((events[0], events[1]), (events[1], outer), (events[3], outer)):
+        assert parent['ts'] <= inner['ts']
+        assert inner['ts'] + inner['dur'] <= parent['ts'] + parent['dur']
+    assert events[1]['ts'] + events[1]['dur'] <= events[2]['ts']
+
+
+def test_threads_are_named_in_the_trace(enabled, tmp_path):
+    thread = threading.Thread(target=_refresh_dir, name='scanner')
+    thread.start()
+    thread.join()
+
+    trace = _export(tmp_path)
+    names = {event['tid']: event['args']['name'] for event in trace['traceEvents'] if event['ph'] == 'M'}
+
+    assert trace['displayTimeUnit'] == 'ms'
+    assert {names[event['tid']] for event in trace['traceEvents'] if event['ph'] == 'X'} == {'scanner'}
+
+
+def test_operation_totals_phases_until_the_next_one(enabled):
+    operation = tracing.begin_operation('populate')
+    _refresh_dir()
+    _refresh_dir()
+
+    assert [(name, count) for name, _, count in operation.phases()] in (
+        [('index.refresh_dir', 2), ('walk.list_dir', 2)],
+        [('walk.list_dir', 2), ('index.refresh_dir', 2)])
+    assert operation.duration > 0
+
+    tracing.begin_operation('search')
+    _refresh_dir()
+    assert [count for _, _, count in operation.phases()] == [2, 2]
+    assert tracing.last_operation().name == 'search'
@@ -0,0 +1,84 @@
+import os
+import json
+import multiprocessing
+
+from shared.systems import version_journal
+
+
+def _entry(number):
+    return {'version': f"v{number:03d}", 'files': {'fbx': f"v_{number:03d}/Barrel.fbx"}, 'author': 'test'}
+
+
+def _write_legacy(asset_path, numbers):
+    os.makedirs(asset_path, exist_ok=True)
+    head = {'name': 'Barrel', 'latest': f"v{max(numbers):03d}", 'versions': [_entry(n) for n in numbers]}
+    with open(os.path.join(asset_path, version_journal.HEAD_FILE), 'w', encoding='utf-8') as f:
+        json.dump(head, f)
+
+
+def _journal_versions(asset_path):
+    with open(os.path.join(asset_path, version_journal.JOURNAL_FILE), 'r', encoding='utf-8') as f:
+        return [json.loads(line)['version'] for line in f]
+
+
+def _publish(asset_path):
+    number = version_journal.allocate_version(asset_path, 'Barrel')
+    version_journal.append_version(asset_path, 'Barrel', _entry(number))
+    return number
+
+
+def test_concurrent_publishes_get_distinct_versions(tmp_path):
+    asset_path = str(tmp_path / 'Barrel')
+    with multiprocessing.get_context('spawn').Pool(4) as pool:
+        numbers = pool.map(_publish, [asset_path] * 16)
+
+    assert sorted(numbers) == list(range(1, 17))
+    assert sorted(_journal_versions(asset_path)) == [f"v{n:03d}" for n in range(1, 17)]
+    head = version_journal.read_head(asset_path)
+    assert head['latest'] == 'v016'
+    assert head['count'] == 16
+    assert head['next_version'] == 17
+    assert [v['version'] for v in head['versions']] == ['v016']
+    assert not os.path.exists(os.path.join(asset_path, version_journal.LOCK_FILE))
+
+
+def test_publishing_the_same_version_twice_fails(tmp_path):
+    asset_path = str(tmp_path / 'Barrel')
+    version_journal.append_version(asset_path, 'Barrel', _entry(1))
+
+    try:
+        version_journal.append_version(asset_path, 'Barrel', _entry(1))
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("v001 was published twice")
+    assert _journal_versions(asset_path) == ['v001']
+
+
+def test_legacy_metadata_is_moved_into_the_journal(tmp_path):
+    asset_path = str(tmp_path / 'Barrel')
+    _write_legacy(asset_path, [1, 2])
+
+    version_journal.append_version(asset_path, 'Barrel', _entry(3))
+
+    assert _journal_versions(asset_path) == ['v001', 'v002', 'v003']
+    assert [v['version'] for v in version_journal.read_versions(asset_path)] == ['v001', 'v002', 'v003']
+    assert version_journal.read_version(asset_path, 1) == _entry(1)
+    head = version_journal.read_head(asset_path)
+    assert head['journal'] == version_journal.JOURNAL_FILE
+    assert head['latest'] == 'v003'
+    assert head['count'] == 3
+    assert head['next_version'] == 4
+
+
+def test_upgrade_interrupted_before_the_head_is_swapped_is_not_journaled_twice(tmp_path):
+    asset_path = str(tmp_path / 'Barrel')
+    _write_legacy(asset_path, [1, 2])
+    # Journal written, then the publisher died before writing the head
+    version_journal._upgrade(asset_path, version_journal.read_head(asset_path), 'Barrel')
+    assert 'journal' not in version_journal.read_head(asset_path)
+
+    version_journal.append_version(asset_path, 'Barrel', _entry(3))
+
+    assert _journal_versions(asset_path) == ['v001', 'v002', 'v003']
+    assert version_journal.read_head(asset_path)['count'] == 3